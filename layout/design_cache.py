@@ -0,0 +1,76 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Memoized calculations and figures for the streamlit app, keyed on a hashable design
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+import utilities.cache_backend as cb
+import materials.materials as mt
+import pressure_vessel.vessel as vsl
+import pressure_vessel.depth_models as dm
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+import layout.figures as fgs
+
+#bounds for the memoized designs, least recently used designs are evicted first
+cache_max_entries=256
+cache_ttl=60*60
+
+@dataclass(frozen=True)
+class design_key:
+    """
+    immutable, hashable description of one design as entered in the app
+    the material is identified by its label and the depth model by its name
+    (see depth_models.depth_model_name)
+    """
+    matl_label: str
+    length: float
+    diameter: float
+    wall_thickness: float
+    depth: float
+    percent: float
+    depth_model: str="linear"
+
+    def vessel(self, matl: mt.material)->vsl.compact_vessel:
+        """
+        creates the compact_vessel class object for this design from its material
+        """
+        vessel=vsl.compact_vessel(matl=matl, length=self.length, diameter=self.diameter,
+                                  wall_thickness=self.wall_thickness, label=self.matl_label)
+        return vessel
+
+@cb.cache_data(max_entries=cache_max_entries, ttl=cache_ttl)
+def design_results(key: design_key, _matl: mt.material)->epa.vessel_results:
+    """
+    every stress, reduction and ratio of a design at its rated depth, the pressure is
+    from the depth model named in the key
+    _matl is not hashed, the material label in the key stands in for it
+    """
+    pressure_max=dm.named_depth_model(key.depth_model).depth_to_pressure(key.depth)
+    results=epa.evaluate_vessel(key.vessel(_matl), pressure_max, key.percent)
+    return results
+
+@cb.cache_resource(max_entries=cache_max_entries, ttl=cache_ttl)
+def design_figures(key: design_key, _matl: mt.material)->dict(fig):
+    """
+    hoop and longitudinal stress figures of a design, shared between reruns and
+    sessions so they must not be modified
+    _matl is not hashed, the material label in the key stands in for it
+    """
+    figures=fgs.display_hoop_and_long_figures(key.vessel(_matl), key.depth, key.percent)
+    return figures
+
+@cb.cache_resource(max_entries=cache_max_entries, ttl=cache_ttl)
+def design_field_figures(key: design_key, _matl: mt.material)->dict(fig):
+    """
+    through thickness stress field contour maps of a thick walled design, shared between
+    reruns and sessions so they must not be modified
+    _matl is not hashed, the material label in the key stands in for it
+    """
+    figures=fgs.display_stress_field_figures(key.vessel(_matl), key.depth)
+    return figures
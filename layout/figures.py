@@ -6,327 +6,218 @@ license that can be found in the LICENSE file or at
 https://opensource.org/licenses/MIT.
 
 Functions for plotting graphs pressure or depth verse hoop or longitudinal stress
+and contour maps of the stress through a thick wall
 """
 from __future__ import annotations
 
-import pressure_vessel.ext_presure_vessel_functions as epv
+from functools import lru_cache
+import numpy as np
+import pressure_vessel.ext_pressure_vessel_arrays as epa
 import pressure_vessel.vessel as vsl
 import plotly.graph_objects as go
 
-def thin_display_hoop_and_long_figures(vessel: vsl.vessel, depth_choice: float)->dict(fig):
-    """ 
-    Takes a Vessel class object and a depth, assembles and returns plots for:
-        -Thin Walled Hoop stress verse depth
-        -Thin Walled Hoop stress verse pressure
-        -Thin Walled Longitudinal stress verse depth
-        -Thin Walled Longitudinal stress verse pressure
+#titles and fonts for each of the four charts, keyed by the figure name suffix
+chart_styles={"hs_d":{"title":"<b>Hoop Stress at Depth<b>", "title_x":0.40, "font_size":32,
+                      "x_title":"<b>Depth (ft)<b>", "y_title":"<b>Hoop Stress (psi)<b>",
+                      "stress_name":"Hoop Stress", "yield_name":"Under Yield Stress"},
+              "hs_p":{"title":"<b>Hoop Stress at Pressure<b>", "title_x":0.40, "font_size":32,
+                      "x_title":"<b>Pressure (psi)<b>", "y_title":"<b>Hoop Stress (psi)<b>",
+                      "stress_name":"Hoop Stress", "yield_name":"Under Yield Stress"},
+              "ls_d":{"title":"<b>Longituduinal Stress at Depth<b>", "title_x":0.35, "font_size":20,
+                      "x_title":"<b>Depth (ft)<b>", "y_title":"<b>Longitudinal Stress (psi)<b>",
+                      "stress_name":"Longitudinal Stress", "yield_name":"Yield Stress"},
+              "ls_p":{"title":"<b>Longitudinal Stress at Pressure<b>", "title_x":0.35, "font_size":14,
+                      "x_title":"<b>Pressure (psi)<b>", "y_title":"<b>Longitudinal Stress (psi)<b>",
+                      "stress_name":"Longitudinal Stress", "yield_name":"Yield Stress"}}
+
+#stress line style for thin and thick walled figure sets
+line_styles={"Thin Walled":{"line_width":4, "line_color":"gray"},
+             "Thick Walled":{"line_color":"white"}}
+
+#titles of the through thickness stress field charts, keyed by the epa.thick_stress_field component
+field_styles={"hoop":{"title":"<b>Hoop Stress Through Wall<b>", "key":"hf", "z_title":"Hoop Stress (psi)"},
+              "radial":{"title":"<b>Radial Stress Through Wall<b>", "key":"rf", "z_title":"Radial Stress (psi)"},
+              "shear":{"title":"<b>Shear Stress Through Wall<b>", "key":"sf", "z_title":"Shear Stress (psi)"}}
+
+def depth_sweep(depth_choice: float)->np.ndarray:
     """
-    figures={"fig_hs_d":None, "fig_hs_p":None, "fig_ls_d":None, "fig_ls_p":None}
-    
-    pressure=epv.depth_to_pressure(depth_choice)
-
-    #create lists for X and Y values for plots
-    depth_values = list(range(1, int(round(depth_choice+1,0)), int(round((depth_choice+1)/30,0))))
-    pressure_values=[]
-    for depth in depth_values:
-        pressure_values.append(epv.depth_to_pressure(depth))
-
-    hoop_stress_values=[]
-    for pressure in pressure_values:
-        hs_latex, hs_value=epv.thin_hoop_stress(vessel, pressure)
-        hoop_stress_values.append(hs_value)
- 
-
-    long_stress_values=[]
-    for pressure in pressure_values:
-        ls_latex, ls_value=epv.thin_longitudinal_stress(vessel, pressure)
-        long_stress_values.append(ls_value)
-
-    #create plots for hoop and longitudinal stress vs depth and pressure
-    fig_hs_d = go.Figure()
-    fig_hs_p = go.Figure()
+    depths (ft) used for the x axis of the plots, roughly 30 steps from 1 ft to depth_choice
+    """
+    step=max(int(round((depth_choice+1)/30,0)), 1)
+    depth_values=np.arange(1, int(round(depth_choice+1,0)), step, dtype=float)
+    return depth_values
 
-    fig_ls_d = go.Figure()
-    fig_ls_p = go.Figure()
+@lru_cache(maxsize=None)
+def figure_template(chart: str, wall_type: str)->dict:
+    """
+    builds (once per process) the styled figure for one chart kind and wall type
+    with three empty traces: the stress line, the under yield band and the over yield band
+    returned as a plain figure dictionary, it must not be modified
+    chart is one of the keys of chart_styles
+    """
+    style=chart_styles[chart]
 
-    #hoop stress vs depth
-    fig_hs_d.add_trace(
+    fig=go.Figure()
+    fig.add_trace(
         go.Scatter(
-            name="Hoop Stress",
-            x=depth_values,
-            y=hoop_stress_values,
-            line_width=4,
-            line_color="gray",
-            legendrank=1)
+            name=style["stress_name"],
+            x=[],
+            y=[],
+            legendrank=1,
+            **line_styles[wall_type])
     )
     #graph a line at vessel material yield stress
-    fig_hs_d.add_trace(
-        go.Scatter(
-            name="Under Yield Stress",
-            x=[0, max(depth_values)],
-            y=[vessel.matl.fy, vessel.matl.fy], fill="tozeroy" ,line_color="#A0E095", legendrank=2)
-    )
-    if max(hoop_stress_values) > float(vessel.matl.fy):
-        fig_hs_d.add_trace(
-            go.Scatter(
-                name="Over Yield Stress",
-                x=[0, max(depth_values)],
-                y=[max(hoop_stress_values), max(hoop_stress_values)], fill="tonexty" ,line_color="#EF8282", legendrank=3)
-        )
-
-    #pretty up hoop stress vs depth plot
-    fig_hs_d.update_layout(title_text="<b>Hoop Stress at Depth<b>", margin=dict(l=20, r=20, t=20, b=20), title_x=0.40, title_y=0.95, font_size=32)
-    fig_hs_d.update_xaxes(title=dict(text="<b>Depth (ft)<b>",font=dict(size=14)), range=[0, max(depth_values)*1.02] ,title_standoff = 20)
-    fig_hs_d.update_yaxes(title=dict(text="<b>Hoop Stress (psi)<b>",font=dict(size=14)), title_standoff = 20)
-    fig_hs_d.update_layout(legend=dict( yanchor="top", y=0.90, xanchor="left", x=0.01))
-    figures.update({"fig_hs_d":fig_hs_d})
-
-    #hoop stress vs pressure
-    fig_hs_p.add_trace(
+    fig.add_trace(
         go.Scatter(
-            name="Hoop Stress",
-            x=pressure_values,
-            y=hoop_stress_values,
-            line_width=4,
-            line_color="gray",
-            legendrank=1)
+            name=style["yield_name"],
+            x=[],
+            y=[], fill="tozeroy" ,line_color="#A0E095", legendrank=2)
     )
-    #graph a line at vessel material yield stress
-    fig_hs_p.add_trace(
+    fig.add_trace(
         go.Scatter(
-            name="Under Yield Stress",
-            x=[0, max(pressure_values)],
-            y=[vessel.matl.fy, vessel.matl.fy], fill="tozeroy" ,line_color="#A0E095", legendrank=2)
+            name="Over Yield Stress",
+            x=[],
+            y=[], fill="tonexty" ,line_color="#EF8282", legendrank=3)
     )
-    if max(hoop_stress_values) > float(vessel.matl.fy):
-        fig_hs_p.add_trace(
-            go.Scatter(
-                name="Over Yield Stress",
-                x=[0, max(pressure_values)],
-                y=[max(hoop_stress_values), max(hoop_stress_values)], fill="tonexty" ,line_color="#EF8282", legendrank=3)
-        )
 
-    #pretty up hoop stress vs pressure plot
-    fig_hs_p.update_layout(title_text="<b>Hoop Stress at Pressure<b>", margin=dict(l=20, r=20, t=20, b=20), title_x=0.40, title_y=0.95, font_size=32)
-    fig_hs_p.update_xaxes(title=dict(text="<b>Pressure (psi)<b>",font=dict(size=14)), range=[0, max(pressure_values)*1.02], title_standoff = 20)
-    fig_hs_p.update_yaxes(title=dict(text="<b>Hoop Stress (psi)<b>",font=dict(size=14)), title_standoff = 20)
-    fig_hs_p.update_layout(legend=dict( yanchor="top", y=0.90, xanchor="left", x=0.01))
-    figures.update({"fig_hs_p":fig_hs_p})
+    #pretty up the plot
+    fig.update_layout(title_text=style["title"], margin=dict(l=20, r=20, t=20, b=20), title_x=style["title_x"], title_y=0.95, font_size=style["font_size"])
+    fig.update_xaxes(title=dict(text=style["x_title"],font=dict(size=14)), range=[0, 1], title_standoff = 20)
+    fig.update_yaxes(title=dict(text=style["y_title"],font=dict(size=14)), title_standoff = 20)
+    fig.update_layout(legend=dict( yanchor="top", y=0.90, xanchor="left", x=0.01))
+    return fig.to_dict()
 
-    #longitudinal stress vs depth
-    fig_ls_d.add_trace(
-        go.Scatter(
-            name="Longitudinal Stress",
-            x=depth_values,
-            y=long_stress_values,
-            line_width=4,
-            line_color="gray")
-    )
-    #graph a line at vessel material yield stress
-    fig_ls_d.add_trace(
-        go.Scatter(
-            name="Yield Stress",
-            x=[0, max(depth_values)],
-            y=[vessel.matl.fy, vessel.matl.fy], fill="tozeroy" ,line_color="#A0E095")
-    )
-    if max(long_stress_values) > float(vessel.matl.fy):
-        fig_ls_d.add_trace(
-            go.Scatter(
-                name="Over Yield Stress",
-                x=[0, max(depth_values)],
-                y=[max(long_stress_values), max(long_stress_values)], fill="tonexty" ,line_color="#EF8282")
-        )
-    #pretty up longitudinal stress vs depth plot
-    fig_ls_d.update_layout(title_text="<b>Longituduinal Stress at Depth<b>", margin=dict(l=20, r=20, t=20, b=20), title_x=0.35, title_y=0.95,  font_size=20)
-    fig_ls_d.update_xaxes(title=dict(text="<b>Depth (ft)<b>",font=dict(size=14)), range=[0, max(depth_values)*1.02], title_standoff = 20)
-    fig_ls_d.update_yaxes(title=dict(text="<b>Longitudinal Stress (psi)<b>",font=dict(size=14)), title_standoff = 20)
-    fig_ls_d.update_layout(legend=dict( yanchor="top", y=0.90, xanchor="left", x=0.01))
-    figures.update({"fig_ls_d":fig_ls_d})
+def stress_figure(chart: str, wall_type: str, x_values: np.ndarray, stress_values: np.ndarray, fy: float)->go.Figure:
+    """
+    assembles one stress verse depth or pressure plot with bands under and over yield stress
+    only the trace data and x axis range are patched onto the cached figure_template,
+    the over yield band is dropped when the stress stays under yield
+    chart is one of the keys of chart_styles
+    """
+    template=figure_template(chart, wall_type)
+    x_max=float(np.max(x_values))
+    stress_max=float(np.max(stress_values))
+
+    stress, under_yield, over_yield=[dict(trace) for trace in template["data"]]
+    stress.update(x=x_values, y=stress_values)
+    under_yield.update(x=[0, x_max], y=[fy, fy])
+    over_yield.update(x=[0, x_max], y=[stress_max, stress_max])
+    data=[stress, under_yield]
+    if stress_max > fy:
+        data.append(over_yield)
+
+    layout=dict(template["layout"])
+    layout["xaxis"]=dict(layout["xaxis"], range=[0, x_max*1.02])
+
+    #the template was validated when it was built, skip validating it again
+    fig=go.Figure({"data":data, "layout":layout}, _validate=False)
+    return fig
+
+def hoop_and_long_figures(wall_type: str, depth_values: np.ndarray, pressure_values: np.ndarray,
+                          hoop_stress_values: np.ndarray, long_stress_values: np.ndarray, fy: float)->dict(fig):
+    """
+    assembles the four hoop and longitudinal stress plots from one set of swept arrays
+    returns a dictionary keyed "fig_hs_d", "fig_hs_p", "fig_ls_d" and "fig_ls_p"
+    """
+    figures={"fig_hs_d":stress_figure("hs_d", wall_type, depth_values, hoop_stress_values, fy),
+             "fig_hs_p":stress_figure("hs_p", wall_type, pressure_values, hoop_stress_values, fy),
+             "fig_ls_d":stress_figure("ls_d", wall_type, depth_values, long_stress_values, fy),
+             "fig_ls_p":stress_figure("ls_p", wall_type, pressure_values, long_stress_values, fy)}
+    return figures
 
-    #longitudinal stress vs pressure
-    fig_ls_p.add_trace(
-        go.Scatter(
-            name="Longitudinal Stress",
-            x=pressure_values,
-            y=long_stress_values,
-            line_width=4,
-            line_color="gray")
-    )
-    #graph a line at vessel material yield stress
-    fig_ls_p.add_trace(
-        go.Scatter(
-            name="Yield Stress",
-            x=[0, max(pressure_values)],
-            y=[vessel.matl.fy, vessel.matl.fy], fill="tozeroy" ,line_color="#A0E095")
-    )
-    if max(long_stress_values) > float(vessel.matl.fy):
-        fig_ls_p.add_trace(
-            go.Scatter(
-                name="Over Yield Stress",
-                x=[0, max(pressure_values)],
-                y=[max(long_stress_values), max(long_stress_values)], fill="tonexty" ,line_color="#EF8282")
-        )
-    #pretty up longitudinal stress vs pressure plot
-    fig_ls_p.update_layout(title_text="<b>Longitudinal Stress at Pressure<b>", margin=dict(l=20, r=20, t=20, b=20), title_x=0.35, title_y=0.95, font_size=14)
-    fig_ls_p.update_xaxes(title=dict(text="<b>Pressure (psi)<b>",font=dict(size=14)), range=[0, max(pressure_values)*1.02], title_standoff = 20)
-    fig_ls_p.update_yaxes(title=dict(text="<b>Longitudinal Stress (psi)<b>",font=dict(size=14)), title_standoff = 20)
-    fig_ls_p.update_layout(legend=dict( yanchor="top", y=0.90, xanchor="left", x=0.01))
-    figures.update({"fig_ls_p":fig_ls_p})
-    
+def display_hoop_and_long_figures(vessel: vsl.vessel, depth_choice: float, percent: float)->dict(fig):
+    """
+    Takes a Vessel class object, a depth and a percent of wall thickness, sweeps depth, pressure
+    and stress in one vectorized pass and assembles only the figure set (thin or thick walled)
+    that applies to the vessel:
+        -Hoop stress verse depth
+        -Hoop stress verse pressure
+        -Longitudinal stress verse depth
+        -Longitudinal stress verse pressure
+    returns a dictionary keyed "fig_hs_d", "fig_hs_p", "fig_ls_d" and "fig_ls_p"
+    """
+    depth_values=depth_sweep(depth_choice)
+    pressure_values=epa.depth_to_pressure(depth_values)
+    results=epa.evaluate_vessel(vessel, pressure_values, percent)
+
+    figures=hoop_and_long_figures(results.wall_type, depth_values, pressure_values,
+                                  results.hoop_stress, results.longitudinal_stress, float(vessel.matl.fy or 0))
+    return figures
+
+def thin_display_hoop_and_long_figures(vessel: vsl.vessel, depth_choice: float)->dict(fig):
+    """
+    Takes a Vessel class object and a depth, assembles and returns plots for:
+        -Thin Walled Hoop stress verse depth
+        -Thin Walled Hoop stress verse pressure
+        -Thin Walled Longitudinal stress verse depth
+        -Thin Walled Longitudinal stress verse pressure
+    """
+    arr=epa.vessel_arrays(vessel)
+    depth_values=depth_sweep(depth_choice)
+    pressure_values=epa.depth_to_pressure(depth_values)
+    hoop_stress_values=epa.thin_hoop_stress(pressure_values, arr["diameter"], arr["wall_thickness"])
+    long_stress_values=epa.thin_longitudinal_stress(pressure_values, arr["diameter"], arr["wall_thickness"])
+
+    figures=hoop_and_long_figures("Thin Walled", depth_values, pressure_values,
+                                  hoop_stress_values, long_stress_values, float(vessel.matl.fy or 0))
     return figures
 
 def thick_display_hoop_and_long_figures(vessel: vsl.vessel, depth_choice: float, percent: float)->dict(fig):
-    """ 
+    """
     Takes a Vessel class object and a depth, assembles and returns plots for:
         -Thick Walled Hoop stress verse depth
         -Thick Walled Hoop stress verse pressure
         -Thick Walled Longitudinal stress verse depth
         -Thick Walled Longitudinal stress verse pressure
     """
-    figures={"fig_tk_hs_d":None, "fig_tk_hs_p":None, "fig_tk_ls_d":None, "fig_tk_ls_p":None}
-    
-    pressure=epv.depth_to_pressure(depth_choice)
-
-    #create lists for X and Y values for plots
-    depth_values = list(range(1, int(round(depth_choice+1,0)), int(round((depth_choice+1)/30,0))))
-    pressure_values=[]
-    for depth in depth_values:
-        pressure_values.append(epv.depth_to_pressure(depth))
-
-    hoop_stress_values=[]
-    for pressure in pressure_values:
-        hs_latex, hs_value=epv.thick_hoop_stress(vessel, pressure, percent)
-        hoop_stress_values.append(hs_value)
- 
-
-    long_stress_values=[]
-    for pressure in pressure_values:
-        ls_latex, ls_value=epv.thick_longitudinal_stress(vessel, pressure)
-        long_stress_values.append(ls_value)
-
-    #create plots for hoop and longitudinal stress vs depth and pressure
-    fig_hs_d = go.Figure()
-    fig_hs_p = go.Figure()
-
-    fig_ls_d = go.Figure()
-    fig_ls_p = go.Figure()
-
-    #hoop stress vs depth
-    fig_hs_d.add_trace(
-        go.Scatter(
-            name="Hoop Stress",
-            x=depth_values,
-            y=hoop_stress_values,
-            line_color="white")
-    )
-    #graph a line at vessel material yield stress
-    fig_hs_d.add_trace(
-        go.Scatter(
-            name="Under Yield Stress",
-            x=[0, max(depth_values)],
-            y=[vessel.matl.fy, vessel.matl.fy], fill="tozeroy" ,line_color="#A0E095")
-    )
-    if max(hoop_stress_values) > float(vessel.matl.fy):
-        fig_hs_d.add_trace(
-            go.Scatter(
-                name="Over Yield Stress",
-                x=[0, max(depth_values)],
-                y=[max(hoop_stress_values), max(hoop_stress_values)], fill="tonexty" ,line_color="#EF8282")
-        )
-
-    #pretty up hoop stress vs depth plot
-    fig_hs_d.update_layout(title_text="<b>Hoop Stress at Depth<b>", margin=dict(l=20, r=20, t=20, b=20), title_x=0.40, title_y=0.95, font_size=32)
-    fig_hs_d.update_xaxes(title=dict(text="<b>Depth (ft)<b>",font=dict(size=14)), range=[0, max(depth_values)*1.02] ,title_standoff = 20)
-    fig_hs_d.update_yaxes(title=dict(text="<b>Hoop Stress (psi)<b>",font=dict(size=14)), title_standoff = 20)
-    fig_hs_d.update_layout(legend=dict( yanchor="top", y=0.90, xanchor="left", x=0.01))
-    figures.update({"fig_tk_hs_d":fig_hs_d})
-
-    #hoop stress vs pressure
-    fig_hs_p.add_trace(
-        go.Scatter(
-            name="Hoop Stress",
-            x=pressure_values,
-            y=hoop_stress_values,
-            line_color="white")
-    )
-    #graph a line at vessel material yield stress
-    fig_hs_p.add_trace(
-        go.Scatter(
-            name="Under Yield Stress",
-            x=[0, max(pressure_values)],
-            y=[vessel.matl.fy, vessel.matl.fy], fill="tozeroy" ,line_color="#A0E095")
-    )
-    if max(hoop_stress_values) > float(vessel.matl.fy):
-        fig_hs_p.add_trace(
-            go.Scatter(
-                name="Over Yield Stress",
-                x=[0, max(pressure_values)],
-                y=[max(hoop_stress_values), max(hoop_stress_values)], fill="tonexty" ,line_color="#EF8282")
-        )
-
-    #pretty up hoop stress vs pressure plot
-    fig_hs_p.update_layout(title_text="<b>Hoop Stress at Pressure<b>", margin=dict(l=20, r=20, t=20, b=20), title_x=0.40, title_y=0.95, font_size=32)
-    fig_hs_p.update_xaxes(title=dict(text="<b>Pressure (psi)<b>",font=dict(size=14)), range=[0, max(pressure_values)*1.02], title_standoff = 20)
-    fig_hs_p.update_yaxes(title=dict(text="<b>Hoop Stress (psi)<b>",font=dict(size=14)), title_standoff = 20)
-    fig_hs_p.update_layout(legend=dict( yanchor="top", y=0.90, xanchor="left", x=0.01))
-    figures.update({"fig_tk_hs_p":fig_hs_p})
-
-    #longitudinal stress vs depth
-    fig_ls_d.add_trace(
-        go.Scatter(
-            name="Longitudinal Stress",
-            x=depth_values,
-            y=long_stress_values,
-            line_color="white")
-    )
-    #graph a line at vessel material yield stress
-    fig_ls_d.add_trace(
-        go.Scatter(
-            name="Yield Stress",
-            x=[0, max(depth_values)],
-            y=[vessel.matl.fy, vessel.matl.fy], fill="tozeroy" ,line_color="#A0E095")
-    )
-    if max(long_stress_values) > float(vessel.matl.fy):
-        fig_ls_d.add_trace(
-            go.Scatter(
-                name="Over Yield Stress",
-                x=[0, max(depth_values)],
-                y=[max(long_stress_values), max(long_stress_values)], fill="tonexty" ,line_color="#EF8282")
-        )
-    #pretty up longitudinal stress vs depth plot
-    fig_ls_d.update_layout(title_text="<b>Longituduinal Stress at Depth<b>", margin=dict(l=20, r=20, t=20, b=20), title_x=0.35, title_y=0.95,  font_size=20)
-    fig_ls_d.update_xaxes(title=dict(text="<b>Depth (ft)<b>",font=dict(size=14)), range=[0, max(depth_values)*1.02], title_standoff = 20)
-    fig_ls_d.update_yaxes(title=dict(text="<b>Longitudinal Stress (psi)<b>",font=dict(size=14)), title_standoff = 20)
-    fig_ls_d.update_layout(legend=dict( yanchor="top", y=0.90, xanchor="left", x=0.01))
-    figures.update({"fig_tk_ls_d":fig_ls_d})
+    arr=epa.vessel_arrays(vessel)
+    depth_values=depth_sweep(depth_choice)
+    pressure_values=epa.depth_to_pressure(depth_values)
+    hoop_stress_values=epa.thick_hoop_stress(pressure_values, arr["diameter"], arr["wall_thickness"], percent)
+    long_stress_values=epa.thick_longitudinal_stress(pressure_values, arr["diameter"], arr["wall_thickness"])
+
+    figures=hoop_and_long_figures("Thick Walled", depth_values, pressure_values,
+                                  hoop_stress_values, long_stress_values, float(vessel.matl.fy or 0))
+    figures={key.replace("fig_", "fig_tk_"):fig for key, fig in figures.items()}
+    return figures
 
-    #longitudinal stress vs pressure
-    fig_ls_p.add_trace(
-        go.Scatter(
-            name="Longitudinal Stress",
-            x=pressure_values,
-            y=long_stress_values,
-            line_color="white")
-    )
-    #graph a line at vessel material yield stress
-    fig_ls_p.add_trace(
-        go.Scatter(
-            name="Yield Stress",
-            x=[0, max(pressure_values)],
-            y=[vessel.matl.fy, vessel.matl.fy], fill="tozeroy" ,line_color="#A0E095")
-    )
-    if max(long_stress_values) > float(vessel.matl.fy):
-        fig_ls_p.add_trace(
-            go.Scatter(
-                name="Over Yield Stress",
-                x=[0, max(pressure_values)],
-                y=[max(long_stress_values), max(long_stress_values)], fill="tonexty" ,line_color="#EF8282")
-        )
-    #pretty up longitudinal stress vs pressure plot
-    fig_ls_p.update_layout(title_text="<b>Longitudinal Stress at Pressure<b>", margin=dict(l=20, r=20, t=20, b=20), title_x=0.35, title_y=0.95, font_size=14)
-    fig_ls_p.update_xaxes(title=dict(text="<b>Pressure (psi)<b>",font=dict(size=14)), range=[0, max(pressure_values)*1.02], title_standoff = 20)
-    fig_ls_p.update_yaxes(title=dict(text="<b>Longitudinal Stress (psi)<b>",font=dict(size=14)), title_standoff = 20)
-    fig_ls_p.update_layout(legend=dict( yanchor="top", y=0.90, xanchor="left", x=0.01))
-    figures.update({"fig_tk_ls_p":fig_ls_p})
-    
-    return figures
\ No newline at end of file
+def stress_field_figure(component: str, y_values: np.ndarray, y_title: str, field: dict)->go.Figure:
+    """
+    contour map of one stress component of epa.thick_stress_field over the wall
+    (percent of wall thickness, 0%=ID 100%=OD) and depth or pressure
+    component is one of the keys of field_styles
+    """
+    style=field_styles[component]
+    fig=go.Figure(
+        go.Contour(
+            x=field["percent"],
+            y=y_values,
+            z=field[component],
+            colorscale="Viridis",
+            colorbar=dict(title=dict(text=style["z_title"], side="right")),
+            contours=dict(showlabels=True, labelfont=dict(color="white")))
+    )
+    fig.update_layout(title_text=style["title"], margin=dict(l=20, r=20, t=40, b=20), title_x=0.35, title_y=0.97, font_size=14)
+    fig.update_xaxes(title=dict(text="<b>Wall Position (% of thickness, 0%=ID)<b>",font=dict(size=14)), title_standoff = 20)
+    fig.update_yaxes(title=dict(text=y_title,font=dict(size=14)), title_standoff = 20)
+    return fig
+
+def display_stress_field_figures(vessel: vsl.vessel, depth_choice: float, points: int=51)->dict(fig):
+    """
+    Takes a Vessel class object and a depth, evaluates the thick walled stress field over
+    the depth sweep and points positions through the wall in one call and assembles contour maps of:
+        -Hoop stress through the wall verse depth and pressure
+        -Radial stress through the wall verse depth and pressure
+        -Shear stress through the wall verse depth and pressure
+    returns a dictionary keyed "fig_hf_d", "fig_hf_p", "fig_rf_d", "fig_rf_p", "fig_sf_d" and "fig_sf_p"
+    """
+    arr=epa.vessel_arrays(vessel)
+    depth_values=depth_sweep(depth_choice)
+    pressure_values=epa.depth_to_pressure(depth_values)
+    field=epa.thick_stress_field(pressure_values, arr["diameter"], arr["wall_thickness"], np.linspace(0, 100, points))
+
+    figures={}
+    for component, style in field_styles.items():
+        figures[f"fig_{style['key']}_d"]=stress_field_figure(component, depth_values, "<b>Depth (ft)<b>", field)
+        figures[f"fig_{style['key']}_p"]=stress_field_figure(component, pressure_values, "<b>Pressure (psi)<b>", field)
+    return figures
@@ -0,0 +1,465 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Calculation package export for a batch of vessel designs
+every design (see batch.design_fields) gets a package with its pass/fail summary, the
+Handcalcs LaTeX of the ext_presure_vessel_functions calculations and the stress figures:
+    -html: MathJax renders the LaTeX, figures are PNG images if kaleido is installed,
+     otherwise interactive plotly figures, MathJax (and plotly.js for interactive figures)
+     are loaded from a CDN so the LaTeX only renders online unless mathjax points to a
+     local copy of tex-chtml.js (--mathjax)
+    -latex: a .tex document, figures are included as PNG images if kaleido is installed
+    -pdf: the .tex document compiled with pdflatex (must be on the PATH)
+designs are rendered in chunks across a process pool, the templates are compiled once per
+process and an index.html and summary.csv of every design are written with the packages
+designs missing a material property still get a package, calculations that need the
+property are listed as not calculated and buckling as not checked
+usage:
+    python -m layout.report designs.csv -o reports --format html latex
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import csv
+import html
+import importlib.util
+import os
+import re
+import shutil
+import string
+import subprocess
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import materials.materials as mt
+import materials.material_columns as mc
+import pressure_vessel.vessel as pv
+import pressure_vessel.depth_models as dm
+import pressure_vessel.ext_presure_vessel_functions as epv
+import pressure_vessel.batch as bt
+import pressure_vessel.combined_stress as cs
+import layout.figures as fgs
+
+report_formats=("html", "latex", "pdf")
+package_fields=["number", "html", "tex", "pdf"]
+summary_fields=package_fields+bt.result_fields+["von_mises_stress", "yield_safety_factor"]
+
+#calculation sections of each package:
+#(title, decorated function, arguments after vessel and pressure, material properties used)
+#"percent" is filled in from the design, buckling is only in the summary as it has no Handcalcs rendering
+thin_sections=(("Hoop Stress", epv.thin_hoop_stress, (), ()),
+               ("Longitudinal Stress", epv.thin_longitudinal_stress, (), ()),
+               ("Diameter Reduction", epv.thin_diameter_reduction, (), ("E", "v")),
+               ("Length Reduction", epv.thin_length_reduction, (), ("E", "v")))
+thick_sections=(("Hoop Stress", epv.thick_hoop_stress, ("percent",), ()),
+                ("Maximum Hoop Stress", epv.thick_hoop_stress_max, (), ()),
+                ("Longitudinal Stress", epv.thick_longitudinal_stress, (), ()),
+                ("Outer Diameter Reduction", epv.thick_outer_diameter_reduction, (), ("E", "v")),
+                ("Length Reduction", epv.thick_length_reduction, (), ("E", "v")))
+
+#material properties checked before rendering, and their names in the packages
+property_names={"fy":"yield strength", "E":"modulus of elasticity", "v":"Poisson's ratio"}
+
+#MathJax loaded by the html packages
+mathjax_url="https://cdn.jsdelivr.net/npm/mathjax@3/es5/tex-chtml.js"
+
+#summary lines of each package: (title, result name, number format)
+summary_lines=(("Material", "matl_label", "{}"), ("Length (in)", "length", "{:.3f}"),
+               ("Diameter (in)", "diameter", "{:.3f}"), ("Wall Thickness (in)", "wall_thickness", "{:.3f}"),
+               ("Depth (ft)", "depth", "{:.1f}"), ("Pressure (psi)", "pressure", "{:.1f}"),
+               ("Wall Type", "wall_type", "{}"), ("R/t", "thickness_ratio", "{:.2f}"),
+               ("Hoop Stress (psi)", "hoop_stress", "{:.0f}"), ("Longitudinal Stress (psi)", "longitudinal_stress", "{:.0f}"),
+               ("Von Mises Stress (psi)", "von_mises_stress", "{:.0f}"), ("Yield Stress (psi)", "fy", "{:.0f}"),
+               ("Yield Safety Factor", "yield_safety_factor", "{:.2f}"),
+               ("Critical Buckling Pressure (psi)", "critical_buckling_pressure", "{:.1f}"),
+               ("Buckling Mode", "buckling_mode", "{}"), ("Yield Check", "yield_ok", "{}"),
+               ("Buckling Check", "buckling_ok", "{}"))
+
+#templates, compiled once per process
+html_template=string.Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Calculation Package: ${label}</title>
+<script src="${mathjax}" async></script>
+<style>
+body {font-family: sans-serif; margin: 2em auto; max-width: 1100px;}
+table {border-collapse: collapse;}
+td, th {border: 1px solid #999; padding: 0.2em 0.6em; text-align: left;}
+.PASS {color: green;} .FAIL {color: red;} .INCOMPLETE {color: orange;}
+img {max-width: 100%;}
+</style>
+</head>
+<body>
+<h1>Calculation Package: ${label}</h1>
+<h2>Summary: <span class="${status}">${status}</span></h2>
+<table>
+${summary}
+</table>
+<h2>Calculations</h2>
+${calculations}
+<h2>Figures</h2>
+${figures}
+</body>
+</html>
+""")
+html_row_template=string.Template("<tr><th>${name}</th><td>${value}</td></tr>")
+html_section_template=string.Template("<h3>${title}</h3>\n<div>\n${latex}\n</div>")
+html_image_template=string.Template('<img src="data:image/png;base64,${data}" alt="${name}">')
+
+latex_template=string.Template(r"""\documentclass{article}
+\usepackage[margin=0.75in]{geometry}
+\usepackage{amsmath}
+\usepackage{graphicx}
+\title{Calculation Package: ${label}}
+\date{}
+\begin{document}
+\maketitle
+\section*{Summary: ${status}}
+\begin{tabular}{ll}
+\hline
+${summary}
+\hline
+\end{tabular}
+\section*{Calculations}
+${calculations}
+\section*{Figures}
+${figures}
+\end{document}
+""")
+latex_row_template=string.Template(r"${name} & ${value} \\")
+latex_section_template=string.Template("\\subsection*{${title}}\n${latex}")
+latex_image_template=string.Template("\\begin{center}\n\\includegraphics[width=0.9\\textwidth]{${path}}\n\\end{center}")
+
+index_template=string.Template("""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Calculation Packages</title>
+<style>
+body {font-family: sans-serif; margin: 2em;}
+table {border-collapse: collapse;}
+td, th {border: 1px solid #999; padding: 0.2em 0.6em; text-align: left;}
+.PASS {color: green;} .FAIL {color: red;} .INCOMPLETE {color: orange;}
+</style>
+</head>
+<body>
+<h1>Calculation Packages</h1>
+<p>${passed} of ${total} designs pass</p>
+<table>
+<tr><th>#</th><th>Label</th><th>Material</th><th>Result</th><th>Packages</th><th>Error</th></tr>
+${rows}
+</table>
+</body>
+</html>
+""")
+index_row_template=string.Template('<tr><td>${number}</td><td>${label}</td><td>${matl_label}</td>'
+                                   '<td class="${status}">${status}</td><td>${links}</td><td>${error}</td></tr>')
+
+latex_special=re.compile(r"([\\&%$#_{}~^])")
+latex_replacements={"\\":r"\textbackslash{}", "~":r"\textasciitilde{}", "^":r"\textasciicircum{}"}
+
+def latex_escape(text: str)->str:
+    """
+    text with the LaTeX special characters escaped
+    """
+    return latex_special.sub(lambda match: latex_replacements.get(match.group(1), "\\"+match.group(1)), str(text))
+
+def can_rasterize()->bool:
+    """
+    True if plotly can write PNG images (kaleido is installed)
+    """
+    return importlib.util.find_spec("kaleido") is not None
+
+def package_name(number: int, label: str)->str:
+    """
+    file name (without extension) of the package of a design
+    """
+    slug=re.sub(r"[^A-Za-z0-9_.-]+", "_", str(label)).strip("_.") or "design"
+    return f"{number:04d}_{slug}"
+
+def status_text(result: dict)->str:
+    """
+    PASS, FAIL, or INCOMPLETE for a design with a package that could not be fully checked
+    """
+    if result["passed"]:
+        return "PASS"
+    return "INCOMPLETE" if result["error"] and (result["html"] or result["tex"]) else "FAIL"
+
+def missing_properties(matl: mt.material)->list(str):
+    """
+    names of the checked material properties (see property_names) that are missing or not numeric
+    """
+    return [name for name in property_names if np.isnan(mc.to_float(getattr(matl, name)))]
+
+def missing_text(names)->str:
+    return "missing "+", ".join(property_names[name] for name in names)
+
+def wall_type(result: dict)->str:
+    return "Thick Walled" if result["thickness_ratio"]<10 else "Thin Walled"
+
+def format_value(value, number_format: str)->str:
+    if value is None:
+        return "NOT CHECKED"
+    if isinstance(value, bool):
+        return "OK" if value else "NOT OK"
+    if number_format=="{}":
+        return str(value)
+    return number_format.format(mc.to_float(value))
+
+def design_vessel(result: dict, catalog: mt.material_catalog)->pv.vessel:
+    return pv.vessel(matl_label=str(result["label"]), matl=catalog.get(str(result["matl_label"])),
+                     length=mc.to_float(result["length"]), diameter=mc.to_float(result["diameter"]),
+                     wall_thickness=mc.to_float(result["wall_thickness"]))
+
+def calculation_latex(result: dict, vessel: pv.vessel, percent: float)->list(tuple):
+    """
+    (title, Handcalcs LaTeX, note) of each calculation section of a design, sections using a
+    missing material property are not rendered, their LaTeX is None and the note says why
+    """
+    sections=thick_sections if wall_type(result)=="Thick Walled" else thin_sections
+    parameters={"percent":percent}
+    missing=missing_properties(vessel.matl)
+    latex=[]
+    for title, func, names, properties in sections:
+        unavailable=[name for name in properties if name in missing]
+        if unavailable:
+            latex.append((title, None, f"Not calculated, {missing_text(unavailable)}."))
+            continue
+        rendered, value=func(vessel, result["pressure"], *[parameters[name] for name in names])
+        latex.append((title, rendered, ""))
+    return latex
+
+def design_figures(result: dict, vessel: pv.vessel, percent: float)->dict(fig):
+    """
+    the stress figures of a design, with the through thickness fields of thick walled designs
+    """
+    depth=mc.to_float(result["depth"])
+    thick_walled=wall_type(result)=="Thick Walled"
+    figures=dict(fgs.display_hoop_and_long_figures(vessel, depth, percent if thick_walled else 0))
+    if thick_walled:
+        figures.update(fgs.display_stress_field_figures(vessel, depth))
+    return figures
+
+def summary_rows(result: dict, row_template: string.Template, escape)->str:
+    """
+    summary table rows of a design, buckling is not checked when its critical pressure is unknown
+    """
+    values=dict(result)
+    if not np.isfinite(result["critical_buckling_pressure"]):
+        values["buckling_ok"]=None
+    rows=[row_template.substitute(name=escape(name), value=escape(format_value(values[key], number_format)))
+          for name, key, number_format in summary_lines]
+    if result["error"]:
+        rows.append(row_template.substitute(name="Note", value=escape(result["error"])))
+    return "\n".join(rows)
+
+def write_html(path: str, result: dict, latex: list(tuple), figures: dict(fig), images: dict(str,bytes),
+               mathjax: str=mathjax_url):
+    if images:
+        figure_html=[html_image_template.substitute(data=base64.b64encode(images[name]).decode(), name=name)
+                     for name in figures]
+    else:
+        #plotly.js is loaded once, by the first figure
+        figure_html=[figure.to_html(full_html=False, include_plotlyjs="cdn" if index==0 else False)
+                     for index, figure in enumerate(figures.values())]
+    calculations="\n".join(html_section_template.substitute(title=html.escape(title),
+                                                            latex=html.escape(rendered if rendered is not None else note))
+                           for title, rendered, note in latex)
+    content=html_template.substitute(mathjax=html.escape(mathjax), label=html.escape(str(result["label"])),
+                                     status=status_text(result),
+                                     summary=summary_rows(result, html_row_template, html.escape),
+                                     calculations=calculations, figures="\n".join(figure_html))
+    with open(path, "w", encoding="utf-8") as html_file:
+        html_file.write(content)
+
+def write_latex(path: str, result: dict, latex: list(tuple), image_paths: dict(str,str)):
+    if image_paths:
+        figures="\n".join(latex_image_template.substitute(path=image_path) for image_path in image_paths.values())
+    else:
+        figures="Figures are not included, install kaleido to rasterize them."
+    calculations="\n".join(latex_section_template.substitute(title=title, latex=rendered if rendered is not None else latex_escape(note))
+                           for title, rendered, note in latex)
+    content=latex_template.substitute(label=latex_escape(result["label"]), status=status_text(result),
+                                      summary=summary_rows(result, latex_row_template, latex_escape),
+                                      calculations=calculations, figures=figures)
+    with open(path, "w", encoding="utf-8") as tex_file:
+        tex_file.write(content)
+
+def compile_pdf(tex_path: str)->str:
+    """
+    runs pdflatex on a .tex file in its own directory, returns the path of the pdf
+    """
+    directory, tex_name=os.path.split(tex_path)
+    completed=subprocess.run(["pdflatex", "-interaction=nonstopmode", "-halt-on-error", tex_name],
+                             cwd=directory or ".", stdout=subprocess.PIPE, stderr=subprocess.STDOUT, timeout=300)
+    if completed.returncode!=0:
+        raise RuntimeError(f"pdflatex failed on {tex_path}")
+    return os.path.splitext(tex_path)[0]+".pdf"
+
+def render_package(result: dict, catalog: mt.material_catalog, output_dir: str, formats: tuple(str),
+                   percent: float, rasterize: bool, mathjax: str=mathjax_url)->dict:
+    """
+    writes the package files of one evaluated design, returns their paths (relative to output_dir)
+    """
+    paths={"html":"", "tex":"", "pdf":""}
+    vessel=design_vessel(result, catalog)
+    latex=calculation_latex(result, vessel, percent)
+    figures=design_figures(result, vessel, percent)
+    name=package_name(result["number"], result["label"])
+
+    images={}
+    image_paths={}
+    if rasterize:
+        images={key:figure.to_image(format="png") for key, figure in figures.items()}
+    if "html" in formats:
+        paths["html"]=name+".html"
+        write_html(os.path.join(output_dir, paths["html"]), result, latex, figures, images, mathjax)
+    if "latex" in formats or "pdf" in formats:
+        if images:
+            os.makedirs(os.path.join(output_dir, name+"_figures"), exist_ok=True)
+            for key, image in images.items():
+                image_paths[key]=f"{name}_figures/{key}.png"
+                with open(os.path.join(output_dir, image_paths[key]), "wb") as image_file:
+                    image_file.write(image)
+        paths["tex"]=name+".tex"
+        write_latex(os.path.join(output_dir, paths["tex"]), result, latex, image_paths)
+    if "pdf" in formats:
+        paths["pdf"]=os.path.relpath(compile_pdf(os.path.join(output_dir, paths["tex"])), output_dir)
+    return paths
+
+def can_render(result: dict, catalog: mt.material_catalog)->bool:
+    """
+    True if a package can be written for a design, its material is known and its pressure
+    and geometry could be evaluated, missing E or v only leave buckling unchecked
+    """
+    matl=catalog.get(str(result["matl_label"]))
+    return (matl is not None and "fy" not in missing_properties(matl)
+            and np.isfinite(result["pressure"]) and np.isfinite(result["thickness_ratio"]))
+
+def render_chunk(chunk: list(tuple), matl_file: str, output_dir: str, formats: tuple(str), percent: float,
+                 mathjax: str=mathjax_url, depth_model: str=None)->list(dict):
+    """
+    evaluates a chunk of (number, design) with batch.evaluate_chunk and writes a package for
+    every design that could be evaluated, returns the summary rows
+    depth_model names the depth model of the pressures and figures (None for the model in use),
+    a worker process not already using it switches to it
+    """
+    if depth_model is not None and depth_model!=dm.depth_model_name():
+        dm.set_depth_model(dm.named_depth_model(depth_model))
+    catalog=mt.load_matl_catalog(matl_file)
+    rasterize=can_rasterize()
+    results=bt.evaluate_chunk([design for number, design in chunk], matl_file, depth_model, catalog)
+    rows=[]
+    for (number, design), result in zip(chunk, results):
+        result.update({"number":number, "html":"", "tex":"", "pdf":"",
+                       "von_mises_stress":float("nan"), "yield_safety_factor":float("nan")})
+        if can_render(result, catalog):
+            result["wall_type"]=wall_type(result)
+            combined=cs.vessel_combined_stress(design_vessel(result, catalog), result["pressure"])
+            result["von_mises_stress"]=float(combined["von_mises_stress"])
+            result["yield_safety_factor"]=float(combined["yield_safety_factor"])
+            try:
+                result.update(render_package(result, catalog, output_dir, formats, percent, rasterize, mathjax))
+            except (RuntimeError, subprocess.SubprocessError, OSError, ValueError) as error:
+                result["error"]=str(error)
+                result["passed"]=False
+        rows.append(result)
+    return rows
+
+def render_packages(designs, output_dir: str, matl_file: str="material_table.csv", formats: tuple(str)=("html", "latex"),
+                    percent: float=0, chunk_size: int=8, workers: int=None, mathjax: str=mathjax_url)->dict:
+    """
+    generator of summary rows for a stream of designs, in input order, as their packages are written
+    chunks are rendered across a pool of worker processes with at most two chunks per worker
+    in flight, workers=1 renders in process, the workers are given the name of the depth model in use
+    thick walled hoop stress calculations and figures are at percent of wall thickness (0%=ID)
+    """
+    for report_format in formats:
+        if report_format not in report_formats:
+            raise ValueError(f"unknown report format {report_format!r}, expected one of {report_formats}")
+    if "pdf" in formats and shutil.which("pdflatex") is None:
+        raise ValueError("pdf packages need pdflatex on the PATH")
+    os.makedirs(output_dir, exist_ok=True)
+    formats=tuple(formats)
+    workers=workers or os.cpu_count() or 1
+    depth_model=dm.depth_model_name()
+    chunks=bt.chunked(enumerate(designs, 1), chunk_size)
+    if workers==1:
+        for chunk in chunks:
+            yield from render_chunk(chunk, matl_file, output_dir, formats, percent, mathjax, depth_model)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending=deque()
+        for chunk in chunks:
+            pending.append(pool.submit(render_chunk, chunk, matl_file, output_dir, formats, percent, mathjax,
+                                       depth_model))
+            if len(pending)>=2*workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def write_index(rows: list(dict), output_dir: str):
+    """
+    writes index.html, linking every package, and summary.csv of the summary rows
+    """
+    html_rows=[]
+    for row in rows:
+        links=" ".join(f'<a href="{html.escape(row[key])}">{key}</a>' for key in ("html", "tex", "pdf") if row[key])
+        html_rows.append(index_row_template.substitute(number=row["number"], label=html.escape(str(row["label"])),
+                                                       matl_label=html.escape(str(row["matl_label"])),
+                                                       status=status_text(row), links=links,
+                                                       error=html.escape(row["error"])))
+    with open(os.path.join(output_dir, "index.html"), "w", encoding="utf-8") as index_file:
+        index_file.write(index_template.substitute(passed=sum(bool(row["passed"]) for row in rows), total=len(rows),
+                                                   rows="\n".join(html_rows)))
+    with open(os.path.join(output_dir, "summary.csv"), "w", newline="") as summary_file:
+        writer=csv.DictWriter(summary_file, fieldnames=summary_fields, extrasaction="ignore")
+        writer.writeheader()
+        writer.writerows(rows)
+
+def export_packages(designs, output_dir: str, matl_file: str="material_table.csv", formats: tuple(str)=("html", "latex"),
+                    percent: float=0, chunk_size: int=8, workers: int=None, mathjax: str=mathjax_url)->list(dict):
+    """
+    writes the packages of every design and the index, returns the summary rows
+    """
+    rows=list(render_packages(designs, output_dir, matl_file, formats, percent, chunk_size, workers, mathjax))
+    write_index(rows, output_dir)
+    return rows
+
+def main(argv: list(str)=None)->int:
+    parser=argparse.ArgumentParser(description="Export calculation packages for a batch of pressure vessel designs")
+    parser.add_argument("designs", help="csv or json lines file of designs, - for stdin")
+    parser.add_argument("-o", "--output", default="reports", help="directory of the packages (default: reports)")
+    parser.add_argument("-m", "--materials", default="material_table.csv", help="material table csv file")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    parser.add_argument("--format", nargs="+", choices=report_formats, default=["html", "latex"],
+                        help="package formats (default: html latex)")
+    parser.add_argument("--percent", type=float, default=0, help="percent of wall thickness of thick walled hoop stress")
+    parser.add_argument("--chunk-size", type=int, default=8, help="designs rendered per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: cpu count)")
+    parser.add_argument("--mathjax", default=mathjax_url, help="url or path of MathJax tex-chtml.js (default: CDN)")
+    args=parser.parse_args(argv)
+
+    design_file=sys.stdin if args.designs=="-" else open(args.designs, newline="")
+    try:
+        designs=bt.read_designs(design_file, bt.file_format(args.designs, args.input_format))
+        rows=export_packages(designs, args.output, args.materials, args.format, args.percent, args.chunk_size, args.workers,
+                             args.mathjax)
+    finally:
+        if design_file is not sys.stdin:
+            design_file.close()
+    passed=sum(bool(row["passed"]) for row in rows)
+    print(f"{len(rows)} packages written to {args.output}, {passed} pass", file=sys.stderr)
+    return 0
+
+if __name__=="__main__":
+    sys.exit(main())
@@ -0,0 +1,141 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Binary (npz) cache of a parsed material table csv file
+the cache is written next to the csv file and is rebuilt when the csv file's
+modification time and contents (sha256) no longer match the cached values
+"""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import io
+import os
+import numpy as np
+
+cache_version=1
+
+#parsed tables already loaded by this process, keyed by csv path
+loaded_tables={}
+
+def cache_path(matl_file: str)->str:
+    """
+    path of the binary cache for a material table csv file
+    """
+    return matl_file+".cache.npz"
+
+def parse_matl_table(csv_bytes: bytes)->dict:
+    """
+    parses the contents of a material table csv file
+    returns a dictionary with:
+        header: list of column names
+        rows: list of rows, each a list of strings as read from the file
+        columns: list of typed column arrays, float (empty -> NaN) where every
+                 non empty value is numeric, int where every value is a whole
+                 number, otherwise str
+    """
+    lines=list(csv.reader(io.StringIO(csv_bytes.decode("utf-8-sig"))))
+    header=lines[0] if lines else []
+    width=len(header)
+    rows=[(line+[""]*width)[:width] for line in lines[1:] if line]
+
+    columns=[]
+    for index in range(width):
+        values=[row[index] for row in rows]
+        try:
+            column=np.array([float(value.replace(",","")) if value.strip() else np.nan for value in values], dtype=float)
+            if len(column) and not np.isnan(column).any() and (column==np.round(column)).all():
+                column=column.astype(np.int64)
+        except ValueError:
+            column=np.array(values, dtype=str)
+        columns.append(column)
+    table={"header":header, "rows":rows, "columns":columns}
+    return table
+
+def read_matl_cache(path: str)->dict:
+    """
+    reads a binary material table cache, returns None if it is missing or unreadable
+    """
+    try:
+        with np.load(path, allow_pickle=False) as cache:
+            if int(cache["version"])!=cache_version:
+                return None
+            header=cache["header"].tolist()
+            table={"header":header,
+                   "rows":cache["rows"].tolist(),
+                   "columns":[cache[f"column_{index}"] for index in range(len(header))],
+                   "mtime_ns":int(cache["mtime_ns"]),
+                   "size":int(cache["size"]),
+                   "sha256":str(cache["sha256"])}
+    except (OSError, KeyError, ValueError):
+        return None
+    return table
+
+def write_matl_cache(path: str, table: dict, mtime_ns: int, size: int, sha256: str):
+    """
+    writes a binary material table cache, a cache that can not be written is skipped
+    the file is written to a temporary name first so readers never see a partial cache
+    """
+    arrays={"version":np.array(cache_version),
+            "header":np.array(table["header"], dtype=str),
+            "rows":np.array(table["rows"], dtype=str).reshape(len(table["rows"]), len(table["header"])),
+            "mtime_ns":np.array(mtime_ns, dtype=np.int64),
+            "size":np.array(size, dtype=np.int64),
+            "sha256":np.array(sha256)}
+    for index, column in enumerate(table["columns"]):
+        arrays[f"column_{index}"]=column
+    temp_path=f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as cache_file:
+            np.savez(cache_file, **arrays)
+        os.replace(temp_path, path)
+    except OSError:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+
+def load_matl_table(matl_file: str)->dict:
+    """
+    loads a parsed material table (see parse_matl_table) through the binary cache
+        -same mtime and size as the cache -> cache is used
+        -different mtime but same sha256 -> cache is used and its mtime updated
+        -otherwise the csv file is parsed and the cache rewritten
+    tables are also kept in memory for the life of the process
+    """
+    stat=os.stat(matl_file)
+    loaded=loaded_tables.get(matl_file)
+    if loaded is not None and loaded["mtime_ns"]==stat.st_mtime_ns and loaded["size"]==stat.st_size:
+        return loaded
+
+    path=cache_path(matl_file)
+    table=read_matl_cache(path)
+    if table is None or table["mtime_ns"]!=stat.st_mtime_ns or table["size"]!=stat.st_size:
+        with open(matl_file, "rb") as csv_file:
+            csv_bytes=csv_file.read()
+        sha256=hashlib.sha256(csv_bytes).hexdigest()
+        if table is None or table["sha256"]!=sha256:
+            table=parse_matl_table(csv_bytes)
+        table.update({"mtime_ns":stat.st_mtime_ns, "size":stat.st_size, "sha256":sha256})
+        write_matl_cache(path, table, stat.st_mtime_ns, stat.st_size, sha256)
+
+    loaded_tables[matl_file]=table
+    return table
+
+def matl_table_dataframe(table: dict):
+    """
+    pandas DataFrame of a loaded material table, empty text values become NaN
+    as they would with pandas.read_csv
+    """
+    import pandas as pd
+
+    data={}
+    for name, column in zip(table["header"], table["columns"]):
+        if column.dtype.kind=="U":
+            column=np.where(column=="", None, column.astype(object))
+        data[name]=column
+    df=pd.DataFrame(data)
+    return df
@@ -0,0 +1,92 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Columnar (struct of arrays) form of a material table, one numpy array per property
+so one geometry can be evaluated against every material in a single broadcast
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import numpy as np
+import materials.materials as mt
+
+@dataclass
+class material_columns:
+    """ 
+    material properties stored as columns, missing numeric values are NaN
+    matl_type and matl_cat are stored as integer codes into the types and categories lists
+    """
+    labels: np.ndarray
+    type_codes: np.ndarray
+    types: list(str)
+    category_codes: np.ndarray
+    categories: list(str)
+    density: np.ndarray
+    fy: np.ndarray
+    fu: np.ndarray
+    E: np.ndarray
+    G: np.ndarray
+    v: np.ndarray
+
+    def __len__(self)->int:
+        return len(self.labels)
+
+    def index(self, matl_label: str)->int:
+        """ 
+        row index of the (last) material with a label, raises KeyError if there is none
+        """
+        rows=np.flatnonzero(self.labels==matl_label)
+        if len(rows)==0:
+            raise KeyError(matl_label)
+        return int(rows[-1])
+
+    def matl_type(self)->np.ndarray:
+        """ 
+        matl_type of every row, decoded from type_codes
+        """
+        return np.asarray(self.types, dtype=object)[self.type_codes]
+
+    def matl_cat(self)->np.ndarray:
+        """ 
+        matl_cat of every row, decoded from category_codes
+        """
+        return np.asarray(self.categories, dtype=object)[self.category_codes]
+
+def to_float(value)->float:
+    """ 
+    converts a material property to a float, empty or non numeric values become NaN
+    """
+    if isinstance(value, str):
+        value=value.replace(",","").strip()
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return np.nan
+
+def generate_matl_columns(matl_list: list(mt.material))->material_columns:
+    """ 
+    converts a list of "material" class objects to material_columns
+    """
+    types, type_codes=np.unique([str(matl.matl_type) for matl in matl_list], return_inverse=True)
+    categories, category_codes=np.unique([str(matl.matl_cat) for matl in matl_list], return_inverse=True)
+
+    def column(name: str)->np.ndarray:
+        return np.array([to_float(getattr(matl, name)) for matl in matl_list], dtype=float)
+
+    columns=material_columns(labels=np.array([str(matl.matl_label) for matl in matl_list], dtype=object),
+                             type_codes=type_codes.astype(np.int32),
+                             types=types.tolist(),
+                             category_codes=category_codes.astype(np.int32),
+                             categories=categories.tolist(),
+                             density=column("density"),
+                             fy=column("fy"),
+                             fu=column("fu"),
+                             E=column("E"),
+                             G=column("G"),
+                             v=column("v"))
+    return columns
@@ -11,11 +11,37 @@ Generic material properties class object with support functions
 from __future__ import annotations
 
 from dataclasses import dataclass
-import csv
-import streamlit as st
+import numpy as np
+import utilities.cache_backend as cb
+import materials.material_cache as mtc
 
 matl_file_read_flag=0
 
+@dataclass(frozen=True)
+class sn_curve:
+    """
+    Basquin stress-life (S-N) curve, stress amplitude=coefficient*(2N)^exponent
+    amplitudes at or below the endurance limit do no damage
+    """
+    coefficient: float
+    exponent: float
+    endurance_limit: float=0
+
+    def cycles_to_failure(self, amplitude: np.ndarray)->np.ndarray:
+        """
+        cycles to failure at a stress amplitude, inf at or below the endurance limit
+        """
+        amplitude=np.abs(np.asarray(amplitude, dtype=float))
+        with np.errstate(divide="ignore"):
+            cycles=((amplitude/self.coefficient)**(1/self.exponent))/2
+        return np.where(amplitude>self.endurance_limit, cycles, np.inf)
+
+    def damage(self, amplitude: np.ndarray, counts: np.ndarray=1.0)->float:
+        """
+        Miner's rule damage of counts cycles at each stress amplitude
+        """
+        return float(np.sum(counts/self.cycles_to_failure(amplitude)))
+
 @dataclass
 class material:
     """
@@ -35,6 +61,7 @@ class material:
     v: float=0
     elongation: float=0
     area_reduc: float=0
+    sn_curve: sn_curve=None
 
     def assign_matl(self, matl: material):
         """  
@@ -55,6 +82,7 @@ class material:
         self.v=matl.v
         self.elongation=matl.elongation
         self.area_reduc=matl.area_reduc
+        self.sn_curve=matl.sn_curve
 
     def clear_matl(self):
         """ 
@@ -76,6 +104,7 @@ class material:
         self.v=0
         self.elongation=0
         self.area_reduc=0
+        self.sn_curve=None
 
     def imp_to_si(self):
         """ 
@@ -116,9 +145,10 @@ def convert_to_material(matl_list: list(str,float))->material:
     """ 
     converts a list to a "material" class object
     """
-    for element in matl_list[6:]:
-         if isinstance(element, str) and element.replace(",","").replace(".","").isnumeric():
-            element=float(element)
+    matl_list=list(matl_list)
+    for index, element in enumerate(matl_list[6:], start=6):
+        if isinstance(element, str) and element.replace(",","").replace(".","").isnumeric():
+            matl_list[index]=float(element.replace(",",""))
             
     matl=material(matl_label=matl_list[0],
                   matl_type=matl_list[1],
@@ -137,61 +167,123 @@ def convert_to_material(matl_list: list(str,float))->material:
                   )  
     return matl
 
-@st.cache_data
+@cb.cache_data
 def import_matl_table(matl_file: str)->list(material):
     """  
     imports a csv file of materials and converts each line to a "material" class object
+    the parsed file is kept in a binary cache next to the csv file (see material_cache)
     """
     if matl_file_read_flag==0:
-        matl_acc = [] 
-        with open(matl_file, "r") as csv_file:
-            csv_reader = csv.reader(csv_file)
-            for line in csv_reader:
-                matl=convert_to_material(line)
-                matl_acc.append(matl)
-            matl_acc.pop(0)
+        table=mtc.load_matl_table(matl_file)
+        matl_acc=[convert_to_material(line) for line in table["rows"]]
         return matl_acc
     else:
         return
 
+@cb.cache_data
+def load_matl_dataframe(matl_file: str, unit_system: str="imperial"):
+    """  
+    imports a csv file of materials as a pandas DataFrame, shares the parsed
+    table (and its binary cache) with import_matl_table
+    the material properties are converted from imperial to unit_system ("imperial" or "si")
+    """
+    df=mtc.matl_table_dataframe(mtc.load_matl_table(matl_file))
+    if unit_system!="imperial":
+        import materials.units as un
+
+        df=un.convert_dataframe(df, "imperial", unit_system)
+    return df
+
 def generate_matl_index(matl_list: list(material), matl_type: str)->list(str):
     """ 
     generates a list of names of all material objects in matl_list with a matl_type
     equal to the included string    
     """
-    matl_index=[]
-    for matl in matl_list:
-        if matl.matl_type==matl_type:
-            if matl.matl_label not in matl_index:
-                 matl_index.append(matl.matl_label)
-        if matl_type=="all" or matl_type=="All":
-            if matl.matl_label not in matl_index:
-                matl_index.append(matl.matl_label)  
+    if matl_type=="all" or matl_type=="All":
+        matl_index=list(dict.fromkeys(matl.matl_label for matl in matl_list))
+    else:
+        matl_index=list(dict.fromkeys(matl.matl_label for matl in matl_list if matl.matl_type==matl_type))
     #matl_index.insert(0, "---")   
     return matl_index
 
-@st.cache_data
+@cb.cache_data
 def generate_matl_type_index(matl_list: list(material))->list(str):
     """ 
     generates a list of all material types in matl_list
     """
-    matl_type_index=[]
-    for matl in matl_list:
-        if matl.matl_type not in matl_type_index:
-            matl_type_index.append(matl.matl_type)
+    matl_type_index=list(dict.fromkeys(matl.matl_type for matl in matl_list))
     matl_type_index.insert(0, "All")
     return matl_type_index
 
-@st.cache_data
+@cb.cache_data
 def generate_matl_category_index(matl_list: list(material))->list(str):
     """ 
     generates a list of all material categories in matl_list
     """
-    matl_type_index=[]
-    for matl in matl_list:
-        if matl.matl_cat not in matl_type_index:
-            matl_type_index.append(matl.matl_cat)
+    matl_type_index=list(dict.fromkeys(matl.matl_cat for matl in matl_list))
     matl_type_index.insert(0, "All")
     return matl_type_index
 
-    
\ No newline at end of file
+class material_catalog:
+    """
+    material class objects indexed by label, type, category and spec
+    with the sorted option lists used by the selection boxes, built once at load time
+    when labels repeat the last material with that label is used
+    """
+    def __init__(self, matl_list: list(material)):
+        self.materials=list(matl_list)
+        self.by_label={}
+        self.by_type={}
+        self.by_category={}
+        self.by_spec={}
+        for matl in self.materials:
+            self.by_label[matl.matl_label]=matl
+            self.by_type.setdefault(matl.matl_type, []).append(matl)
+            self.by_category.setdefault(matl.matl_cat, []).append(matl)
+            self.by_spec.setdefault(matl.spec, []).append(matl)
+
+        self.type_options=["All"]+sorted(self.by_type)
+        self.category_options=["All"]+sorted(self.by_category)
+        self.label_options={"All":sorted(self.by_label)}
+        for matl_type, matls in self.by_type.items():
+            self.label_options[matl_type]=sorted({matl.matl_label for matl in matls})
+
+        #converted copies of the catalog by unit system, built on first use
+        self.unit_copies={"imperial":self}
+
+    def __len__(self)->int:
+        return len(self.materials)
+
+    def in_units(self, unit_system: str)->material_catalog:
+        """ 
+        the catalog with its material properties in a unit system ("imperial" or "si"),
+        the table is imperial and each converted copy is only built once
+        """
+        if unit_system not in self.unit_copies:
+            import materials.units as un
+
+            self.unit_copies[unit_system]=material_catalog(un.convert_materials(self.materials, "imperial", unit_system))
+        return self.unit_copies[unit_system]
+
+    def get(self, matl_label: str)->material:
+        """ 
+        returns the material with a label, None if there is no such material
+        """
+        return self.by_label.get(matl_label)
+
+    def labels(self, matl_type: str="All")->list(str):
+        """ 
+        sorted list of material labels with a matl_type, "All" (or "all") for every label
+        """
+        if matl_type=="all":
+            matl_type="All"
+        return self.label_options.get(matl_type, [])
+
+@cb.cache_resource
+def load_matl_catalog(matl_file: str)->material_catalog:
+    """  
+    imports a csv file of materials (see import_matl_table) into an indexed material_catalog,
+    the catalog is built once and shared, it must not be modified
+    """
+    catalog=material_catalog(import_matl_table(matl_file))
+    return catalog
@@ -0,0 +1,147 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Vectorized unit conversion between the imperial and SI unit systems for material columns,
+material tables, vessel batches and result arrays, every conversion is one array operation
+per column and returns a converted copy
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import numpy as np
+import materials.materials as mt
+import materials.material_columns as mc
+
+unit_systems=("imperial", "si")
+
+#quantity: (imperial unit, SI unit, imperial to SI factor)
+units={"stress":("psi", "MPa", 1/145.04),
+       "length":("in", "mm", 25.4),
+       "depth":("ft", "m", 0.3048),
+       "density":("lb/in^3", "kg/m^3", 27679.9047),
+       "ratio":("", "", 1.0)}
+
+#quantity of each numeric material property
+material_quantities={"density":"density", "fy":"stress", "fu":"stress", "E":"stress", "G":"stress", "v":"ratio"}
+
+#material table (csv/DataFrame) column names of the material properties
+table_columns={"density":"density", "Fy":"fy", "Fu":"fu", "E":"E", "G":"G", "v":"v"}
+
+def factor(quantity: str, from_system: str, to_system: str)->float:
+    """
+    multiplier converting a quantity from one unit system to another
+    """
+    for system in (from_system, to_system):
+        if system not in unit_systems:
+            raise ValueError(f"unknown unit system {system!r}, expected one of {unit_systems}")
+    if from_system==to_system:
+        return 1.0
+    to_si=units[quantity][2]
+    return to_si if to_system=="si" else 1/to_si
+
+def unit(quantity: str, system: str)->str:
+    """
+    unit label of a quantity in a unit system
+    """
+    return units[quantity][unit_systems.index(system)]
+
+def convert(values: np.ndarray, quantity: str, from_system: str, to_system: str)->np.ndarray:
+    """
+    values of a quantity converted between unit systems
+    """
+    return np.asarray(values, dtype=float)*factor(quantity, from_system, to_system)
+
+def result_quantity(name: str)->str:
+    """
+    quantity of a result by its name, "ratio" for dimensionless results (ratios, modes, indices),
+    None when the name does not tell
+    """
+    if name.endswith("_ratio") or name in ("buckling_mode", "material_index"):
+        return "ratio"
+    if "stress" in name or "pressure" in name:
+        return "stress"
+    if name=="depth" or name.endswith("_depth"):
+        return "depth"
+    if "reduction" in name or name in ("length", "diameter", "wall_thickness", "radius"):
+        return "length"
+    return None
+
+def convert_results(results, from_system: str, to_system: str, quantities: dict(str,str)=None):
+    """
+    copy of a results dictionary (or results dataclass such as epa.vessel_results) with every
+    numeric result converted, the quantity of each result is given in quantities (None to leave
+    a result as it is, see design.result_quantities) or follows from its name (see result_quantity)
+    raises ValueError for a numeric result whose quantity is not known, flags and text are kept
+    """
+    quantities=quantities or {}
+    is_dataclass=dataclasses.is_dataclass(results)
+    values={field.name:getattr(results, field.name) for field in dataclasses.fields(results)} if is_dataclass else dict(results)
+    for name, value in values.items():
+        if not np.issubdtype(np.asarray(value).dtype, np.number):
+            continue
+        quantity=quantities[name] if name in quantities else result_quantity(name)
+        if quantity is None and name not in quantities:
+            raise ValueError(f"unknown quantity of result {name!r}, give it in quantities")
+        if quantity not in (None, "ratio"):
+            values[name]=convert(value, quantity, from_system, to_system)
+    return dataclasses.replace(results, **values) if is_dataclass else values
+
+def convert_columns(columns: mc.material_columns, from_system: str, to_system: str)->mc.material_columns:
+    """
+    copy of material_columns with every material property column converted
+    """
+    return dataclasses.replace(columns, **{name:convert(getattr(columns, name), quantity, from_system, to_system)
+                                           for name, quantity in material_quantities.items()})
+
+def convert_material(matl: mt.material, from_system: str, to_system: str)->mt.material:
+    """
+    copy of a "material" class object with its numeric properties converted, empty or
+    non numeric properties are kept as they are
+    """
+    changes={}
+    for name, quantity in material_quantities.items():
+        value=mc.to_float(getattr(matl, name))
+        if not np.isnan(value):
+            changes[name]=value*factor(quantity, from_system, to_system)
+    return dataclasses.replace(matl, **changes)
+
+def convert_materials(matl_list: list(mt.material), from_system: str, to_system: str)->list(mt.material):
+    """
+    converted copies of a list of "material" class objects, each property column is
+    converted in one array operation
+    """
+    matl_list=list(matl_list)
+    columns={name:np.array([mc.to_float(getattr(matl, name)) for matl in matl_list]) for name in material_quantities}
+    columns={name:convert(values, material_quantities[name], from_system, to_system) for name, values in columns.items()}
+    converted=[]
+    for row, matl in enumerate(matl_list):
+        changes={name:float(values[row]) for name, values in columns.items() if not np.isnan(values[row])}
+        converted.append(dataclasses.replace(matl, **changes))
+    return converted
+
+def convert_batch(batch, from_system: str, to_system: str):
+    """
+    copy of a vessel batch (pressure_vessel.vessel.vessel_batch) with its geometry and
+    materials converted
+    """
+    return dataclasses.replace(batch, matls=convert_materials(batch.matls, from_system, to_system),
+                               length=convert(batch.length, "length", from_system, to_system),
+                               diameter=convert(batch.diameter, "length", from_system, to_system),
+                               wall_thickness=convert(batch.wall_thickness, "length", from_system, to_system))
+
+def convert_dataframe(df, from_system: str, to_system: str):
+    """
+    copy of a material table DataFrame (see load_matl_dataframe) with the material
+    property columns converted
+    """
+    df=df.copy()
+    for column in df.columns:
+        name=table_columns.get(str(column).strip())
+        if name is not None:
+            df[column]=convert(df[column].to_numpy(), material_quantities[name], from_system, to_system)
+    return df
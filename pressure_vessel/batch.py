@@ -0,0 +1,215 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Command line batch evaluation of vessel designs
+designs are streamed from a csv or json lines file with the fields:
+    label, matl_label, length, diameter, wall_thickness, depth
+(L, D, t and material are accepted for length, diameter, wall_thickness and matl_label)
+and are evaluated in chunks with the array functions, chunks are spread across a
+process pool and results are streamed out in input order
+usage:
+    python -m pressure_vessel.batch designs.csv -o results.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import itertools
+import json
+import math
+import os
+import sys
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import materials.materials as mt
+import materials.material_columns as mc
+import pressure_vessel.depth_models as dm
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+design_fields=["label", "matl_label", "length", "diameter", "wall_thickness", "depth"]
+field_aliases={"L":"length", "D":"diameter", "t":"wall_thickness", "material":"matl_label"}
+result_fields=design_fields+["pressure", "thickness_ratio", "wall_type", "hoop_stress", "longitudinal_stress",
+                             "fy", "critical_buckling_pressure", "buckling_mode", "yield_ok", "buckling_ok",
+                             "passed", "error"]
+
+def read_designs(design_file, file_format: str)->dict:
+    """
+    generator of designs (dictionaries of design_fields) read one line at a time
+    from an open csv ("csv") or json lines ("jsonl") file
+    """
+    if file_format=="csv":
+        lines=csv.DictReader(design_file)
+    else:
+        lines=(json.loads(line) for line in design_file if line.strip())
+    for line in lines:
+        yield normalize_design(line)
+
+def normalize_design(line: dict)->dict:
+    """
+    design dictionary of design_fields from a dictionary that may use the field aliases,
+    missing fields are empty
+    """
+    design={field_aliases.get(key.strip(), key.strip()):value for key, value in line.items() if key is not None}
+    return {field:design.get(field, "") for field in design_fields}
+
+def chunked(designs, chunk_size: int)->list(dict):
+    """
+    generator of lists of at most chunk_size designs
+    """
+    designs=iter(designs)
+    while True:
+        chunk=list(itertools.islice(designs, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def missing_values(values: dict(str,np.ndarray), index: int)->str:
+    """
+    error naming the design fields and material properties of one design that are missing
+    or not numeric, empty if every value needed by the checks is there
+    """
+    missing=[field if field in design_fields else "material property "+field
+             for field, column in values.items() if np.isnan(column[index])]
+    return "missing or invalid "+", ".join(missing) if missing else ""
+
+def evaluate_chunk(chunk: list(dict), matl_file: str, depth_model: str=None,
+                   catalog: mt.material_catalog=None)->list(dict):
+    """
+    evaluates a chunk of designs with epa.check_designs, one array operation per chunk
+    depths are converted with the named depth model (see depth_models.named_depth_model),
+    None for the model in use, materials are from catalog, or loaded from matl_file if it is None
+    designs with an unknown material, a missing material property (such as an empty Poisson's
+    ratio) or non numeric values get an error and do not pass, yield_ok and buckling_ok are
+    still given for the checks that could be made
+    """
+    catalog=catalog or mt.load_matl_catalog(matl_file)
+    size=len(chunk)
+    values={field:np.full(size, np.nan) for field in ("length", "diameter", "wall_thickness", "depth", "E", "v", "fy")}
+    errors=[""]*size
+    for index, design in enumerate(chunk):
+        matl=catalog.get(str(design["matl_label"]))
+        if matl is None:
+            errors[index]=f"unknown material {design['matl_label']!r}"
+            continue
+        for field in ("length", "diameter", "wall_thickness", "depth"):
+            values[field][index]=mc.to_float(design[field])
+        for field in ("E", "v", "fy"):
+            values[field][index]=mc.to_float(getattr(matl, field))
+
+    model=dm.get_depth_model() if depth_model is None else dm.named_depth_model(depth_model)
+    pressure=model.depth_to_pressure(values["depth"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        checks=epa.check_designs(pressure, values["diameter"], values["wall_thickness"], values["length"],
+                                 values["E"], values["v"], values["fy"])
+
+    results=[]
+    for index, design in enumerate(chunk):
+        error=errors[index] or missing_values(values, index)
+        result=dict(design)
+        result.update({"pressure":float(pressure[index]),
+                       "thickness_ratio":float(checks["thickness_ratio"][index]),
+                       "wall_type":"" if error else "Thick Walled" if checks["thick_walled"][index] else "Thin Walled",
+                       "hoop_stress":float(checks["hoop_stress"][index]),
+                       "longitudinal_stress":float(checks["longitudinal_stress"][index]),
+                       "fy":float(values["fy"][index]),
+                       "critical_buckling_pressure":float(checks["critical_buckling_pressure"][index]),
+                       "buckling_mode":int(checks["buckling_mode"][index]),
+                       "yield_ok":bool(checks["yield_ok"][index]),
+                       "buckling_ok":bool(checks["buckling_ok"][index]),
+                       "passed":bool(checks["passed"][index]) and not error,
+                       "error":error})
+        results.append(result)
+    return results
+
+def evaluate_designs(designs, matl_file: str, chunk_size: int=10000, workers: int=None)->dict:
+    """
+    generator of results for a stream of designs, in input order
+    chunks are spread across a pool of worker processes with at most two chunks per
+    worker in flight so memory use does not grow with the input, workers=1 runs in process
+    the workers are given the name of the depth model in use
+    """
+    workers=workers or os.cpu_count() or 1
+    depth_model=dm.depth_model_name()
+    chunks=chunked(designs, chunk_size)
+    if workers==1:
+        for chunk in chunks:
+            yield from evaluate_chunk(chunk, matl_file, depth_model)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending=deque()
+        for chunk in chunks:
+            pending.append(pool.submit(evaluate_chunk, chunk, matl_file, depth_model))
+            if len(pending)>=2*workers:
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
+
+def json_safe(value):
+    """
+    value with NaN and inf floats replaced by None so it encodes as strict JSON
+    """
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key:json_safe(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [json_safe(item) for item in value]
+    return value
+
+def write_results(results, result_file, file_format: str):
+    """
+    writes results to an open file as they arrive, csv or json lines ("jsonl"),
+    NaN values are written to json lines as null
+    """
+    if file_format=="csv":
+        writer=csv.DictWriter(result_file, fieldnames=result_fields, extrasaction="ignore")
+        writer.writeheader()
+        for result in results:
+            writer.writerow(result)
+    else:
+        for result in results:
+            result_file.write(json.dumps(json_safe(result), allow_nan=False)+"\n")
+
+def file_format(path: str, given: str)->str:
+    """
+    file format from the --format options or the file extension, csv by default
+    """
+    if given:
+        return given
+    return "jsonl" if path.endswith((".jsonl", ".json", ".ndjson")) else "csv"
+
+def main(argv: list(str)=None)->int:
+    parser=argparse.ArgumentParser(description="Evaluate a batch of pressure vessel designs")
+    parser.add_argument("designs", help="csv or json lines file of designs, - for stdin")
+    parser.add_argument("-o", "--output", default="-", help="results file, - for stdout (default)")
+    parser.add_argument("-m", "--materials", default="material_table.csv", help="material table csv file")
+    parser.add_argument("--input-format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    parser.add_argument("--output-format", choices=["csv", "jsonl"], help="defaults to the file extension")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="designs evaluated per chunk")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: cpu count)")
+    args=parser.parse_args(argv)
+
+    input_format=file_format(args.designs, args.input_format)
+    output_format=file_format(args.output, args.output_format)
+    design_file=sys.stdin if args.designs=="-" else open(args.designs, newline="")
+    result_file=sys.stdout if args.output=="-" else open(args.output, "w", newline="")
+    try:
+        designs=read_designs(design_file, input_format)
+        results=evaluate_designs(designs, args.materials, args.chunk_size, args.workers)
+        write_results(results, result_file, output_format)
+    finally:
+        if design_file is not sys.stdin:
+            design_file.close()
+        if result_file is not sys.stdout:
+            result_file.close()
+    return 0
+
+if __name__=="__main__":
+    sys.exit(main())
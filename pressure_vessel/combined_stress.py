@@ -0,0 +1,100 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Combined stress (von Mises and Tresca) functions for cylindrical pressure vessels,
+the principal stresses are built from the thin and thick walled array functions and
+every function broadcasts over numpy arrays (pressure sweeps, design grids)
+assumptions:
+    -vessel is cylindrical with capped ends and is a fully closed volume
+    -uniform external pressure on all surface
+    -stresses are signed, compression is negative
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import materials.material_columns as mc
+import pressure_vessel.vessel as pv
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+#equivalent stress criteria
+criteria=("von_mises", "tresca")
+
+def principal_stresses(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                       percent: np.ndarray=0)->tuple(np.ndarray):
+    """
+    signed hoop, longitudinal and radial principal stresses under external pressure
+    thin walled (R/t>=10): membrane stresses, radial stress taken as 0
+    thick walled (R/t<10): Lame stresses at percent of wall thickness where 0%=ID (default,
+    the highest stressed point) and 100%=OD
+    """
+    D=np.asarray(diameter, dtype=float)
+    thick_walled=((D/2)/wall_thickness)<10
+
+    hoop=np.where(thick_walled, -epa.thick_hoop_stress(pressure, D, wall_thickness, percent),
+                  -epa.thin_hoop_stress(pressure, D, wall_thickness))
+    long=np.where(thick_walled, -epa.thick_longitudinal_stress(pressure, D, wall_thickness),
+                  -epa.thin_longitudinal_stress(pressure, D, wall_thickness))
+    rad=np.where(thick_walled, epa.thick_radial_stress(pressure, D, wall_thickness, percent), 0.0)
+    return hoop, long, rad
+
+def von_mises_stress(s_1: np.ndarray, s_2: np.ndarray, s_3: np.ndarray)->np.ndarray:
+    """
+    von Mises (distortion energy) equivalent stress of three principal stresses
+    """
+    vm=np.sqrt((((s_1-s_2)**2)+((s_2-s_3)**2)+((s_3-s_1)**2))/2)
+    return vm
+
+def tresca_stress(s_1: np.ndarray, s_2: np.ndarray, s_3: np.ndarray)->np.ndarray:
+    """
+    Tresca (maximum shear) equivalent stress of three principal stresses,
+    the largest difference between any two of them
+    """
+    tresca=np.maximum(np.maximum(np.abs(s_1-s_2), np.abs(s_2-s_3)), np.abs(s_3-s_1))
+    return tresca
+
+def combined_stress(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                    fy: np.ndarray, fu: np.ndarray=np.nan, percent: np.ndarray=0,
+                    criterion: str="von_mises")->dict(str,np.ndarray):
+    """
+    principal stresses, von Mises and Tresca stress, utilization and safety factors
+    against yield (fy) and ultimate (fu) strength, criterion picks the equivalent stress
+    used for utilization and safety factors ("von_mises" or "tresca")
+    returns a dictionary of arrays:
+        hoop_stress, longitudinal_stress, radial_stress, von_mises_stress, tresca_stress,
+        equivalent_stress, yield_utilization, ultimate_utilization,
+        yield_safety_factor, ultimate_safety_factor
+    """
+    if criterion not in criteria:
+        raise ValueError(f"unknown criterion {criterion!r}, expected one of {criteria}")
+    hoop, long, rad=principal_stresses(pressure, diameter, wall_thickness, percent)
+    vm=von_mises_stress(hoop, long, rad)
+    tresca=tresca_stress(hoop, long, rad)
+    equivalent=vm if criterion=="von_mises" else tresca
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        results={"hoop_stress":hoop,
+                 "longitudinal_stress":long,
+                 "radial_stress":rad,
+                 "von_mises_stress":vm,
+                 "tresca_stress":tresca,
+                 "equivalent_stress":equivalent,
+                 "yield_utilization":equivalent/fy,
+                 "ultimate_utilization":equivalent/fu,
+                 "yield_safety_factor":fy/equivalent,
+                 "ultimate_safety_factor":fu/equivalent}
+    return results
+
+def vessel_combined_stress(vessel: pv.vessel, pressure: np.ndarray, percent: np.ndarray=0,
+                           criterion: str="von_mises")->dict(str,np.ndarray):
+    """
+    combined_stress of a vessel class object with the yield and ultimate strength of its material
+    """
+    arr=epa.vessel_arrays(vessel)
+    results=combined_stress(pressure, arr["diameter"], arr["wall_thickness"], mc.to_float(vessel.matl.fy),
+                            mc.to_float(vessel.matl.fu), percent, criterion)
+    return results
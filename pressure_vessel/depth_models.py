@@ -0,0 +1,214 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Swappable depth (ft) to pressure (psi) models used by depth_to_pressure and pressure_to_depth
+models:
+    -linear: 14.7 psi per 33 ft of sea water (default)
+    -seawater: UNESCO EOS-80 density of sea water at a salinity and temperature, integrated
+     over depth with latitude dependent gravity into a dense lookup table once, conversions
+     are vectorized interpolation of evenly spaced tables in either direction
+pressures are gauge (sea pressure) unless a model is made with absolute=True, which adds
+one standard atmosphere
+the model is picked from set_depth_model, otherwise the PV_DEPTH_MODEL environment variable
+(which also reaches worker processes), otherwise linear
+every model has a name (see depth_model_name) that named_depth_model turns back into the model,
+linear and seawater models are rebuilt from their name in any process, other models only
+resolve in the process that set them with set_depth_model
+"""
+
+from __future__ import annotations
+
+import os
+import re
+from functools import lru_cache
+import numpy as np
+
+model_names=("linear", "seawater")
+
+atmosphere=14.695949                #standard atmosphere (psi)
+psi_to_bar=0.0689475729
+psi_to_pa=6894.75729
+ft_to_m=0.3048
+
+class linear_depth_model:
+    """
+    pressure rises 14.7 psi every 33 ft
+    """
+    def __init__(self, absolute: bool=False):
+        self.absolute=absolute
+        self.offset=atmosphere if absolute else 0.0
+        self.name="linear absolute" if absolute else "linear"
+
+    def depth_to_pressure(self, depth: np.ndarray)->np.ndarray:
+        return 14.7*(np.asarray(depth, dtype=float)/33.0)+self.offset
+
+    def pressure_to_depth(self, pressure: np.ndarray)->np.ndarray:
+        return 33.0*((np.asarray(pressure, dtype=float)-self.offset)/14.7)
+
+class uniform_table:
+    """
+    y(x) resampled onto evenly spaced x so a lookup is index arithmetic instead of a search,
+    outside of the table the end segments are extended linearly, NaN looks up NaN
+    """
+    def __init__(self, x: np.ndarray, y: np.ndarray, points: int):
+        self.x_0=float(x[0])
+        self.dx=(float(x[-1])-self.x_0)/(points-1)
+        self.y=np.interp(self.x_0+(self.dx*np.arange(points)), x, y)
+
+    def __call__(self, x: np.ndarray)->np.ndarray:
+        position=(np.asarray(x, dtype=float)-self.x_0)/self.dx
+        index=np.clip(np.floor(np.nan_to_num(position)), 0, len(self.y)-2).astype(np.intp)
+        fraction=position-index
+        return self.y[index]+(fraction*(self.y[index+1]-self.y[index]))
+
+class table_depth_model:
+    """
+    interpolates a table of depths (ft) and gauge pressures (psi), both increasing,
+    the table is resampled to points evenly spaced values in each direction
+    name identifies the model in cache keys, by default it is unique to the model object
+    """
+    def __init__(self, depths: np.ndarray, pressures: np.ndarray, absolute: bool=False, points: int=2**16,
+                 name: str=None):
+        self.name=name or f"table {id(self):x}"
+        self.depths=np.asarray(depths, dtype=float)
+        self.pressures=np.asarray(pressures, dtype=float)
+        self.absolute=absolute
+        self.offset=atmosphere if absolute else 0.0
+        self.to_pressure=uniform_table(self.depths, self.pressures, points)
+        self.to_depth=uniform_table(self.pressures, self.depths, points)
+
+    def depth_to_pressure(self, depth: np.ndarray)->np.ndarray:
+        return self.to_pressure(depth)+self.offset
+
+    def pressure_to_depth(self, pressure: np.ndarray)->np.ndarray:
+        return self.to_depth(np.asarray(pressure, dtype=float)-self.offset)
+
+def seawater_density(salinity: np.ndarray, temperature: np.ndarray, pressure: np.ndarray)->np.ndarray:
+    """
+    UNESCO (1981) EOS-80 density (kg/m^3) of sea water
+    salinity (practical salinity), temperature (deg C) and gauge pressure (bar)
+    check value: seawater_density(35, 25, 1000)=1062.53817
+    """
+    S=np.asarray(salinity, dtype=float)
+    T=np.asarray(temperature, dtype=float)
+    p=np.asarray(pressure, dtype=float)
+    S_15=S*np.sqrt(S)
+
+    #density at one atmosphere
+    rho_w=999.842594+T*(6.793952e-2+T*(-9.095290e-3+T*(1.001685e-4+T*(-1.120083e-6+T*6.536332e-9))))
+    rho_0=(rho_w+S*(0.824493+T*(-4.0899e-3+T*(7.6438e-5+T*(-8.2467e-7+T*5.3875e-9))))
+           +S_15*(-5.72466e-3+T*(1.0227e-4-T*1.6546e-6))+4.8314e-4*(S**2))
+
+    #secant bulk modulus (bar)
+    K_w=19652.21+T*(148.4206+T*(-2.327105+T*(1.360477e-2-T*5.155288e-5)))
+    A_w=3.239908+T*(1.43713e-3+T*(1.16092e-4-T*5.77905e-7))
+    B_w=8.50935e-5+T*(-6.12293e-6+T*5.2787e-8)
+    K_0=K_w+S*(54.6746+T*(-0.603459+T*(1.09987e-2-T*6.1670e-5)))+S_15*(7.944e-2+T*(1.6483e-2-T*5.3009e-4))
+    A=A_w+S*(2.2838e-3+T*(-1.0981e-5-T*1.6078e-6))+1.91075e-4*S_15
+    B=B_w+S*(-9.9348e-7+T*(2.0816e-8+T*9.1697e-10))
+    K=K_0+p*(A+p*B)
+
+    rho=rho_0/(1-(p/K))
+    return rho
+
+def gravity(latitude: float, depth: np.ndarray)->np.ndarray:
+    """
+    acceleration of gravity (m/s^2) at a latitude (deg) and depth (m) below the sea surface
+    """
+    sin_2=np.sin(np.radians(latitude))**2
+    g=9.780318*(1+(5.2788e-3*sin_2)+(2.36e-5*(sin_2**2)))+(1.092e-6*np.asarray(depth, dtype=float))
+    return g
+
+class seawater_depth_model(table_depth_model):
+    """
+    sea water pressure from the EOS-80 density at a constant salinity and temperature,
+    dp/dz=rho*g is integrated (trapezoid rule in pressure steps of step psi) up to
+    max_pressure psi when the model is made, 16,000 psi is past full ocean depth
+    """
+    def __init__(self, salinity: float=35.0, temperature: float=4.0, latitude: float=45.0,
+                 absolute: bool=False, max_pressure: float=20000.0, step: float=1.0):
+        self.salinity=salinity
+        self.temperature=temperature
+        self.latitude=latitude
+        pressures=np.arange(0, max_pressure+step, step, dtype=float)
+        specific_volume=1/seawater_density(salinity, temperature, pressures*psi_to_bar)
+
+        #depth (m) from the trapezoid rule, gravity is refined with the depth of the previous pass
+        depths=np.zeros_like(pressures)
+        for _ in range(3):
+            dz=specific_volume/gravity(latitude, depths)
+            depths=np.concatenate(([0.0], np.cumsum((dz[1:]+dz[:-1])/2)*(step*psi_to_pa)))
+        name=f"seawater S={salinity:g} T={temperature:g} lat={latitude:g}"+(" absolute" if absolute else "")
+        super().__init__(depths/ft_to_m, pressures, absolute, name=name)
+
+#name of a seawater model: salinity, temperature and latitude
+seawater_name=re.compile(r"seawater S=(\S+) T=(\S+) lat=(\S+)")
+
+@lru_cache(maxsize=None)
+def built_depth_model(name: str, absolute: bool):
+    """
+    linear or seawater model from its name without " absolute", seawater tables are built once per process
+    """
+    if name=="linear":
+        return linear_depth_model(absolute)
+    if name=="seawater":
+        return seawater_depth_model(absolute=absolute)
+    match=seawater_name.fullmatch(name)
+    if match is not None:
+        salinity, temperature, latitude=(float(value) for value in match.groups())
+        return seawater_depth_model(salinity, temperature, latitude, absolute)
+    raise ValueError(f"unknown depth model {name!r}, expected one of {model_names}")
+
+#models set with set_depth_model by name
+set_models={}
+
+def named_depth_model(name: str, absolute: bool=False):
+    """
+    model by name, a name from model_names (default settings) or a name given by
+    depth_model_name, names ending in " absolute" are absolute models
+    """
+    if not absolute and name in set_models:
+        return set_models[name]
+    if name.endswith(" absolute"):
+        name, absolute=name[:-len(" absolute")], True
+    return built_depth_model(name, absolute)
+
+def model_name(model)->str:
+    """
+    name of a depth model, models without a name are named by their type and object id
+    """
+    return getattr(model, "name", None) or f"{type(model).__name__} {id(model):x}"
+
+#model set with set_depth_model, None to pick it automatically
+selected_model=None
+
+def set_depth_model(model):
+    """
+    sets the depth model used by depth_to_pressure and pressure_to_depth, a name from
+    model_names or a model object, None goes back to picking the model automatically
+    """
+    global selected_model
+    if isinstance(model, str):
+        model=named_depth_model(model)
+    if model is not None:
+        set_models[model_name(model)]=model
+    selected_model=model
+
+def get_depth_model():
+    """
+    depth model in use
+    """
+    if selected_model is not None:
+        return selected_model
+    return named_depth_model(os.environ.get("PV_DEPTH_MODEL") or "linear")
+
+def depth_model_name()->str:
+    """
+    name of the depth model in use, for keying cached results that depend on it
+    and for naming the model to worker processes (see named_depth_model)
+    """
+    return model_name(get_depth_model())
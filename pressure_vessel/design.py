@@ -0,0 +1,202 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Design functions that invert the pressure vessel formulas, solved for every
+material or vessel at once
+assumptions:
+    -vessel is cylindrical with capped ends and is a fully closed volume
+    -uniform external pressure on all surface
+"""
+
+from __future__ import annotations
+
+import numpy as np
+import materials.material_columns as mc
+import pressure_vessel.vessel as pv
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+#failure modes reported as the governing criterion, "none" when it can not be found
+failure_modes=("yield hoop", "yield longitudinal", "thick walled max hoop", "buckling")
+
+#quantity of each numeric result of the design functions, for materials.units.convert_results
+result_quantities={"minimum_wall_thickness":{"thin_hoop":"length", "thick_hoop":"length", "yield":"length",
+                                             "buckling":"length", "wall_thickness":"length"},
+                   "maximum_pressure":{"thickness_ratio":"ratio", "yield_hoop":"stress", "yield_longitudinal":"stress",
+                                       "thick_max_hoop":"stress", "buckling":"stress", "buckling_mode":"ratio",
+                                       "pressure":"stress"}}
+result_quantities["maximum_depth"]={**result_quantities["maximum_pressure"], "depth":"depth"}
+
+def as_matl_columns(materials)->mc.material_columns:
+    """
+    materials as material_columns, accepts a list of "material" class objects,
+    a material_catalog or material_columns
+    """
+    if isinstance(materials, mc.material_columns):
+        return materials
+    return mc.generate_matl_columns(list(getattr(materials, "materials", materials)))
+
+def thin_hoop_wall_thickness(pressure: np.ndarray, diameter: np.ndarray, allowable: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 593 table 13.1, case 1c solved for wall thickness
+    thin walled hoop stress p*r/t equal to the allowable stress
+    """
+    r=np.asarray(diameter, dtype=float)/2
+    t=(pressure*r)/allowable
+    return t
+
+def thick_hoop_wall_thickness(pressure: np.ndarray, diameter: np.ndarray, allowable: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1c solved for wall thickness
+    maximum (ID) hoop stress 2*p*a^2/(a^2-b^2) equal to the allowable stress,
+    NaN where no wall thickness is enough (2*p >= allowable)
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    with np.errstate(invalid="ignore"):
+        t=a*(1-np.sqrt(1-((2*pressure)/allowable)))
+    return t
+
+def buckling_wall_thickness(pressure: np.ndarray, diameter: np.ndarray, length: np.ndarray,
+                            E: np.ndarray, v: np.ndarray, iterations: int=60)->np.ndarray:
+    """
+    wall thickness where the governing (minimum mode) buckling pressure of
+    Roarks 7, pp. 736 table 15.2, case 20a equals pressure
+    the critical pressure rises with thickness, so the thickness is found by bisection
+    (on log thickness) between 1e-6 of the radius and the full radius, for every case at once
+    NaN where even a solid wall would buckle or the properties are missing
+    """
+    pressure, D, l, E, v=np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in (pressure, diameter, length, E, v)])
+    r=D/2
+    low=np.log(r*1e-6)
+    high=np.log(r)
+    p_high, mode=epa.minimum_buckling_pressure(D, r, l, E, v)
+    for _ in range(iterations):
+        middle=(low+high)/2
+        p_crit, mode=epa.minimum_buckling_pressure(D, np.exp(middle), l, E, v)
+        enough=p_crit>=pressure
+        high=np.where(enough, middle, high)
+        low=np.where(enough, low, middle)
+    t=np.exp(high)
+    t=np.where(p_high>=pressure, t, np.nan)
+    return t
+
+def minimum_wall_thickness(length: float, diameter: float, depth: float, safety_factor: float, materials)->dict:
+    """
+    minimum wall thickness of a vessel rated to depth (ft) for every material, each
+    criterion is solved for all materials at once:
+        thin_hoop: thin walled hoop stress = fy/safety_factor (closed form)
+        thick_hoop: thick walled maximum hoop stress = fy/safety_factor (closed form)
+        buckling: governing buckling pressure = safety_factor*pressure (bisection)
+    the yield thickness is the thin walled result when it gives R/t>=10 otherwise the
+    thick walled result, the wall thickness is the larger of yield and buckling
+    materials missing E or v (buckling_unknown) get the yield thickness, their buckling is not checked
+    returns a dictionary of arrays (one value per material):
+        matl_label, thin_hoop, thick_hoop, yield, buckling, buckling_unknown, wall_thickness, governing
+    """
+    matls=as_matl_columns(materials)
+    pressure=epa.depth_to_pressure(depth)
+    allowable=matls.fy/safety_factor
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        t_thin=thin_hoop_wall_thickness(pressure, diameter, allowable)
+        t_thick=thick_hoop_wall_thickness(pressure, diameter, allowable)
+        t_buckling=buckling_wall_thickness(safety_factor*pressure, diameter, length, matls.E, matls.v)
+        t_yield=np.where((diameter/2)/t_thin>=10, t_thin, t_thick)
+
+    buckling_unknown=np.isnan(matls.E)|np.isnan(matls.v)
+    wall_thickness=np.fmax(t_yield, t_buckling)
+    wall_thickness[np.isnan(t_yield)|(np.isnan(t_buckling)&~buckling_unknown)]=np.nan
+    governing=np.where(np.isnan(wall_thickness), "none",
+                       np.where(t_buckling>t_yield, "buckling",
+                                np.where((diameter/2)/t_thin>=10, "yield hoop", "thick walled max hoop")))
+    thicknesses={"matl_label":matls.labels,
+                 "thin_hoop":t_thin,
+                 "thick_hoop":t_thick,
+                 "yield":t_yield,
+                 "buckling":t_buckling,
+                 "buckling_unknown":buckling_unknown,
+                 "wall_thickness":wall_thickness,
+                 "governing":governing}
+    return thicknesses
+
+def vessel_columns(vessels)->dict(str,np.ndarray):
+    """
+    diameter, wall_thickness, length, E, v and fy arrays of a vessel_batch or a sequence of
+    "vessel" (or compact_vessel) class objects, missing or non numeric values are NaN
+    """
+    if isinstance(vessels, pv.vessel_batch):
+        columns={"diameter":vessels.diameter, "wall_thickness":vessels.wall_thickness, "length":vessels.length}
+        columns.update({name:vessels.material_property(name) for name in ("E", "v", "fy")})
+        return columns
+    vessels=list(vessels)
+    columns={"diameter":np.array([mc.to_float(vessel.diameter) for vessel in vessels]),
+             "wall_thickness":np.array([mc.to_float(vessel.wall_thickness) for vessel in vessels]),
+             "length":np.array([mc.to_float(vessel.length) for vessel in vessels]),
+             "E":np.array([mc.to_float(vessel.matl.E) for vessel in vessels]),
+             "v":np.array([mc.to_float(vessel.matl.v) for vessel in vessels]),
+             "fy":np.array([mc.to_float(vessel.matl.fy) for vessel in vessels])}
+    return columns
+
+def maximum_pressure(diameter: np.ndarray, wall_thickness: np.ndarray, length: np.ndarray, E: np.ndarray,
+                     v: np.ndarray, fy: np.ndarray, safety_factor: float=1.0)->dict(str,np.ndarray):
+    """
+    maximum allowable external pressure of each vessel, every stress function solved for pressure:
+        yield hoop: thin walled hoop stress = fy/safety_factor (R/t>=10)
+        yield longitudinal: thin or thick walled longitudinal stress = fy/safety_factor
+        thick walled max hoop: thick walled maximum hoop stress = fy/safety_factor (R/t<10)
+        buckling: governing buckling pressure/safety_factor
+    returns a dictionary of arrays:
+        thickness_ratio, thick_walled, yield_hoop, yield_longitudinal, thick_max_hoop,
+        buckling, buckling_mode, buckling_unknown, pressure, governing
+    criteria that do not apply to a wall type are inf, vessels missing the properties of the
+    buckling criterion (buckling_unknown) are rated on the yield criteria alone
+    """
+    D, t, l, E, v, fy=np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in (diameter, wall_thickness, length, E, v, fy)])
+    allowable=fy/safety_factor
+    geometry=pv.geometry_coefficients(l, D, t)
+    r=geometry["r"]
+    a_2=geometry["a_2"]
+    a_2_b_2=geometry["a_2_b_2"]
+    thickness_ratio=geometry["r_t"]
+    thick_walled=thickness_ratio<10
+
+    #stresses are linear in pressure so each criterion is allowable/(stress per unit pressure)
+    p_hoop=np.where(thick_walled, np.inf, (allowable*t)/r)
+    p_long=np.where(thick_walled, (allowable*a_2_b_2)/a_2, (2*allowable*t)/r)
+    p_thick_hoop=np.where(thick_walled, (allowable*a_2_b_2)/(2*a_2), np.inf)
+    p_crit, mode=epa.minimum_buckling_pressure(D, t, l, E, v)
+    p_buckling=p_crit/safety_factor
+
+    criteria=np.stack([p_hoop, p_long, p_thick_hoop, p_buckling])
+    buckling_unknown=np.isnan(p_buckling)
+    unknown=np.isnan(criteria[:3]).any(axis=0)
+    index=np.argmin(np.where(np.isnan(criteria), np.inf, criteria), axis=0)
+    pressure=np.where(unknown, np.nan, np.take_along_axis(criteria, index[np.newaxis], axis=0)[0])
+    governing=np.where(unknown, "none", np.asarray(failure_modes)[index])
+    results={"thickness_ratio":thickness_ratio,
+             "thick_walled":thick_walled,
+             "yield_hoop":p_hoop,
+             "yield_longitudinal":p_long,
+             "thick_max_hoop":p_thick_hoop,
+             "buckling":p_buckling,
+             "buckling_mode":mode,
+             "buckling_unknown":buckling_unknown,
+             "pressure":pressure,
+             "governing":governing}
+    return results
+
+def maximum_depth(vessels, safety_factor: float=1.0)->dict(str,np.ndarray):
+    """
+    maximum allowable depth (ft) and governing failure mode of each vessel in a vessel_batch
+    or a sequence of "vessel" class objects (see maximum_pressure), all vessels are solved at once
+    returns the maximum_pressure dictionary with a "depth" array added
+    """
+    columns=vessel_columns(vessels)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        results=maximum_pressure(columns["diameter"], columns["wall_thickness"], columns["length"],
+                                 columns["E"], columns["v"], columns["fy"], safety_factor)
+    results["depth"]=epa.pressure_to_depth(results["pressure"])
+    return results
@@ -0,0 +1,390 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Array versions of the functions in ext_presure_vessel_functions
+every argument may be a float or a numpy array, arrays are broadcast
+against each other and the result is an array of the broadcast shape
+assumptions:
+    -vessel is cylindrical with capped ends and is a fully closed volume
+    -uniform external pressure on all surface
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import numpy as np
+import pressure_vessel.vessel as pv
+import pressure_vessel.depth_models as dm
+
+@dataclass
+class vessel_results:
+    """ 
+    every stress, deflection and ratio of a vessel at one or more pressures
+    thin walled vessels have no radial stress and a hoop stress that is uniform
+    through the wall, so radial_stress is 0 and hoop_stress_max equals hoop_stress
+    """
+    pressure: np.ndarray
+    thickness_ratio: float
+    wall_type: str
+    length_ratio: float
+    hoop_stress: np.ndarray
+    hoop_stress_max: np.ndarray
+    longitudinal_stress: np.ndarray
+    radial_stress: np.ndarray
+    diameter_reduction: np.ndarray
+    inner_diameter_reduction: np.ndarray
+    length_reduction: np.ndarray
+    critical_buckling_pressure: float
+    buckling_mode: int
+
+#geometry coefficients returned by vessel_geometry
+geometry_names=("a", "b", "a_2", "b_2", "a_2_b_2")
+
+def vessel_arrays(vessel: pv.vessel)->dict(str,float):
+    """
+    pulls the values used by the array functions out of a vessel class object
+    returns a dictionary of diameter, wall_thickness, length, E and v
+    """
+    arrays={"diameter":float(vessel.diameter),
+            "wall_thickness":float(vessel.wall_thickness),
+            "length":float(vessel.length),
+            "E":float(vessel.matl.E or 0),
+            "v":float(vessel.matl.v or 0)}
+    return arrays
+
+def vessel_geometry(vessel: pv.vessel)->dict(str,float):
+    """
+    geometry coefficients a, b, a_2, b_2 and a_2_b_2 of a vessel class object (see
+    vessel.geometry_coefficients), read from a compact_vessel which holds them precomputed
+    """
+    if isinstance(vessel, pv.compact_vessel):
+        return {name:getattr(vessel, name) for name in geometry_names}
+    coefficients=pv.geometry_coefficients(float(vessel.length), float(vessel.diameter), float(vessel.wall_thickness))
+    return {name:float(coefficients[name]) for name in geometry_names}
+
+def depth_to_pressure(depth: np.ndarray)->np.ndarray:
+    """
+    takes a depth in ft and returns a pressure in psi
+    with the depth model in use (see depth_models, 14.7 psi per 33 ft by default)
+    """
+    pressure=dm.get_depth_model().depth_to_pressure(depth)
+    return pressure
+
+def pressure_to_depth(pressure: np.ndarray)->np.ndarray:
+    """
+    takes a pressure in psi and returns a depth in ft
+    with the depth model in use (see depth_models, 33 ft per 14.7 psi by default)
+    """
+    depth=dm.get_depth_model().pressure_to_depth(pressure)
+    return depth
+
+def thin_hoop_stress(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 593 table 13.1, case 1c
+    hoop stress, assumes that there is no radial stress and hoop stress
+    is the uniform through out wall thickness
+    """
+    r=np.asarray(diameter, dtype=float)/2
+    hoop=(pressure*r)/wall_thickness
+    return hoop
+
+def thin_longitudinal_stress(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 593 table 13.1, case 1c longitudinal stress,
+    assumes that there is no radial stress and longitudinal stress
+    is the uniform through out wall thickness
+    """
+    r=np.asarray(diameter, dtype=float)/2
+    long=(pressure*r)/(2*wall_thickness)
+    return long
+
+def thin_diameter_reduction(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                            E: np.ndarray, v: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 593 table 13.1, case 1c
+    reduction in diameter of a pressure vessel under uniform external pressure
+    """
+    r=np.asarray(diameter, dtype=float)/2
+    dia=((-(pressure*(r**2))/(E*wall_thickness))*(1-(v/2)))*2
+    return dia
+
+def thin_length_reduction(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                          length: np.ndarray, E: np.ndarray, v: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 593 table 13.1, case 1c
+    reduction in length of a pressure vessel under uniform external pressure
+    """
+    r=np.asarray(diameter, dtype=float)/2
+    len=(-(pressure*r*length)/(E*wall_thickness))*(0.5-v)
+    return len
+
+def thin_critical_buckling_pressure(diameter: np.ndarray, wall_thickness: np.ndarray, length: np.ndarray,
+                                    E: np.ndarray, v: np.ndarray, mode: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 736 table 15.2, case 20a
+    """
+    r=np.asarray(diameter, dtype=float)/2
+    t=wall_thickness
+    l=length
+    n=np.asarray(mode, dtype=float)
+    #break apart main equation into 4 parts for convenience
+    q1=(E*(t/r))/(1+(.5*(((np.pi*r)/(n*l))**2)))
+    q2=1/((n**2)*(1+((n*l)/(np.pi*r))**2)**2)
+    q3=((n**2)*(t**2))/(12*(r**2)*(1-(v**2)))
+    q4=(1+((np.pi*r)/(n*l))**2)**2
+    p_crit=q1*(q2+(q3*q4))
+    return p_crit
+
+def minimum_buckling_pressure(diameter: np.ndarray, wall_thickness: np.ndarray, length: np.ndarray,
+                              E: np.ndarray, v: np.ndarray, min_mode: int=2, max_mode: int=500,
+                              block: int=8)->tuple(np.ndarray,np.ndarray):
+    """
+    Roarks 7, pp. 736 table 15.2, case 20a
+    governing (lowest) critical buckling pressure over the number of lobes n, and that n
+    n is searched from min_mode (2, n=1 is a rigid body shift) a block of modes at a time
+    for every vessel at once, a vessel drops out of the search once its pressure turns
+    upward since the pressure has a single minimum in n
+    returns (critical pressure, number of lobes) arrays of the broadcast shape
+    """
+    arrays=np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in (diameter, wall_thickness, length, E, v)])
+    shape=arrays[0].shape
+    D, t, l, E, v=[array.ravel() for array in arrays]
+
+    p_min=np.full(D.shape, np.inf)
+    n_min=np.zeros(D.shape, dtype=int)
+    active=np.arange(D.size)
+    n_start=min_mode
+    while active.size and n_start<=max_mode:
+        n=np.arange(n_start, min(n_start+block, max_mode+1))
+        p_crit=thin_critical_buckling_pressure(D[active,None], t[active,None], l[active,None],
+                                               E[active,None], v[active,None], n[None,:])
+        lowest=np.argmin(p_crit, axis=1)
+        p_lowest=p_crit[np.arange(active.size), lowest]
+        improved=p_lowest<p_min[active]
+        p_min[active[improved]]=p_lowest[improved]
+        n_min[active[improved]]=n[lowest[improved]]
+        #keep searching only where the pressure is still falling at the end of the block
+        still_falling=p_crit[:,-1]<=p_min[active]
+        active=active[still_falling]
+        n_start+=block
+    #vessels with missing (NaN) properties never get a pressure
+    p_min[np.isinf(p_min)]=np.nan
+    return p_min.reshape(shape), n_min.reshape(shape)
+
+def thick_hoop_stress(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                      percent: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1c
+    hoop stress at some point in the vessel wall thickness
+    specified by a percentage of wall thickness where 0%=ID and 100%=OD
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    b=a-wall_thickness
+    r=b+(wall_thickness*(np.asarray(percent, dtype=float)/100))
+    hoop=(pressure*(a**2)*((b**2)+(r**2)))/((r**2)*((a**2)-(b**2)))
+    return hoop
+
+def thick_hoop_stress_max(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1c
+    maximum hoop stress at ID
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    b=a-wall_thickness
+    hoop=(-pressure*2*(a**2))/((a**2)-(b**2))
+    return hoop
+
+def thick_longitudinal_stress(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1d
+    longitudinal (axial) stress, uniform across the cross section
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    b=a-wall_thickness
+    long=(pressure*(a**2))/((a**2)-(b**2))
+    return long
+
+def thick_radial_stress(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                        percent: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1c
+    radial stress at some point in the vessel wall thickness
+    specified by a percentage of wall thickness where 0%=ID and 100%=OD
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    b=a-wall_thickness
+    r=b+(wall_thickness*(np.asarray(percent, dtype=float)/100))
+    rad=(-pressure*(a**2)*((r**2)-(b**2)))/((r**2)*((a**2)-(b**2)))
+    return rad
+
+def thick_radial_stress_max(pressure: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1d
+    max radial stres is outer surface of vessel and equal to external pressure
+    """
+    rad=-np.asarray(pressure, dtype=float)
+    return rad
+
+def thick_shear_stress(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                       percent: np.ndarray=0)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1c
+    internal shear stress at some point in the vessel wall thickness
+    specified by a percentage of wall thickness where 0%=ID (the maximum, default) and 100%=OD
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    b=a-wall_thickness
+    r=b+(wall_thickness*(np.asarray(percent, dtype=float)/100))
+    shear=(-pressure*(a**2)*(b**2))/((r**2)*((a**2)-(b**2)))
+    return shear
+
+def thick_stress_field(pressure: np.ndarray, diameter: float, wall_thickness: float,
+                       percent: np.ndarray=None)->dict(str,np.ndarray):
+    """
+    Roarks 7, pp. 683 table 13.5, case 1c
+    hoop, radial, shear and longitudinal stress over every pressure and radial position
+    (percentage of wall thickness where 0%=ID and 100%=OD, 0 to 100% in 1% steps by default)
+    of one vessel in one call, the stresses are linear in pressure so the through thickness
+    profile is computed once per unit pressure and scaled
+    returns a dictionary of pressure, percent and radius arrays and 2-D (pressure x percent)
+    hoop, radial, shear and longitudinal arrays
+    """
+    pressure=np.atleast_1d(np.asarray(pressure, dtype=float))
+    percent=np.linspace(0, 100, 101) if percent is None else np.atleast_1d(np.asarray(percent, dtype=float))
+    a=float(diameter)/2
+    b=a-wall_thickness
+    field={"pressure":pressure,
+           "percent":percent,
+           "radius":b+(wall_thickness*(percent/100)),
+           "hoop":np.multiply.outer(pressure, thick_hoop_stress(1.0, diameter, wall_thickness, percent)),
+           "radial":np.multiply.outer(pressure, thick_radial_stress(1.0, diameter, wall_thickness, percent)),
+           "shear":np.multiply.outer(pressure, thick_shear_stress(1.0, diameter, wall_thickness, percent)),
+           "longitudinal":np.multiply.outer(pressure, np.full(percent.shape, thick_longitudinal_stress(1.0, diameter, wall_thickness)))}
+    return field
+
+def thick_outer_diameter_reduction(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                                   E: np.ndarray, v: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1d
+    reduction in outer diameter due to external pressure
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    b=a-wall_thickness
+    dia=(((-pressure*a)/E)*((((a**2)*(1-(2*v)))+((b**2)*(1+v)))/((a**2)-(b**2))))*2
+    return dia
+
+def thick_inner_diameter_reduction(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                                   E: np.ndarray, v: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1d
+    reduction in inner diameter due to external pressure
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    b=a-wall_thickness
+    dia=(((-pressure*b)/E)*(((a**2)*(2-v))/((a**2)-(b**2))))*2
+    return dia
+
+def thick_length_reduction(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray,
+                           length: np.ndarray, E: np.ndarray, v: np.ndarray)->np.ndarray:
+    """
+    Roarks 7, pp. 683 table 13.5, case 1d
+    reduction in overall length due to external pressure
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    b=a-wall_thickness
+    len=((-pressure*length)/E)*(((a**2)*(1-(2*v)))/((a**2)-(b**2)))
+    return len
+
+def evaluate_vessel(vessel: pv.vessel, pressure: np.ndarray, percent: float=50.0)->vessel_results:
+    """ 
+    evaluates every stress and deflection of a vessel and its governing buckling pressure in one pass
+    uses the thin walled (Roarks 7, table 13.1, case 1c) or thick walled
+    (Roarks 7, table 13.5, case 1c & 1d) formulas depending on vessel.thickness_ratio()
+    percent is the position through the wall for thick walled hoop and radial stress
+    """
+    ratio=vessel.thickness_ratio()
+    p=np.asarray(pressure, dtype=float)
+    arr=vessel_arrays(vessel)
+    geometry=vessel_geometry(vessel)
+    t=arr["wall_thickness"]
+    l=arr["length"]
+    E=arr["E"]
+    v=arr["v"]
+    a=geometry["a"]                     #outer radius (radius for thin walled)
+
+    if ratio["type"]=="Thin Walled":
+        pr_t=(p*a)/t                    #shared p*r/t term
+        hoop=pr_t
+        hoop_max=pr_t
+        long=pr_t/2
+        rad=np.zeros_like(p)
+        dia=(-(pr_t*a)/E)*(1-(v/2))*2
+        dia_inner=dia
+        len=(-(pr_t*l)/E)*(0.5-v)
+    else:
+        b=geometry["b"]                 #inner radius
+        a2=geometry["a_2"]
+        b2=geometry["b_2"]
+        a2_b2=geometry["a_2_b_2"]
+        r2=(b+(t*(percent/100)))**2     #radial distance to stress, squared
+        pa2=(p*a2)/a2_b2                #shared p*a^2/(a^2-b^2) term
+        hoop=(pa2*(b2+r2))/r2
+        hoop_max=-2*pa2
+        long=pa2
+        rad=(-pa2*(r2-b2))/r2
+        dia=(((-p*a)/E)*(((a2*(1-(2*v)))+(b2*(1+v)))/a2_b2))*2
+        dia_inner=(((-p*b)/E)*((a2*(2-v))/a2_b2))*2
+        len=(-(pa2*l)/E)*(1-(2*v))
+
+    p_crit, mode=minimum_buckling_pressure(arr["diameter"], t, l, E, v)
+
+    results=vessel_results(pressure=p,
+                           thickness_ratio=ratio["ratio"],
+                           wall_type=ratio["type"],
+                           length_ratio=vessel.length_ratio(),
+                           hoop_stress=hoop,
+                           hoop_stress_max=hoop_max,
+                           longitudinal_stress=long,
+                           radial_stress=rad,
+                           diameter_reduction=dia,
+                           inner_diameter_reduction=dia_inner,
+                           length_reduction=len,
+                           critical_buckling_pressure=float(p_crit),
+                           buckling_mode=int(mode))
+    return results
+
+def check_designs(pressure: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray, length: np.ndarray,
+                  E: np.ndarray, v: np.ndarray, fy: np.ndarray)->dict(str,np.ndarray):
+    """ 
+    checks any number of designs at once against yield and buckling
+    thin walled designs (R/t>=10) use the thin walled hoop and longitudinal stress,
+    thick walled designs the maximum (ID) hoop stress and the longitudinal stress,
+    stresses are returned as magnitudes
+    returns a dictionary of arrays:
+        thickness_ratio, thick_walled, hoop_stress, longitudinal_stress,
+        critical_buckling_pressure, buckling_mode, yield_ok, buckling_ok, passed
+    """
+    p, D, t, l, E, v, fy=np.broadcast_arrays(*[np.asarray(value, dtype=float) for value in (pressure, diameter, wall_thickness, length, E, v, fy)])
+    thickness_ratio=(D/2)/t
+    thick_walled=thickness_ratio<10
+
+    hoop=np.where(thick_walled, np.abs(thick_hoop_stress_max(p, D, t)), thin_hoop_stress(p, D, t))
+    long=np.where(thick_walled, thick_longitudinal_stress(p, D, t), thin_longitudinal_stress(p, D, t))
+    p_crit, mode=minimum_buckling_pressure(D, t, l, E, v)
+
+    yield_ok=(hoop<=fy)&(long<=fy)
+    buckling_ok=p<p_crit
+    checks={"thickness_ratio":thickness_ratio,
+            "thick_walled":thick_walled,
+            "hoop_stress":hoop,
+            "longitudinal_stress":long,
+            "critical_buckling_pressure":p_crit,
+            "buckling_mode":mode,
+            "yield_ok":yield_ok,
+            "buckling_ok":buckling_ok,
+            "passed":yield_ok&buckling_ok}
+    return checks
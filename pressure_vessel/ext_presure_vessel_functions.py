@@ -13,23 +13,83 @@ assumptions:
 
 from __future__ import annotations
 
+import functools
 import math
 import pressure_vessel.vessel as pv
-from handcalcs.decorator import handcalc
+import pressure_vessel.depth_models as dm
+
+def handcalc(**handcalc_args):
+    """
+    same as handcalcs.decorator.handcalc, but handcalcs is only imported the
+    first time a decorated function is called so numeric only users never load it
+    """
+    def handcalc_decorator(func):
+        rendered={}
+
+        @functools.wraps(func)
+        def decorated(*args, **kwargs):
+            if "func" not in rendered:
+                from handcalcs.decorator import handcalc as handcalcs_handcalc
+
+                rendered["func"]=handcalcs_handcalc(**handcalc_args)(func)
+            return rendered["func"](*args, **kwargs)
+        return decorated
+    return handcalc_decorator
+
+def numeric(func):
+    """
+    returns the plain numeric version of a @handcalc decorated function,
+    calling it returns only the value and never renders any LaTeX
+    """
+    return getattr(func, "__wrapped__", func)
+
+class lazy_latex:
+    """
+    result of a @handcalc decorated function where the value and the LaTeX
+    are each only calculated the first time they are used
+    """
+    def __init__(self, func, *args):
+        self.func=func
+        self.args=args
+        self._value=None
+        self._latex=None
+
+    @property
+    def value(self)->float:
+        """ 
+        calculates (once) and returns the numeric value without rendering LaTeX
+        """
+        if self._value is None:
+            self._value=numeric(self.func)(*self.args)
+        return self._value
+
+    @property
+    def latex(self)->str:
+        """ 
+        renders (once) and returns the handcalcs LaTeX string
+        """
+        if self._latex is None:
+            self._latex, self._value=self.func(*self.args)
+        return self._latex
+
+    def __str__(self)->str:
+        return self.latex
 
 
 def depth_to_pressure(depth: float)->float:
     """ 
     takes a depth in ft and returns a pressure in psi
+    with the depth model in use (see depth_models)
     """
-    pressure=14.7*(depth/33.0)
+    pressure=float(dm.get_depth_model().depth_to_pressure(depth))
     return pressure
 
 def pressure_to_depth(pressure: float)->float:
     """ 
     takes apressure in psi and returns a depth in ft
+    with the depth model in use (see depth_models)
     """
-    depth=33.0*(pressure/14.7)
+    depth=float(dm.get_depth_model().pressure_to_depth(pressure))
     return depth
 
 @handcalc(override='long')
@@ -183,7 +243,7 @@ def thick_shear_stress(vessel: pv.vessel, pressure: float, percent: float)->floa
     b=a-t                                #inner radius
     r=b+(t*(percent/100))                #radial distance to stress
     p=pressure
-    shea = (-p*(a**2))/(((a**2)-(b**2)))  #internal shear stress
+    shear = (-p*(a**2)*(b**2))/((r**2)*((a**2)-(b**2)))  #internal shear stress
     return shear
 
 @handcalc(override='long')
@@ -0,0 +1,196 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Streaming fatigue analysis of dive logs
+a depth (ft) or pressure (psi) time series is read in chunks, converted to hoop and
+longitudinal stress histories with the array functions, rainflow counted and summed into
+Miner's rule damage against the S-N curve of the vessel material, every step is a
+generator working one chunk at a time so memory does not grow with the log
+"""
+
+from __future__ import annotations
+
+import csv
+import itertools
+import numpy as np
+import materials.materials as mt
+import pressure_vessel.vessel as pv
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+#stress histories counted for damage
+history_names=("hoop_stress", "longitudinal_stress")
+
+def read_log_chunks(log_file, column: str="depth", chunk_size: int=2**16)->np.ndarray:
+    """
+    generator of arrays of at most chunk_size values of one column of a csv dive log
+    log_file is a path or an open text file with a header line
+    """
+    if isinstance(log_file, str):
+        with open(log_file, newline="") as opened:
+            yield from read_log_chunks(opened, column, chunk_size)
+        return
+
+    header=[name.strip() for name in next(csv.reader([log_file.readline()]))]
+    index=header.index(column)
+    while True:
+        lines=list(itertools.islice(log_file, chunk_size))
+        if not lines:
+            return
+        values=np.loadtxt(lines, delimiter=",", usecols=index, ndmin=1, dtype=float)
+        yield values
+
+def stress_histories(chunks, vessel: pv.vessel, pressure: bool=False, percent: float=0)->dict(str,np.ndarray):
+    """
+    generator of pressure, hoop_stress and longitudinal_stress arrays for each chunk of
+    depths (ft), or pressures (psi) if pressure is True
+    thin or thick walled formulas are picked from the vessel thickness ratio, thick walled
+    hoop stress is taken at percent of wall thickness (0%=ID, the highest stressed point)
+    """
+    arr=epa.vessel_arrays(vessel)
+    thick_walled=vessel.thickness_ratio()["ratio"]<10
+    for values in chunks:
+        p=values if pressure else epa.depth_to_pressure(values)
+        if thick_walled:
+            hoop=epa.thick_hoop_stress(p, arr["diameter"], arr["wall_thickness"], percent)
+            long=epa.thick_longitudinal_stress(p, arr["diameter"], arr["wall_thickness"])
+        else:
+            hoop=epa.thin_hoop_stress(p, arr["diameter"], arr["wall_thickness"])
+            long=epa.thin_longitudinal_stress(p, arr["diameter"], arr["wall_thickness"])
+        yield {"pressure":p, "hoop_stress":hoop, "longitudinal_stress":long}
+
+class rainflow_counter:
+    """
+    streaming four point rainflow counter
+    update takes the next chunk of a history and returns the cycles it closes, reversals that
+    are still open are kept between chunks, finish returns them as half cycles
+    cycles are returned as (ranges, means, counts) arrays, counts are 1 (full) or 0.5 (half)
+    """
+    def __init__(self):
+        self.stack=[]
+        self.previous=None
+        self.direction=0
+
+    def reversals(self, values: np.ndarray)->np.ndarray:
+        """
+        turning points of the history up to (not including) its last point, the last
+        point and the direction into it are kept until the next chunk shows if it turns
+        """
+        values=np.asarray(values, dtype=float)
+        values=values[~np.isnan(values)]
+        if values.size==0:
+            return values
+        if self.previous is None:
+            self.previous=values[0]
+            turning=[values[:1]]
+        else:
+            turning=[]
+        points=np.concatenate(([self.previous], values))
+        #drop repeated values, flats are not reversals
+        points=points[np.concatenate(([True], np.diff(points)!=0))]
+        if points.size==1:
+            return np.concatenate(turning) if turning else points[:0]
+        moves=np.concatenate(([self.direction], np.sign(np.diff(points))))
+        is_turning=(moves[:-1]!=0)&(moves[:-1]!=moves[1:])
+        turning.append(points[:-1][is_turning])
+        self.previous=points[-1]
+        self.direction=moves[-1]
+        return np.concatenate(turning)
+
+    def count(self, reversals: np.ndarray)->tuple(np.ndarray):
+        """
+        pushes reversals onto the stack and closes every full cycle they complete
+        """
+        stack=self.stack
+        ranges=[]
+        means=[]
+        for reversal in reversals.tolist():
+            stack.append(reversal)
+            while len(stack)>=4:
+                a, b, c, d=stack[-4:]
+                inner=abs(b-c)
+                if inner<=abs(a-b) and inner<=abs(c-d):
+                    ranges.append(inner)
+                    means.append((b+c)/2)
+                    del stack[-3:-1]
+                else:
+                    break
+        return np.array(ranges), np.array(means), np.ones(len(ranges))
+
+    def update(self, values: np.ndarray)->tuple(np.ndarray):
+        """
+        full cycles closed by the next chunk of the history
+        """
+        return self.count(self.reversals(values))
+
+    def finish(self)->tuple(np.ndarray):
+        """
+        full cycles closed by the last point and the remaining reversals as half cycles
+        """
+        if self.direction!=0:
+            ranges, means, counts=self.count(np.array([self.previous]))
+            self.direction=0
+        else:
+            ranges, means, counts=np.empty(0), np.empty(0), np.empty(0)
+        residual=np.asarray(self.stack, dtype=float)
+        half_ranges=np.abs(np.diff(residual))
+        half_means=(residual[:-1]+residual[1:])/2
+        return (np.concatenate((ranges, half_ranges)), np.concatenate((means, half_means)),
+                np.concatenate((counts, np.full(half_ranges.size, 0.5))))
+
+def rainflow(values: np.ndarray)->tuple(np.ndarray):
+    """
+    rainflow count of a whole history held in memory, (ranges, means, counts)
+    """
+    counter=rainflow_counter()
+    cycles=[counter.update(values), counter.finish()]
+    return tuple(np.concatenate(parts) for parts in zip(*cycles))
+
+def fatigue_damage(chunks, vessel: pv.vessel, curve: mt.sn_curve=None, pressure: bool=False,
+                   percent: float=0)->dict(str,dict):
+    """
+    Miner's rule damage of the hoop and longitudinal stress histories of a stream of depth
+    (or pressure) chunks, curve defaults to the S-N curve of the vessel material
+    returns a dictionary keyed by history name of:
+        damage, cycles, max_range, max_stress, repeats_to_failure (1/damage)
+    """
+    curve=curve or vessel.matl.sn_curve
+    if curve is None:
+        raise ValueError(f"material {vessel.matl.matl_label!r} has no S-N curve")
+
+    counters={name:rainflow_counter() for name in history_names}
+    totals={name:{"damage":0.0, "cycles":0.0, "max_range":0.0, "max_stress":0.0} for name in history_names}
+
+    def add(name, cycles):
+        ranges, means, counts=cycles
+        total=totals[name]
+        total["damage"]+=curve.damage(ranges/2, counts)
+        total["cycles"]+=float(np.sum(counts))
+        if ranges.size:
+            total["max_range"]=max(total["max_range"], float(ranges.max()))
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for histories in stress_histories(chunks, vessel, pressure, percent):
+            for name in history_names:
+                stress=histories[name]
+                if stress.size:
+                    totals[name]["max_stress"]=max(totals[name]["max_stress"], float(np.nanmax(np.abs(stress))))
+                add(name, counters[name].update(stress))
+        for name in history_names:
+            add(name, counters[name].finish())
+
+    for total in totals.values():
+        total["repeats_to_failure"]=1/total["damage"] if total["damage"]>0 else np.inf
+    return totals
+
+def dive_log_damage(log_file, vessel: pv.vessel, column: str="depth", curve: mt.sn_curve=None,
+                    chunk_size: int=2**16, percent: float=0)->dict(str,dict):
+    """
+    fatigue_damage of one column of a csv dive log, a "pressure" column is read in psi
+    and any other column as depth in ft
+    """
+    chunks=read_log_chunks(log_file, column, chunk_size)
+    return fatigue_damage(chunks, vessel, curve, column=="pressure", percent)
@@ -0,0 +1,227 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Monte Carlo reliability of a vessel design with manufacturing tolerances and material scatter
+wall thickness, diameter, length, E, v, fy and depth are each a fixed value or a distribution,
+samples are drawn and evaluated with the array functions in fixed size chunks so memory
+does not grow with the sample count, chunks are spread across a process pool and each
+chunk has its own seed spawned from one seed so results do not depend on the worker count
+stress percentiles come from fixed log spaced histograms that are summed across chunks
+"""
+
+from __future__ import annotations
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+import numpy as np
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+import pressure_vessel.combined_stress as cs
+
+distribution_kinds=("fixed", "normal", "lognormal", "uniform")
+
+#random inputs of a design, in sampling order
+input_names=("length", "diameter", "wall_thickness", "E", "v", "fy", "depth")
+
+#quantities with percentiles and the histogram bins (log10 of the value) they are counted in
+histogram_names=("hoop_stress", "longitudinal_stress", "von_mises_stress", "critical_buckling_pressure")
+histogram_range=(-2.0, 9.0)
+histogram_bins=8192
+
+#rounds of redrawing samples outside of the truncation bounds before giving up
+max_redraws=1000
+
+@dataclass(frozen=True)
+class distribution:
+    """
+    distribution of one design input
+    fixed: always mean
+    normal: mean and std, truncated to lower and upper
+    lognormal: mean and std of the value (not of its log), truncated to lower and upper
+    uniform: between lower and upper (a tolerance band)
+    """
+    kind: str="fixed"
+    mean: float=0
+    std: float=0
+    lower: float=-np.inf
+    upper: float=np.inf
+
+    def __post_init__(self):
+        if self.kind not in distribution_kinds:
+            raise ValueError(f"unknown distribution {self.kind!r}, expected one of {distribution_kinds}")
+        if self.kind=="uniform" and not (np.isfinite(self.lower) and np.isfinite(self.upper)):
+            raise ValueError("uniform distributions need finite lower and upper bounds")
+        if self.lower>self.upper:
+            raise ValueError("lower bound is above upper bound")
+
+    def draw(self, rng: np.random.Generator, size: int)->np.ndarray:
+        """
+        size untruncated samples
+        """
+        if self.kind=="fixed":
+            return np.full(size, float(self.mean))
+        if self.kind=="normal":
+            return rng.normal(self.mean, self.std, size)
+        if self.kind=="lognormal":
+            sigma_2=np.log(1+((self.std/self.mean)**2))
+            return rng.lognormal(np.log(self.mean)-(sigma_2/2), np.sqrt(sigma_2), size)
+        return rng.uniform(self.lower, self.upper, size)
+
+    def sample(self, rng: np.random.Generator, size: int)->np.ndarray:
+        """
+        size samples, samples outside of lower and upper are redrawn up to max_redraws times,
+        a ValueError is raised if the bounds are so far in a tail that samples are still outside
+        """
+        values=self.draw(rng, size)
+        if self.kind in ("fixed", "uniform"):
+            return values
+        outside=np.flatnonzero((values<self.lower)|(values>self.upper))
+        for _ in range(max_redraws):
+            if not outside.size:
+                return values
+            values[outside]=self.draw(rng, outside.size)
+            outside=outside[(values[outside]<self.lower)|(values[outside]>self.upper)]
+        if outside.size:
+            raise ValueError(f"could not sample {self.kind} distribution within [{self.lower}, {self.upper}], "
+                             f"the bounds are too far in its tail")
+        return values
+
+def normal(mean: float, std: float, lower: float=-np.inf, upper: float=np.inf)->distribution:
+    return distribution("normal", mean, std, lower, upper)
+
+def lognormal(mean: float, std: float, lower: float=0.0, upper: float=np.inf)->distribution:
+    return distribution("lognormal", mean, std, lower, upper)
+
+def uniform(lower: float, upper: float)->distribution:
+    return distribution("uniform", (lower+upper)/2, 0, lower, upper)
+
+def tolerance(nominal: float, minus: float, plus: float=None)->distribution:
+    """
+    uniform distribution over a tolerance band nominal -minus/+plus (plus defaults to minus)
+    """
+    plus=minus if plus is None else plus
+    return uniform(nominal-minus, nominal+plus)
+
+def as_distribution(value)->distribution:
+    """
+    a distribution, fixed values are wrapped in a "fixed" distribution
+    """
+    if isinstance(value, distribution):
+        return value
+    return distribution("fixed", float(value))
+
+def histogram_counts(values: np.ndarray)->np.ndarray:
+    """
+    counts of values in the fixed log spaced bins, values outside of the range are
+    counted in the first or last bin and NaN or non positive values are not counted
+    """
+    values=values[np.isfinite(values)&(values>0)]
+    low, high=histogram_range
+    index=((np.log10(values)-low)*(histogram_bins/(high-low))).astype(np.int64)
+    counts=np.bincount(np.clip(index, 0, histogram_bins-1), minlength=histogram_bins)
+    return counts
+
+def histogram_percentiles(counts: np.ndarray, percentiles)->np.ndarray:
+    """
+    percentiles of the values counted in counts, interpolated (in log space) within a bin
+    """
+    low, high=histogram_range
+    cumulative=np.cumsum(counts)
+    total=cumulative[-1] if len(cumulative) else 0
+    if total==0:
+        return np.full(len(percentiles), np.nan)
+    target=(np.asarray(percentiles, dtype=float)/100)*total
+    index=np.minimum(np.searchsorted(cumulative, target, side="left"), histogram_bins-1)
+    below=np.where(index>0, cumulative[index-1], 0)
+    fraction=np.clip((target-below)/np.maximum(counts[index], 1), 0, 1)
+    log_values=low+((index+fraction)*((high-low)/histogram_bins))
+    return 10**log_values
+
+def evaluate_chunk(inputs: dict, size: int, seed: np.random.SeedSequence)->dict:
+    """
+    draws size samples of every input and evaluates them, returns the failure counts
+    and the histogram counts of the chunk
+    """
+    rng=np.random.default_rng(seed)
+    samples={name:inputs[name].sample(rng, size) for name in input_names}
+    pressure=epa.depth_to_pressure(samples["depth"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        checks=epa.check_designs(pressure, samples["diameter"], samples["wall_thickness"], samples["length"],
+                                 samples["E"], samples["v"], samples["fy"])
+        combined=cs.combined_stress(pressure, samples["diameter"], samples["wall_thickness"], samples["fy"])
+
+    yield_failed=~checks["yield_ok"]
+    buckling_failed=~checks["buckling_ok"]
+    counts={"samples":size,
+            "yield_failures":int(np.count_nonzero(yield_failed)),
+            "buckling_failures":int(np.count_nonzero(buckling_failed)),
+            "failures":int(np.count_nonzero(yield_failed|buckling_failed)),
+            "von_mises_failures":int(np.count_nonzero(~(combined["yield_utilization"]<=1))),
+            "histograms":{"hoop_stress":histogram_counts(checks["hoop_stress"]),
+                          "longitudinal_stress":histogram_counts(checks["longitudinal_stress"]),
+                          "von_mises_stress":histogram_counts(combined["von_mises_stress"]),
+                          "critical_buckling_pressure":histogram_counts(checks["critical_buckling_pressure"])}}
+    return counts
+
+def chunk_counts(inputs: dict, samples: int, chunk_size: int, seed, workers: int)->dict:
+    """
+    generator of the evaluate_chunk counts of every chunk, at most two chunks per
+    worker are in flight, workers=1 runs in process
+    """
+    sizes=[min(chunk_size, samples-start) for start in range(0, samples, chunk_size)]
+    seeds=np.random.SeedSequence(seed).spawn(len(sizes))
+    if workers==1:
+        for size, chunk_seed in zip(sizes, seeds):
+            yield evaluate_chunk(inputs, size, chunk_seed)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending=deque()
+        for size, chunk_seed in zip(sizes, seeds):
+            pending.append(pool.submit(evaluate_chunk, inputs, size, chunk_seed))
+            if len(pending)>=2*workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+def monte_carlo(length, diameter, wall_thickness, E, v, fy, depth, samples: int=10**6,
+                chunk_size: int=2**18, seed: int=None, workers: int=None,
+                percentiles=(1, 5, 50, 95, 99, 99.9))->dict:
+    """
+    Monte Carlo reliability of one design, each input is a fixed value or a distribution
+    yield is checked on the hoop and longitudinal stress (thin or thick walled per sample)
+    and on the von Mises stress, buckling on the minimum mode buckling pressure
+    each chunk draws from its own stream spawned from seed, so the same seed and chunk_size
+    give the same results for any worker count (a different chunk_size gives different samples)
+    returns a dictionary of:
+        samples, yield_failures, buckling_failures, failures, von_mises_failures,
+        probability_of_yield, probability_of_buckling, probability_of_failure,
+        probability_of_von_mises_yield, percentiles and a dictionary of percentile arrays
+        for hoop_stress, longitudinal_stress, von_mises_stress and critical_buckling_pressure
+    """
+    inputs={name:as_distribution(value) for name, value in zip(input_names, (length, diameter, wall_thickness, E, v, fy, depth))}
+    workers=workers or os.cpu_count() or 1
+
+    totals={"samples":0, "yield_failures":0, "buckling_failures":0, "failures":0, "von_mises_failures":0}
+    histograms={name:np.zeros(histogram_bins, dtype=np.int64) for name in histogram_names}
+    for counts in chunk_counts(inputs, samples, chunk_size, seed, workers):
+        for name in totals:
+            totals[name]+=counts[name]
+        for name in histogram_names:
+            histograms[name]+=counts["histograms"][name]
+
+    n=max(totals["samples"], 1)
+    results=dict(totals)
+    results.update({"probability_of_yield":totals["yield_failures"]/n,
+                    "probability_of_buckling":totals["buckling_failures"]/n,
+                    "probability_of_failure":totals["failures"]/n,
+                    "probability_of_von_mises_yield":totals["von_mises_failures"]/n,
+                    "percentiles":np.asarray(percentiles, dtype=float)})
+    for name in histogram_names:
+        results[name]=histogram_percentiles(histograms[name], percentiles)
+    return results
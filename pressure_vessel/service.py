@@ -0,0 +1,260 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Local JSON over HTTP calculation service (asyncio, standard library only)
+endpoints:
+    GET  /materials                 every material in the catalog
+    GET  /materials/<label>         one material
+    POST /evaluate                  one design (see batch.design_fields), concurrent requests
+                                    are coalesced into vectorized micro-batches
+    POST /batch                     {"designs": [design, ...]} or a list of designs
+    GET  /calculations              names of the ext_presure_vessel_functions calculations
+    POST /calculations/<name>       {"matl_label", "length", "diameter", "wall_thickness",
+                                    "pressure" or "depth", "percent", "mode", "latex"}
+the material catalog is loaded once and stays in memory, request bodies over max_body bytes
+are refused (413)
+usage:
+    python -m pressure_vessel.service --port 8000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import inspect
+import json
+import sys
+from dataclasses import asdict
+from urllib.parse import unquote
+import materials.materials as mt
+import materials.material_columns as mc
+import pressure_vessel.vessel as pv
+import pressure_vessel.ext_presure_vessel_functions as epv
+import pressure_vessel.batch as bt
+
+#ext_presure_vessel_functions calculations, every function of a vessel and a pressure
+calculations={name:func for name, func in inspect.getmembers(epv, inspect.isfunction)
+              if list(inspect.signature(func).parameters)[:2]==["vessel", "pressure"]}
+
+status_text={200:"OK", 400:"Bad Request", 404:"Not Found", 405:"Method Not Allowed", 413:"Content Too Large",
+             500:"Internal Server Error"}
+
+class service_error(Exception):
+    """
+    error returned to the client with an HTTP status
+    """
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status=status
+
+class calculation_service:
+    """
+    request handling of the calculation service
+    single designs are queued and evaluated together, a micro-batch is closed when it has
+    max_batch designs or max_delay seconds after its first design arrived
+    every evaluation uses the catalog loaded here, request bodies are at most max_body bytes
+    """
+    def __init__(self, matl_file: str="material_table.csv", max_batch: int=1024, max_delay: float=0.002,
+                 chunk_size: int=10000, max_body: int=16*2**20):
+        self.matl_file=matl_file
+        self.catalog=mt.load_matl_catalog(matl_file)
+        self.max_batch=max_batch
+        self.max_delay=max_delay
+        self.chunk_size=chunk_size
+        self.max_body=max_body
+        self.queue=None
+        self.coalescer=None
+        self.batches=0
+
+    async def evaluate(self, design: dict)->dict:
+        """
+        result of one design, evaluated in the next micro-batch
+        """
+        if self.coalescer is None:
+            self.queue=asyncio.Queue()
+            self.coalescer=asyncio.create_task(self.coalesce())
+        future=asyncio.get_running_loop().create_future()
+        await self.queue.put((bt.normalize_design(design), future))
+        return await future
+
+    async def coalesce(self):
+        """
+        collects queued designs into micro-batches and evaluates each batch in a worker thread
+        """
+        loop=asyncio.get_running_loop()
+        while True:
+            pending=[await self.queue.get()]
+            deadline=loop.time()+self.max_delay
+            while len(pending)<self.max_batch:
+                timeout=deadline-loop.time()
+                if timeout<=0:
+                    break
+                try:
+                    pending.append(await asyncio.wait_for(self.queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+
+            self.batches+=1
+            try:
+                results=await loop.run_in_executor(None, bt.evaluate_chunk, [design for design, future in pending],
+                                                   self.matl_file, None, self.catalog)
+            except Exception as error:
+                for design, future in pending:
+                    if not future.done():
+                        future.set_exception(error)
+                continue
+            for (design, future), result in zip(pending, results):
+                if not future.done():
+                    future.set_result(result)
+
+    async def evaluate_batch(self, designs: list(dict))->list(dict):
+        """
+        results of a list of designs in input order, evaluated chunk by chunk in a worker thread
+        """
+        loop=asyncio.get_running_loop()
+        results=[]
+        for chunk in bt.chunked((bt.normalize_design(design) for design in designs), self.chunk_size):
+            results.extend(await loop.run_in_executor(None, bt.evaluate_chunk, chunk, self.matl_file, None, self.catalog))
+        return results
+
+    def material(self, matl_label: str)->mt.material:
+        matl=self.catalog.get(matl_label)
+        if matl is None:
+            raise service_error(404, f"unknown material {matl_label!r}")
+        return matl
+
+    def calculate(self, name: str, request: dict)->dict:
+        """
+        one ext_presure_vessel_functions calculation of a vessel, with its LaTeX if requested
+        blocking, handle runs it in a worker thread
+        """
+        func=calculations.get(name)
+        if func is None:
+            raise service_error(404, f"unknown calculation {name!r}")
+        design=bt.normalize_design(request)
+        vessel=pv.vessel(matl_label=str(design["matl_label"]), matl=self.material(str(design["matl_label"])),
+                         length=mc.to_float(design["length"]), diameter=mc.to_float(design["diameter"]),
+                         wall_thickness=mc.to_float(design["wall_thickness"]))
+        if "pressure" in request:
+            pressure=mc.to_float(request["pressure"])
+        else:
+            pressure=epv.depth_to_pressure(mc.to_float(design["depth"]))
+        args=[vessel, pressure]+[mc.to_float(request.get(parameter, 50 if parameter=="percent" else 2))
+                                 for parameter in list(inspect.signature(func).parameters)[2:]]
+        if request.get("latex") and hasattr(func, "__wrapped__"):
+            latex, value=func(*args)
+            return {"name":name, "value":float(value), "latex":latex}
+        return {"name":name, "value":float(epv.numeric(func)(*args))}
+
+    async def handle(self, method: str, path: str, body: bytes)->dict:
+        """
+        response payload of one request
+        """
+        parts=[part for part in path.split("?")[0].split("/") if part]
+        request=json.loads(body) if body else {}
+        if parts==["materials"] and method=="GET":
+            return {"materials":[asdict(matl) for matl in self.catalog.materials]}
+        if len(parts)==2 and parts[0]=="materials" and method=="GET":
+            return asdict(self.material(unquote(parts[1])))
+        if parts==["evaluate"] and method=="POST":
+            return await self.evaluate(request)
+        if parts==["batch"] and method=="POST":
+            designs=request.get("designs", []) if isinstance(request, dict) else request
+            return {"results":await self.evaluate_batch(designs)}
+        if parts==["calculations"] and method=="GET":
+            return {"calculations":sorted(calculations)}
+        if len(parts)==2 and parts[0]=="calculations" and method=="POST":
+            return await asyncio.get_running_loop().run_in_executor(None, self.calculate, parts[1], request)
+        if parts and parts[0] in ("materials", "evaluate", "batch", "calculations"):
+            raise service_error(405, f"{method} is not allowed on {path}")
+        raise service_error(404, f"no endpoint {path}")
+
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """
+        serves HTTP/1.1 requests on one connection until the client closes it
+        """
+        try:
+            while True:
+                request_line=await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, version=request_line.decode("latin-1").split()
+                headers={}
+                while True:
+                    line=await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value=line.decode("latin-1").partition(":")
+                    headers[key.strip().lower()]=value.strip()
+                keep_alive=headers.get("connection", "").lower()!="close" and version=="HTTP/1.1"
+                length=int(headers.get("content-length", 0))
+                #the body of a refused request is not read so the connection can not be reused
+                if length<0:
+                    status, payload, keep_alive=400, {"error":f"invalid content length {length}"}, False
+                elif length>self.max_body:
+                    status, payload=413, {"error":f"request body of {length} bytes is over the {self.max_body} byte limit"}
+                    keep_alive=False
+                else:
+                    body=await reader.readexactly(length)
+                    try:
+                        status, payload=200, await self.handle(method.upper(), path, body)
+                    except service_error as error:
+                        status, payload=error.status, {"error":str(error)}
+                    except (ValueError, TypeError, AttributeError) as error:
+                        status, payload=400, {"error":str(error)}
+                    except Exception as error:
+                        status, payload=500, {"error":str(error)}
+
+                content=json.dumps(bt.json_safe(payload)).encode()
+                writer.write((f"HTTP/1.1 {status} {status_text[status]}\r\n"
+                              f"Content-Type: application/json\r\nContent-Length: {len(content)}\r\n"
+                              f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n").encode()+content)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self, host: str="127.0.0.1", port: int=8000)->asyncio.base_events.Server:
+        """
+        starts listening, returns the asyncio server
+        """
+        return await asyncio.start_server(self.handle_connection, host, port)
+
+    async def close(self):
+        if self.coalescer is not None:
+            self.coalescer.cancel()
+            try:
+                await self.coalescer
+            except asyncio.CancelledError:
+                pass
+            self.coalescer=None
+
+async def serve(matl_file: str, host: str, port: int, max_body: int):
+    service=calculation_service(matl_file, max_body=max_body)
+    server=await service.start(host, port)
+    print(f"serving on http://{host}:{port}", file=sys.stderr)
+    async with server:
+        await server.serve_forever()
+
+def main(argv: list(str)=None)->int:
+    parser=argparse.ArgumentParser(description="Local pressure vessel calculation service")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on (default: localhost)")
+    parser.add_argument("--port", type=int, default=8000, help="port to listen on")
+    parser.add_argument("-m", "--materials", default="material_table.csv", help="material table csv file")
+    parser.add_argument("--max-body", type=int, default=16*2**20, help="largest request body in bytes (default: 16 MiB)")
+    args=parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.materials, args.host, args.port, args.max_body))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__=="__main__":
+    sys.exit(main())
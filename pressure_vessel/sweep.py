@@ -0,0 +1,187 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Parametric design space sweep over every combination of
+length x diameter x wall thickness x material x depth
+the grid is evaluated in fixed size chunks so memory does not grow with the grid,
+results are written as columns to an npz or Parquet file
+"""
+
+from __future__ import annotations
+
+import os
+import shutil
+import tempfile
+import zipfile
+import numpy as np
+import materials.materials as mt
+import materials.material_columns as mc
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+#result columns and their storage type, "float" columns follow the float32 option
+sweep_columns={"length":"float", "diameter":"float", "wall_thickness":"float", "material_index":np.int32,
+               "depth":"float", "pressure":"float", "thickness_ratio":"float",
+               "thin_hoop_stress":"float", "thin_longitudinal_stress":"float",
+               "thick_hoop_stress_max":"float", "thick_longitudinal_stress":"float",
+               "critical_buckling_pressure":"float", "buckling_mode":np.int16,
+               "yield_ok":np.bool_, "buckling_ok":np.bool_, "passed":np.bool_}
+
+def sweep_axes(lengths, diameters, wall_thicknesses, materials, depths)->dict:
+    """
+    grid axes as arrays, materials may be a list of "material" class objects or material_columns
+    """
+    if not isinstance(materials, mc.material_columns):
+        materials=mc.generate_matl_columns(list(materials))
+    axes={"length":np.atleast_1d(np.asarray(lengths, dtype=float)),
+          "diameter":np.atleast_1d(np.asarray(diameters, dtype=float)),
+          "wall_thickness":np.atleast_1d(np.asarray(wall_thicknesses, dtype=float)),
+          "material":materials,
+          "depth":np.atleast_1d(np.asarray(depths, dtype=float))}
+    return axes
+
+def sweep_shape(axes: dict)->tuple(int):
+    """
+    shape of the grid (length, diameter, wall thickness, material, depth)
+    """
+    return (len(axes["length"]), len(axes["diameter"]), len(axes["wall_thickness"]), len(axes["material"]), len(axes["depth"]))
+
+def column_dtype(name: str, float32: bool=False):
+    """
+    storage type of a result column
+    """
+    dtype=sweep_columns[name]
+    if dtype=="float":
+        return np.float32 if float32 else np.float64
+    return dtype
+
+def evaluate_chunk(axes: dict, start: int, stop: int)->dict(str,np.ndarray):
+    """
+    evaluates grid points start to stop (flat index in C order) of the sweep
+    buckling does not depend on depth so it is only evaluated once per geometry and material
+    """
+    shape=sweep_shape(axes)
+    matls=axes["material"]
+    i_l, i_d, i_t, i_m, i_z=np.unravel_index(np.arange(start, stop), shape)
+    L=axes["length"][i_l]
+    D=axes["diameter"][i_d]
+    t=axes["wall_thickness"][i_t]
+    depth=axes["depth"][i_z]
+    E=matls.E[i_m]
+    v=matls.v[i_m]
+    fy=matls.fy[i_m]
+    p=epa.depth_to_pressure(depth)
+
+    thin_hoop=epa.thin_hoop_stress(p, D, t)
+    thin_long=epa.thin_longitudinal_stress(p, D, t)
+    thick_hoop=np.abs(epa.thick_hoop_stress_max(p, D, t))
+    thick_long=epa.thick_longitudinal_stress(p, D, t)
+    thickness_ratio=(D/2)/t
+    thick_walled=thickness_ratio<10
+
+    #depth is the last (fastest) grid axis, so runs of points share one geometry
+    geometry, first, inverse=np.unique(np.arange(start, stop)//shape[-1], return_index=True, return_inverse=True)
+    p_crit, mode=epa.minimum_buckling_pressure(D[first], t[first], L[first], E[first], v[first])
+    p_crit=p_crit[inverse]
+    mode=mode[inverse]
+
+    hoop=np.where(thick_walled, thick_hoop, thin_hoop)
+    long=np.where(thick_walled, thick_long, thin_long)
+    yield_ok=(hoop<=fy)&(long<=fy)
+    buckling_ok=p<p_crit
+    results={"length":L, "diameter":D, "wall_thickness":t, "material_index":i_m, "depth":depth,
+             "pressure":p, "thickness_ratio":thickness_ratio,
+             "thin_hoop_stress":thin_hoop, "thin_longitudinal_stress":thin_long,
+             "thick_hoop_stress_max":thick_hoop, "thick_longitudinal_stress":thick_long,
+             "critical_buckling_pressure":p_crit, "buckling_mode":mode,
+             "yield_ok":yield_ok, "buckling_ok":buckling_ok, "passed":yield_ok&buckling_ok}
+    return results
+
+def run_sweep(lengths, diameters, wall_thicknesses, materials, depths, chunk_size: int=2**18,
+              float32: bool=False)->tuple(int,dict):
+    """
+    generator of (start index, results) for each chunk of the sweep grid
+    results are dictionaries of the sweep_columns arrays in their storage types
+    """
+    axes=sweep_axes(lengths, diameters, wall_thicknesses, materials, depths)
+    size=int(np.prod(sweep_shape(axes)))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        for start in range(0, size, chunk_size):
+            stop=min(start+chunk_size, size)
+            results=evaluate_chunk(axes, start, stop)
+            yield start, {name:np.asarray(values).astype(column_dtype(name, float32), copy=False) for name, values in results.items()}
+
+def write_sweep_npz(path: str, lengths, diameters, wall_thicknesses, materials, depths,
+                    chunk_size: int=2**18, float32: bool=False):
+    """
+    writes the sweep to an npz file, one array per result column plus the grid axes
+    (length_axis, diameter_axis, wall_thickness_axis, material_labels, depth_axis)
+    each column is filled chunk by chunk into a memory mapped .npy file which is
+    then copied into the npz (zip) archive, so the grid never has to fit in memory
+    """
+    axes=sweep_axes(lengths, diameters, wall_thicknesses, materials, depths)
+    size=int(np.prod(sweep_shape(axes)))
+    temp_dir=tempfile.mkdtemp(dir=os.path.dirname(os.path.abspath(path)))
+    try:
+        columns={name:np.lib.format.open_memmap(os.path.join(temp_dir, f"{name}.npy"), mode="w+",
+                                                dtype=column_dtype(name, float32), shape=(size,))
+                 for name in sweep_columns}
+        for start, results in run_sweep(axes["length"], axes["diameter"], axes["wall_thickness"], axes["material"],
+                                        axes["depth"], chunk_size, float32):
+            for name, values in results.items():
+                columns[name][start:start+len(values)]=values
+        for column in columns.values():
+            column.flush()
+        del columns
+
+        grid={"length_axis":axes["length"], "diameter_axis":axes["diameter"],
+              "wall_thickness_axis":axes["wall_thickness"], "depth_axis":axes["depth"],
+              "material_labels":np.asarray(axes["material"].labels, dtype=str)}
+        with zipfile.ZipFile(path, "w", compression=zipfile.ZIP_STORED, allowZip64=True) as archive:
+            for name in sweep_columns:
+                archive.write(os.path.join(temp_dir, f"{name}.npy"), f"{name}.npy")
+            for name, values in grid.items():
+                with archive.open(f"{name}.npy", "w", force_zip64=True) as npy_file:
+                    np.lib.format.write_array(npy_file, values, allow_pickle=False)
+    finally:
+        shutil.rmtree(temp_dir, ignore_errors=True)
+
+def write_sweep_parquet(path: str, lengths, diameters, wall_thicknesses, materials, depths,
+                        chunk_size: int=2**18, float32: bool=False):
+    """
+    writes the sweep to a Parquet file, one row group per chunk, requires pyarrow
+    the material is stored as a dictionary encoded "matl_label" column
+    """
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    axes=sweep_axes(lengths, diameters, wall_thicknesses, materials, depths)
+    labels=pa.array(np.asarray(axes["material"].labels, dtype=str))
+    schema=pa.schema([(name, pa.from_numpy_dtype(column_dtype(name, float32))) for name in sweep_columns]
+                     +[("matl_label", pa.dictionary(pa.from_numpy_dtype(column_dtype("material_index")), pa.string()))])
+    #the writer is opened with the schema so an empty grid still writes an empty table
+    with pq.ParquetWriter(path, schema) as writer:
+        for start, results in run_sweep(axes["length"], axes["diameter"], axes["wall_thickness"], axes["material"],
+                                        axes["depth"], chunk_size, float32):
+            table=pa.table({name:pa.array(values) for name, values in results.items()})
+            table=table.append_column("matl_label", pa.DictionaryArray.from_arrays(pa.array(results["material_index"]), labels))
+            writer.write_table(table.cast(schema))
+
+def write_sweep(path: str, lengths, diameters, wall_thicknesses, materials, depths,
+                chunk_size: int=2**18, float32: bool=False):
+    """
+    writes the sweep to an npz or Parquet (.parquet) file depending on the file extension
+    """
+    if path.endswith(".parquet"):
+        write_sweep_parquet(path, lengths, diameters, wall_thicknesses, materials, depths, chunk_size, float32)
+    else:
+        write_sweep_npz(path, lengths, diameters, wall_thicknesses, materials, depths, chunk_size, float32)
+
+def sweep_materials(matl_file: str="material_table.csv")->mc.material_columns:
+    """
+    every material of a material table csv file (see import_matl_table) as material_columns
+    """
+    return mc.generate_matl_columns(mt.import_matl_table(matl_file))
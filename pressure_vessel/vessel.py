@@ -14,8 +14,24 @@ assumptions:
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import cached_property
+import numpy as np
 import materials.materials as mt
+import materials.material_columns as mc
+
+def geometry_coefficients(length: np.ndarray, diameter: np.ndarray, wall_thickness: np.ndarray)->dict:
+    """ 
+    geometry coefficients shared by the formulas, for one vessel or arrays of vessels:
+        r=a (outer radius), b (inner radius), a_2=a^2, b_2=b^2, a_2_b_2=a^2-b^2,
+        r_t (R/t) and l_r (L/R), inf where the wall thickness or radius is 0
+    """
+    a=np.asarray(diameter, dtype=float)/2
+    b=a-wall_thickness
+    with np.errstate(divide="ignore", invalid="ignore"):
+        coefficients={"r":a, "a":a, "b":b, "a_2":a**2, "b_2":b**2, "a_2_b_2":(a**2)-(b**2),
+                      "r_t":np.divide(a, wall_thickness), "l_r":np.divide(length, a)}
+    return coefficients
 
 @dataclass
 class vessel(mt.material):
@@ -23,7 +39,7 @@ class vessel(mt.material):
     generic cylindrical pressure vessel class
     """
     label: str=""
-    matl: mt.material=mt.material()
+    matl: mt.material=field(default_factory=mt.material)
     length: float=0
     diameter: float=0
     wall_thickness: float=0
@@ -52,4 +68,145 @@ class vessel(mt.material):
         ratio of cylinder length to radius (L/R)
         """
         ratio=self.length/(self.diameter/2)
-        return ratio
\ No newline at end of file
+        return ratio
+
+    def compact(self)->compact_vessel:
+        """ 
+        compact_vessel with this vessel's geometry and material
+        """
+        return compact_vessel(matl=self.matl, length=self.length, diameter=self.diameter,
+                              wall_thickness=self.wall_thickness, label=self.label)
+
+@dataclass(frozen=True, slots=True)
+class compact_vessel:
+    """ 
+    immutable, hashable cylindrical pressure vessel with only its geometry and a material
+    reference, the geometry coefficients used by the formulas (see geometry_coefficients)
+    are computed once and read by ext_pressure_vessel_arrays.vessel_arrays
+    the material is not compared or hashed, its label (matl_label) stands in for it
+    has the same thickness_ratio/length_ratio methods and fields as "vessel" so it
+    can be used anywhere a vessel is
+    """
+    matl: mt.material=field(compare=False, repr=False)
+    length: float=0
+    diameter: float=0
+    wall_thickness: float=0
+    label: str=""
+    matl_label: str=field(init=False, default="")
+    r: float=field(init=False, default=0, compare=False)
+    a: float=field(init=False, default=0, compare=False)
+    b: float=field(init=False, default=0, compare=False)
+    a_2: float=field(init=False, default=0, compare=False)
+    b_2: float=field(init=False, default=0, compare=False)
+    a_2_b_2: float=field(init=False, default=0, compare=False)
+    r_t: float=field(init=False, default=0, compare=False)
+    l_r: float=field(init=False, default=0, compare=False)
+
+    def __post_init__(self):
+        object.__setattr__(self, "matl_label", str(self.matl.matl_label))
+        for name, value in geometry_coefficients(self.length, self.diameter, self.wall_thickness).items():
+            object.__setattr__(self, name, float(value))
+
+    def thickness_ratio(self)->dict(float,str):
+        """ 
+        ratio of radius to thickness (R/t), see vessel.thickness_ratio
+        """
+        return {"ratio":self.r_t, "type":"Thick Walled" if self.r_t<10 else "Thin Walled"}
+
+    def length_ratio(self)->float:
+        """ 
+        ratio of cylinder length to radius (L/R)
+        """
+        return self.l_r
+
+@dataclass
+class vessel_batch:
+    """ 
+    array backed (struct of arrays) batch of vessels, geometry is stored as float arrays
+    and each vessel refers to its material by an index into matls, so a batch of millions
+    of designs costs 28 bytes per design, the geometry coefficients of compact_vessel are
+    computed from the arrays once, when first used (the arrays must not be changed after)
+    """
+    matls: list(mt.material)
+    material_index: np.ndarray
+    length: np.ndarray
+    diameter: np.ndarray
+    wall_thickness: np.ndarray
+
+    def __post_init__(self):
+        self.material_index=np.asarray(self.material_index, dtype=np.int32)
+        self.length, self.diameter, self.wall_thickness=np.broadcast_arrays(
+            *[np.asarray(value, dtype=float) for value in (self.length, self.diameter, self.wall_thickness)],
+            self.material_index)[:3]
+
+    @classmethod
+    def from_vessels(cls, vessels)->vessel_batch:
+        """ 
+        batch of a sequence of "vessel" or compact_vessel class objects, vessels sharing a
+        material object (or equal materials) share one entry of matls
+        """
+        vessels=list(vessels)
+        matls=[]
+        indexes={}
+        material_index=np.empty(len(vessels), dtype=np.int32)
+        for row, vessel in enumerate(vessels):
+            key=id(vessel.matl)
+            if key not in indexes:
+                matches=[index for index, matl in enumerate(matls) if matl==vessel.matl]
+                indexes[key]=matches[0] if matches else len(matls)
+                if not matches:
+                    matls.append(vessel.matl)
+            material_index[row]=indexes[key]
+        return cls(matls, material_index,
+                   np.array([mc.to_float(vessel.length) for vessel in vessels]),
+                   np.array([mc.to_float(vessel.diameter) for vessel in vessels]),
+                   np.array([mc.to_float(vessel.wall_thickness) for vessel in vessels]))
+
+    def __len__(self)->int:
+        return len(self.material_index)
+
+    def __getitem__(self, index: int)->compact_vessel:
+        return compact_vessel(matl=self.matls[self.material_index[index]], length=float(self.length[index]),
+                              diameter=float(self.diameter[index]), wall_thickness=float(self.wall_thickness[index]))
+
+    @cached_property
+    def columns(self)->mc.material_columns:
+        """ 
+        material_columns of matls, built once
+        """
+        return mc.generate_matl_columns(self.matls)
+
+    def material_property(self, name: str)->np.ndarray:
+        """ 
+        a material property (E, v, fy, fu, ...) of every vessel
+        """
+        return getattr(self.columns, name)[self.material_index]
+
+    @cached_property
+    def geometry(self)->dict(str,np.ndarray):
+        """ 
+        geometry_coefficients of every vessel, computed once
+        """
+        return geometry_coefficients(self.length, self.diameter, self.wall_thickness)
+
+    @property
+    def a(self)->np.ndarray:
+        return self.geometry["a"]
+
+    @property
+    def b(self)->np.ndarray:
+        return self.geometry["b"]
+
+    @property
+    def r_t(self)->np.ndarray:
+        return self.geometry["r_t"]
+
+    @property
+    def l_r(self)->np.ndarray:
+        return self.geometry["l_r"]
+
+    def thick_walled(self)->np.ndarray:
+        """ 
+        True for vessels with R/t<10
+        """
+        return self.r_t<10
\ No newline at end of file
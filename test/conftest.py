@@ -0,0 +1,29 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+fixtures shared by the test functions
+"""
+
+import pytest
+import materials.materials as mt
+
+#properties of the shared test materials by label, test_7075 has no Poisson's ratio
+shared_materials={"test_6061":{"matl_type":"test_Aluminum", "matl_cat":"test_metal", "density":0.098,
+                               "fy":35000, "fu":42000, "E":10000000, "G":3800000, "v":0.33},
+                  "test_7075":{"matl_type":"test_Aluminum", "matl_cat":"test_metal", "density":0.1,
+                               "fy":73000, "fu":"", "E":10400000, "G":3900000, "v":""},
+                  "test_4140":{"matl_type":"test_Steel", "matl_cat":"test_metal", "density":0.284,
+                               "fy":120000, "fu":140000, "E":28900000, "G":11000000, "v":0.3}}
+
+@pytest.fixture
+def make_materials():
+    """
+    factory of a list of "material" class objects with the shared test properties, by label
+    """
+    def make(*labels: str)->list:
+        return [mt.material(matl_label=label, **shared_materials[label]) for label in labels]
+    return make
@@ -0,0 +1,83 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the batch design evaluation command line
+"""
+
+import csv
+import io
+import json
+import numpy as np
+import pytest
+import pressure_vessel.batch as bt
+import pressure_vessel.depth_models as dm
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+designs_csv="""label,material,L,D,t,depth
+housing_1,6061-t6,10,5,0.1,1000
+housing_2,4140 HT,10,5,0.5,20000
+housing_3,unobtainium,10,5,0.1,1000
+"""
+
+def test_read_designs():
+    designs=list(bt.read_designs(io.StringIO(designs_csv), "csv"))
+    assert designs[0]=={"label":"housing_1", "matl_label":"6061-t6", "length":"10", "diameter":"5",
+                        "wall_thickness":"0.1", "depth":"1000"}
+    jsonl=json.dumps({"label":"housing_1", "matl_label":"6061-t6", "length":10, "diameter":5,
+                      "wall_thickness":0.1, "depth":1000})+"\n"
+    assert list(bt.read_designs(io.StringIO(jsonl), "jsonl"))[0]["length"]==10
+
+def test_chunked():
+    assert [len(chunk) for chunk in bt.chunked(range(7), 3)]==[3, 3, 1]
+
+def test_evaluate_chunk():
+    designs=list(bt.read_designs(io.StringIO(designs_csv), "csv"))
+    results=bt.evaluate_chunk(designs, "material_table.csv")
+    assert results[0]["wall_type"]=="Thin Walled"
+    assert np.isclose(results[0]["hoop_stress"], epa.thin_hoop_stress(epa.depth_to_pressure(1000), 5, 0.1))
+    assert results[0]["passed"]
+    assert results[1]["wall_type"]=="Thick Walled"
+    assert np.isclose(results[1]["hoop_stress"], abs(epa.thick_hoop_stress_max(epa.depth_to_pressure(20000), 5, 0.5)))
+    assert not results[2]["passed"]
+    assert "unknown material" in results[2]["error"]
+    assert results[2]["wall_type"]==""
+
+def test_evaluate_chunk_missing_property():
+    #7075-t6 has no Poisson's ratio in the material table, buckling can not be checked
+    design={"label":"housing_4", "matl_label":"7075-t6", "length":"10", "diameter":"5", "wall_thickness":"0.1", "depth":"1000"}
+    result=bt.evaluate_chunk([design], "material_table.csv")[0]
+    assert result["error"]=="missing or invalid material property v"
+    assert result["yield_ok"] and not result["buckling_ok"] and not result["passed"]
+    assert np.isnan(result["critical_buckling_pressure"])
+
+def test_evaluate_chunk_depth_model():
+    designs=list(bt.read_designs(io.StringIO(designs_csv), "csv"))
+    result=bt.evaluate_chunk(designs, "material_table.csv", "seawater")[0]
+    assert np.isclose(result["pressure"], dm.named_depth_model("seawater").depth_to_pressure(1000))
+
+def test_evaluate_designs_pool():
+    designs=list(bt.read_designs(io.StringIO(designs_csv), "csv"))*5
+    serial=list(bt.evaluate_designs(iter(designs), "material_table.csv", chunk_size=2, workers=1))
+    pooled=list(bt.evaluate_designs(iter(designs), "material_table.csv", chunk_size=2, workers=2))
+    assert [result["label"] for result in pooled]==[design["label"] for design in designs]
+    assert [result["hoop_stress"] for result in pooled][:2]==[result["hoop_stress"] for result in serial][:2]
+
+def test_main(tmp_path):
+    design_file=tmp_path/"designs.csv"
+    design_file.write_text(designs_csv)
+    result_file=tmp_path/"results.jsonl"
+    assert bt.main([str(design_file), "-o", str(result_file), "--workers", "1"])==0
+    results=[json.loads(line, parse_constant=lambda constant: pytest.fail(f"{constant} written to json"))
+             for line in result_file.read_text().splitlines()]
+    assert [result["passed"] for result in results]==[True, True, False]
+    assert results[2]["hoop_stress"] is None
+
+    result_file=tmp_path/"results.csv"
+    bt.main([str(design_file), "-o", str(result_file), "--workers", "1"])
+    rows=list(csv.DictReader(result_file.open()))
+    assert rows[0]["label"]=="housing_1"
+    assert list(rows[0].keys())==bt.result_fields
@@ -0,0 +1,69 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the swappable caching backend
+"""
+
+import subprocess
+import sys
+import time
+import pytest
+import utilities.cache_backend as cb
+
+def test_set_cache_backend():
+    cb.set_cache_backend("none")
+    assert cb.get_cache_backend()=="none"
+    cb.set_cache_backend(None)
+    with pytest.raises(ValueError):
+        cb.set_cache_backend("redis")
+
+def test_lru_ttl_cache():
+    calls=[]
+    def square(value, _note=""):
+        calls.append(value)
+        return [value**2]
+
+    cache=cb.lru_ttl_cache(square, max_entries=2, ttl=None, copy_results=True)
+    assert cache(2)==[4]
+    assert cache(2, _note="not part of the key")==[4]
+    assert calls==[2]
+    cache(2).append(0)
+    assert cache(2)==[4]
+    cache(3)
+    cache(4)
+    cache(2)
+    assert calls==[2, 3, 4, 2]
+
+    cache=cb.lru_ttl_cache(square, ttl=0.01)
+    cache(5)
+    time.sleep(0.02)
+    cache(5)
+    assert calls[-2:]==[5, 5]
+
+def test_cache_data_backends():
+    calls=[]
+    @cb.cache_data(max_entries=4)
+    def double(values):
+        calls.append(values)
+        return [value*2 for value in values]
+
+    cb.set_cache_backend("lru")
+    assert double([1, 2])==[2, 4]
+    assert double([1, 2])==[2, 4]
+    assert len(calls)==1
+    cb.set_cache_backend("none")
+    double([1, 2])
+    assert len(calls)==2
+    cb.set_cache_backend(None)
+    double.clear()
+
+def test_headless_import():
+    code=("import sys\n"
+          "import pressure_vessel.vessel, pressure_vessel.ext_presure_vessel_functions, materials.materials\n"
+          "print(*[name for name in ('streamlit', 'handcalcs') if name in sys.modules])\n")
+    output=subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True).stdout
+    assert output.strip()==""
@@ -0,0 +1,97 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the app calculation graph
+"""
+
+import numpy as np
+import pytest
+from materials.materials import material
+import layout.calc_graph as cg
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+import pressure_vessel.depth_models as dm
+
+def test_calc_graph():
+    graph=cg.calc_graph()
+    graph.input("a", 1)
+    graph.input("b", 2)
+    graph.node("sum", lambda a, b: a+b, "a", "b")
+    graph.node("sign", lambda total: total>0, "sum")
+    graph.node("label", lambda sign: "positive" if sign else "negative", "sign")
+    assert graph.get("label")=="positive"
+    graph.get("label")
+    assert graph.computed["sum"]==1
+
+    #sum changes but sign does not, so label is not recomputed
+    graph.set(a=5)
+    assert graph.get("label")=="positive"
+    assert graph.computed["sum"]==2 and graph.computed["sign"]==2 and graph.computed["label"]==1
+    #setting an equal value changes nothing
+    graph.set(a=5)
+    graph.get("label")
+    assert graph.computed["sum"]==2
+    with pytest.raises(KeyError):
+        graph.set(c=1)
+
+def set_design(graph, **changes):
+    values=dict(matl_label="test_6061", matl=material(matl_label="test_6061", fy=35000, fu=42000, E=10000000, v=0.33),
+                length=40.0, diameter=5.0, wall_thickness=0.5, depth=1000, percent=50, depth_model="linear")
+    values.update(changes)
+    graph.set(**values)
+    for name in graph.nodes:
+        graph.get(name)
+
+def test_design_graph():
+    graph=cg.design_graph()
+    set_design(graph)
+    assert all(count==1 for count in graph.computed.values())
+    assert graph.get("thick_walled")
+    assert graph.get("results").wall_type=="Thick Walled"
+    assert np.isclose(graph.get("hoop_stress"), epa.thick_hoop_stress(epa.depth_to_pressure(1000), 5.0, 0.5, 50))
+
+    #percent only reaches the thick walled through thickness nodes
+    before=dict(graph.computed)
+    set_design(graph, percent=25)
+    changed={name for name, count in graph.computed.items() if count!=before[name]}
+    assert changed=={"percent_hoop_stress", "hoop_stress", "hs_tk_max", "figure_percent", "figures"}
+
+    #depth skips the vessel, geometry and buckling free nodes
+    before=dict(graph.computed)
+    set_design(graph, percent=25, depth=2000)
+    changed={name for name, count in graph.computed.items() if count!=before[name]}
+    assert "pressure" in changed and "results" in changed
+    assert not changed&{"vessel", "geometry", "thick_walled"}
+
+    #material changes skip the geometry ratios
+    before=dict(graph.computed)
+    set_design(graph, percent=25, depth=2000, matl=material(matl_label="test_4140", fy=120000, E=28900000, v=0.3), matl_label="test_4140")
+    changed={name for name, count in graph.computed.items() if count!=before[name]}
+    assert "vessel" in changed and "geometry" not in changed
+
+def test_design_graph_depth_model():
+    graph=cg.design_graph()
+    set_design(graph)
+    linear_pressure=graph.get("pressure")
+    try:
+        dm.set_depth_model("seawater")
+        before=dict(graph.computed)
+        set_design(graph, depth_model=dm.depth_model_name())
+        changed={name for name, count in graph.computed.items() if count!=before[name]}
+        assert {"pressure", "results", "figures", "field_figures"}<=changed
+        assert np.isclose(graph.get("pressure"), dm.named_depth_model("seawater").depth_to_pressure(1000))
+        assert graph.get("pressure")!=linear_pressure
+    finally:
+        dm.set_depth_model(None)
+
+def test_design_graph_thin_percent():
+    graph=cg.design_graph()
+    set_design(graph, diameter=36.0, wall_thickness=0.4)
+    before=dict(graph.computed)
+    #thin walled vessels do not depend on percent at all past the through thickness nodes
+    set_design(graph, diameter=36.0, wall_thickness=0.4, percent=10)
+    changed={name for name, count in graph.computed.items() if count!=before[name]}
+    assert changed=={"percent_hoop_stress", "hs_tk_max", "figure_percent"}
@@ -0,0 +1,50 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the combined stress functions
+"""
+
+import numpy as np
+import pytest
+from pressure_vessel.vessel import vessel
+from materials.materials import material
+import pressure_vessel.combined_stress as cs
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+def test_principal_stresses():
+    hoop, long, rad=cs.principal_stresses(np.array([100.0, 100.0]), np.array([36.0, 5.0]), np.array([0.4, 0.5]))
+    #thin walled
+    assert np.isclose(hoop[0], -epa.thin_hoop_stress(100.0, 36.0, 0.4))
+    assert np.isclose(long[0], -epa.thin_longitudinal_stress(100.0, 36.0, 0.4))
+    assert rad[0]==0
+    #thick walled at the ID
+    assert np.isclose(hoop[1], epa.thick_hoop_stress_max(100.0, 5.0, 0.5))
+    assert np.isclose(rad[1], 0)
+
+def test_equivalent_stress():
+    assert np.isclose(cs.von_mises_stress(-100.0, -50.0, 0.0), np.sqrt(7500))
+    assert cs.tresca_stress(-100.0, -50.0, 0.0)==100.0
+    assert cs.von_mises_stress(-100.0, -100.0, -100.0)==0
+
+def test_combined_stress():
+    pressure=np.linspace(0, 1000, 11)[:,np.newaxis]
+    results=cs.combined_stress(pressure, np.array([36.0, 5.0]), np.array([0.4, 0.5]), 35000, 42000)
+    assert results["von_mises_stress"].shape==(11, 2)
+    assert np.all(results["tresca_stress"]>=results["von_mises_stress"])
+    assert np.allclose(results["yield_utilization"], results["von_mises_stress"]/35000)
+    assert np.allclose(results["ultimate_safety_factor"][1:], 42000/results["von_mises_stress"][1:])
+    tresca=cs.combined_stress(pressure, 36.0, 0.4, 35000, criterion="tresca")
+    assert np.allclose(tresca["equivalent_stress"], tresca["tresca_stress"])
+    with pytest.raises(ValueError):
+        cs.combined_stress(pressure, 36.0, 0.4, 35000, criterion="rankine")
+
+def test_vessel_combined_stress():
+    matl_1=material(fy=35000, fu="", E=10000000, v=0.3)
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=40.0, diameter=36.0, wall_thickness=0.4)
+    results=cs.vessel_combined_stress(vessel_1, 100.0)
+    assert np.isclose(results["yield_safety_factor"], 35000/results["von_mises_stress"])
+    assert np.isnan(results["ultimate_utilization"])
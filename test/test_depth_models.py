@@ -0,0 +1,71 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the depth to pressure models
+"""
+
+import numpy as np
+import pytest
+import pressure_vessel.depth_models as dm
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+import pressure_vessel.ext_presure_vessel_functions as epv
+
+def test_seawater_density():
+    #UNESCO (1981) check values
+    assert round(float(dm.seawater_density(35, 25, 1000)), 5)==1062.53817
+    assert round(float(dm.seawater_density(0, 5, 0)), 5)==999.96675
+    assert round(float(dm.seawater_density(35, 5, 0)), 5)==1027.67547
+
+def test_linear_depth_model():
+    model=dm.linear_depth_model()
+    assert model.depth_to_pressure(33.0)==14.7
+    model=dm.linear_depth_model(absolute=True)
+    assert np.isclose(model.depth_to_pressure(0.0), dm.atmosphere)
+    assert np.isclose(model.pressure_to_depth(model.depth_to_pressure(1000.0)), 1000.0)
+
+def test_seawater_depth_model():
+    model=dm.seawater_depth_model(salinity=35, temperature=0, latitude=30)
+    #UNESCO (1983) depth of 10000 dbar at 30 deg latitude is 9712.653 m
+    assert np.isclose(model.pressure_to_depth(1000/dm.psi_to_bar)*dm.ft_to_m, 9712.653, rtol=1e-3)
+    depth=np.array([-10.0, 0.0, 33.0, 20000.0, 36000.0, 80000.0])
+    pressure=model.depth_to_pressure(depth)
+    assert np.all(np.diff(pressure)>0)
+    assert np.allclose(model.pressure_to_depth(pressure), depth)
+    #compressibility makes deep water heavier than the linear model at the surface rate
+    assert pressure[4]/36000.0>pressure[2]/33.0
+    absolute=dm.seawater_depth_model(salinity=35, temperature=0, latitude=30, absolute=True)
+    assert np.allclose(absolute.depth_to_pressure(depth)-pressure, dm.atmosphere)
+
+def test_set_depth_model():
+    assert dm.depth_model_name()=="linear"
+    try:
+        dm.set_depth_model("seawater")
+        assert dm.depth_model_name()=="seawater S=35 T=4 lat=45"
+        assert np.isclose(epa.depth_to_pressure(1000.0), dm.named_depth_model("seawater").depth_to_pressure(1000.0))
+        assert np.isclose(epv.pressure_to_depth(epv.depth_to_pressure(1000.0)), 1000.0)
+        with pytest.raises(ValueError):
+            dm.set_depth_model("freshwater")
+    finally:
+        dm.set_depth_model(None)
+    assert epa.depth_to_pressure(33.0)==14.7
+
+def test_named_depth_model():
+    #every model comes back from its name
+    assert dm.named_depth_model("linear absolute").absolute
+    seawater=dm.seawater_depth_model(salinity=35, temperature=0, latitude=30, absolute=True)
+    named=dm.named_depth_model(seawater.name)
+    assert named.name==seawater.name
+    assert np.isclose(named.depth_to_pressure(1000.0), seawater.depth_to_pressure(1000.0))
+    table=dm.table_depth_model([0.0, 1000.0], [0.0, 500.0])
+    assert np.isnan(table.depth_to_pressure(np.array([np.nan, 100.0]))[0])
+    with pytest.raises(ValueError):
+        dm.named_depth_model(table.name)
+    try:
+        dm.set_depth_model(table)
+        assert dm.named_depth_model(dm.depth_model_name()) is table
+    finally:
+        dm.set_depth_model(None)
@@ -0,0 +1,93 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the design (inverse) functions
+"""
+
+import numpy as np
+import pytest
+import pressure_vessel.vessel as vsl
+import pressure_vessel.design as ds
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+@pytest.fixture
+def matl_list(make_materials):
+    return make_materials("test_6061", "test_4140", "test_7075")
+
+def test_thin_hoop_wall_thickness():
+    t=ds.thin_hoop_wall_thickness(1500, 12.0, 30000)
+    assert np.isclose(epa.thin_hoop_stress(1500, 12.0, t), 30000)
+
+def test_thick_hoop_wall_thickness():
+    t=ds.thick_hoop_wall_thickness(np.array([1500, 20000]), 12.0, 30000)
+    assert np.isclose(abs(epa.thick_hoop_stress_max(1500, 12.0, t[0])), 30000)
+    assert np.isnan(t[1])
+
+def test_buckling_wall_thickness():
+    t=ds.buckling_wall_thickness(np.array([1500, 1e9]), 12.0, 40.0, 10000000, 0.33)
+    p_crit, mode=epa.minimum_buckling_pressure(12.0, t[0], 40.0, 10000000, 0.33)
+    assert np.isclose(p_crit, 1500, rtol=1e-9)
+    assert np.isnan(t[1])
+
+def test_minimum_wall_thickness(matl_list):
+    results=ds.minimum_wall_thickness(40.0, 12.0, 3000.0, 1.5, matl_list)
+    assert list(results["matl_label"])==["test_6061", "test_4140", "test_7075"]
+    #no Poisson's ratio, only yield can be checked
+    assert list(results["governing"])==["buckling", "buckling", "yield hoop"]
+    assert list(results["buckling_unknown"])==[False, False, True]
+    assert np.isclose(results["wall_thickness"][2], results["yield"][2])
+
+    pressure=epa.depth_to_pressure(3000.0)
+    t=results["wall_thickness"][:2]
+    p_crit, mode=epa.minimum_buckling_pressure(12.0, t, 40.0, np.array([10000000, 28900000]), np.array([0.33, 0.3]))
+    assert np.allclose(p_crit, 1.5*pressure)
+    assert np.all(epa.thin_hoop_stress(pressure, 12.0, t)<=np.array([35000, 120000])/1.5)
+
+def test_minimum_wall_thickness_yield(matl_list):
+    #short vessel so yield governs
+    results=ds.minimum_wall_thickness(1.0, 12.0, 3000.0, 1.5, matl_list[:1])
+    assert results["governing"][0]=="yield hoop"
+    assert np.isclose(results["wall_thickness"][0], ds.thin_hoop_wall_thickness(epa.depth_to_pressure(3000.0), 12.0, 35000/1.5))
+
+@pytest.fixture
+def vessels(matl_list):
+    vessels=[]
+    vessels.append(vsl.vessel(matl=matl_list[0], length=40.0, diameter=12.0, wall_thickness=0.25))
+    vessels.append(vsl.vessel(matl=matl_list[0], length=1.0, diameter=12.0, wall_thickness=0.25))
+    vessels.append(vsl.vessel(matl=matl_list[1], length=1.0, diameter=12.0, wall_thickness=1.0))
+    vessels.append(vsl.vessel(matl=matl_list[2], length=1.0, diameter=12.0, wall_thickness=1.0))
+    return vessels
+
+def test_maximum_depth(vessels):
+    results=ds.maximum_depth(vessels, safety_factor=1.5)
+    assert list(results["governing"])==["buckling", "yield hoop", "thick walled max hoop", "thick walled max hoop"]
+    assert list(results["buckling_unknown"])==[False, False, False, True]
+    assert np.isclose(abs(epa.thick_hoop_stress_max(results["pressure"][3], 12.0, 1.0)), 73000/1.5)
+
+    #each vessel is at its limit at the maximum depth
+    pressure=epa.depth_to_pressure(results["depth"][:3])
+    p_crit, mode=epa.minimum_buckling_pressure(12.0, 0.25, 40.0, 10000000, 0.33)
+    assert np.isclose(pressure[0], p_crit/1.5)
+    assert np.isclose(epa.thin_hoop_stress(pressure[1], 12.0, 0.25), 35000/1.5)
+    assert np.isclose(abs(epa.thick_hoop_stress_max(pressure[2], 12.0, 1.0)), 120000/1.5)
+
+def test_maximum_depth_round_trip(matl_list):
+    #the minimum wall thickness is rated to its design depth
+    thicknesses=ds.minimum_wall_thickness(40.0, 12.0, 3000.0, 1.5, matl_list[:2])
+    vessels=[vsl.vessel(matl=matl_list[i], length=40.0, diameter=12.0, wall_thickness=thicknesses["wall_thickness"][i]) for i in range(2)]
+    results=ds.maximum_depth(vessels, safety_factor=1.5)
+    assert np.allclose(results["depth"], 3000.0)
+    assert list(results["governing"])==list(thicknesses["governing"])
+
+def test_maximum_depth_batch(vessels):
+    results=ds.maximum_depth(vsl.vessel_batch.from_vessels(vessels), safety_factor=1.5)
+    expected=ds.maximum_depth(vessels, safety_factor=1.5)
+    assert list(results["governing"])==list(expected["governing"])
+    assert list(results["buckling_unknown"])==list(expected["buckling_unknown"])
+    assert np.allclose(results["depth"], expected["depth"], equal_nan=True)
+    assert np.allclose(ds.maximum_depth([vessel_1.compact() for vessel_1 in vessels])["depth"],
+                       ds.maximum_depth(vessels)["depth"], equal_nan=True)
@@ -0,0 +1,49 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the memoized app calculations
+"""
+
+import numpy as np
+from materials.materials import material
+import pressure_vessel.depth_models as dm
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+import layout.design_cache as dc
+
+def test_design_key():
+    key_1=dc.design_key(matl_label="6061-t6", length=10.0, diameter=5.0, wall_thickness=0.1, depth=1000, percent=50)
+    key_2=dc.design_key(matl_label="6061-t6", length=10.0, diameter=5.0, wall_thickness=0.1, depth=1000, percent=50)
+    assert key_1==key_2
+    assert hash(key_1)==hash(key_2)
+    assert len({key_1, key_2})==1
+    key_3=dc.design_key(matl_label="6061-t6", length=10.0, diameter=5.0, wall_thickness=0.1, depth=1000, percent=50,
+                        depth_model="seawater S=35 T=4 lat=45")
+    assert key_3!=key_1
+
+def test_design_results():
+    matl_1=material(matl_label="test_6061", fy=35000, E=10000000, v=0.3)
+    key=dc.design_key(matl_label="test_6061", length=10.0, diameter=5.0, wall_thickness=0.1, depth=1000, percent=50)
+    results=dc.design_results(key, matl_1)
+    expected=epa.evaluate_vessel(key.vessel(matl_1), epa.depth_to_pressure(1000), 50)
+    assert np.isclose(results.hoop_stress, expected.hoop_stress)
+    assert results.wall_type=="Thin Walled"
+
+def test_design_results_depth_model():
+    #the pressure is from the model named in the key, not the model in use
+    matl_1=material(matl_label="test_6061", fy=35000, E=10000000, v=0.3)
+    key=dc.design_key(matl_label="test_6061", length=10.0, diameter=5.0, wall_thickness=0.1, depth=1000, percent=50,
+                      depth_model="seawater S=35 T=4 lat=45")
+    results=dc.design_results(key, matl_1)
+    pressure=dm.named_depth_model("seawater").depth_to_pressure(1000)
+    assert np.isclose(results.hoop_stress, epa.thin_hoop_stress(pressure, 5.0, 0.1))
+    assert not np.isclose(pressure, epa.depth_to_pressure(1000))
+
+def test_design_figures():
+    matl_1=material(matl_label="test_6061", fy=35000, E=10000000, v=0.3)
+    key=dc.design_key(matl_label="test_6061", length=10.0, diameter=5.0, wall_thickness=0.1, depth=1000, percent=50)
+    figures=dc.design_figures(key, matl_1)
+    assert dc.design_figures(key, matl_1) is figures
@@ -0,0 +1,152 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions for the array versions of the pressure vessel functions,
+checked against the scalar reference functions
+"""
+
+import numpy as np
+from pressure_vessel.vessel import vessel
+from materials.materials import material
+import pressure_vessel.ext_presure_vessel_functions as epv
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+def make_vessels():
+    matl_1=material(E=10000000, v=0.3)
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.1)
+    vessel_2=vessel(label="vessel_2", matl=matl_1, length=40.0, diameter=36.0, wall_thickness=0.4)
+    return [vessel_1, vessel_2]
+
+def test_vessel_arrays():
+    vessel_1=make_vessels()[0]
+    arrays=epa.vessel_arrays(vessel_1)
+    assert arrays=={"diameter":5.0, "wall_thickness":0.1, "length":10.0, "E":10000000.0, "v":0.3}
+
+def test_depth_and_pressure():
+    depth=np.array([100.0, 0.0])
+    assert np.allclose(epa.depth_to_pressure(depth), [epv.depth_to_pressure(100), 0.0])
+    assert np.allclose(epa.pressure_to_depth(epa.depth_to_pressure(depth)), depth)
+
+def test_scalar_reference():
+    pressure=100
+    percent=50
+    for vsl in make_vessels():
+        arr=epa.vessel_arrays(vsl)
+        D, t, L, E, v=arr["diameter"], arr["wall_thickness"], arr["length"], arr["E"], arr["v"]
+        pairs=[(epa.thin_hoop_stress(pressure, D, t), epv.thin_hoop_stress(vsl, pressure)[1]),
+               (epa.thin_longitudinal_stress(pressure, D, t), epv.thin_longitudinal_stress(vsl, pressure)[1]),
+               (epa.thin_diameter_reduction(pressure, D, t, E, v), epv.thin_diameter_reduction(vsl, pressure)[1]),
+               (epa.thin_length_reduction(pressure, D, t, L, E, v), epv.thin_length_reduction(vsl, pressure)[1]),
+               (epa.thin_critical_buckling_pressure(D, t, L, E, v, 1), epv.thin_critical_buckling_pressure(vsl, pressure, 1)),
+               (epa.thick_hoop_stress(pressure, D, t, percent), epv.thick_hoop_stress(vsl, pressure, percent)[1]),
+               (epa.thick_hoop_stress_max(pressure, D, t), epv.thick_hoop_stress_max(vsl, pressure)[1]),
+               (epa.thick_longitudinal_stress(pressure, D, t), epv.thick_longitudinal_stress(vsl, pressure)[1]),
+               (epa.thick_radial_stress(pressure, D, t, percent), epv.thick_radial_stress(vsl, pressure, percent)[1]),
+               (epa.thick_radial_stress_max(pressure), epv.thick_radial_stress_max(vsl, pressure)),
+               (epa.thick_outer_diameter_reduction(pressure, D, t, E, v), epv.thick_outer_diameter_reduction(vsl, pressure)[1]),
+               (epa.thick_inner_diameter_reduction(pressure, D, t, E, v), epv.thick_inner_diameter_reduction(vsl, pressure)[1]),
+               (epa.thick_length_reduction(pressure, D, t, L, E, v), epv.thick_length_reduction(vsl, pressure)[1])]
+        for array_value, scalar_value in pairs:
+            assert np.isclose(array_value, scalar_value, rtol=1e-12)
+
+def test_broadcasting():
+    pressure=np.linspace(0, 1000, 11)[:, None]
+    diameter=np.array([5.0, 36.0])[None, :]
+    wall_thickness=np.array([0.1, 0.4])[None, :]
+    hoop=epa.thin_hoop_stress(pressure, diameter, wall_thickness)
+    assert hoop.shape==(11, 2)
+    assert np.allclose(hoop[1], [2500.0, 4500.0])
+    long=epa.thick_longitudinal_stress(pressure, diameter, wall_thickness)
+    assert np.allclose(long[1], [1275.510204081630, 2275.280898876410])
+
+def test_buckling_modes():
+    modes=np.arange(1, 5)
+    p_crit=epa.thin_critical_buckling_pressure(5.0, 0.1, 10.0, 10000000, 0.3, modes)
+    assert p_crit.shape==(4,)
+    assert round(p_crit[0],8)==round(44614.12796007,8)
+
+def test_evaluate_vessel_thin():
+    vessel_1=make_vessels()[0]
+    pressure=100
+    results=epa.evaluate_vessel(vessel_1, pressure)
+    assert results.wall_type=="Thin Walled"
+    assert results.thickness_ratio==25
+    assert results.length_ratio==4.0
+    assert np.isclose(results.hoop_stress, epv.thin_hoop_stress(vessel_1, pressure)[1])
+    assert np.isclose(results.hoop_stress_max, results.hoop_stress)
+    assert np.isclose(results.longitudinal_stress, epv.thin_longitudinal_stress(vessel_1, pressure)[1])
+    assert results.radial_stress==0
+    assert np.isclose(results.diameter_reduction, epv.thin_diameter_reduction(vessel_1, pressure)[1])
+    assert np.isclose(results.length_reduction, epv.thin_length_reduction(vessel_1, pressure)[1])
+
+def test_evaluate_vessel_thick():
+    matl_1=material(E=10000000, v=0.3)
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.5)
+    pressure=np.array([100.0, 200.0])
+    percent=25
+    results=epa.evaluate_vessel(vessel_1, pressure, percent)
+    assert results.wall_type=="Thick Walled"
+    assert results.hoop_stress.shape==(2,)
+    assert np.isclose(results.hoop_stress[0], epv.thick_hoop_stress(vessel_1, 100, percent)[1])
+    assert np.isclose(results.hoop_stress_max[0], epv.thick_hoop_stress_max(vessel_1, 100)[1])
+    assert np.isclose(results.longitudinal_stress[0], epv.thick_longitudinal_stress(vessel_1, 100)[1])
+    assert np.isclose(results.radial_stress[0], epv.thick_radial_stress(vessel_1, 100, percent)[1])
+    assert np.isclose(results.diameter_reduction[0], epv.thick_outer_diameter_reduction(vessel_1, 100)[1])
+    assert np.isclose(results.inner_diameter_reduction[0], epv.thick_inner_diameter_reduction(vessel_1, 100)[1])
+    assert np.isclose(results.length_reduction[1], epv.thick_length_reduction(vessel_1, 200)[1])
+
+def test_evaluate_compact_vessel():
+    matl_1=material(E=10000000, v=0.3)
+    for wall_thickness in (0.1, 0.5):
+        vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=wall_thickness)
+        compact_1=vessel_1.compact()
+        assert epa.vessel_geometry(compact_1)==epa.vessel_geometry(vessel_1)
+        results=epa.evaluate_vessel(compact_1, np.array([100.0, 200.0]), 25)
+        expected=epa.evaluate_vessel(vessel_1, np.array([100.0, 200.0]), 25)
+        assert results.wall_type==expected.wall_type
+        for name in ("hoop_stress", "radial_stress", "diameter_reduction", "length_reduction"):
+            assert np.allclose(getattr(results, name), getattr(expected, name))
+
+def test_minimum_buckling_pressure():
+    p_crit, mode=epa.minimum_buckling_pressure(36.0, 0.4, 40.0, 10000000, 0.3)
+    modes=np.arange(2, 200)
+    p_all=epa.thin_critical_buckling_pressure(36.0, 0.4, 40.0, 10000000, 0.3, modes)
+    assert np.isclose(p_crit, p_all.min())
+    assert mode==modes[np.argmin(p_all)]
+
+def test_minimum_buckling_pressure_batch():
+    rng=np.random.default_rng(1)
+    diameter=rng.uniform(5, 60, 2000)
+    wall_thickness=diameter*rng.uniform(0.002, 0.05, 2000)
+    length=diameter*rng.uniform(0.5, 20, 2000)
+    p_crit, mode=epa.minimum_buckling_pressure(diameter, wall_thickness, length, 10000000, 0.3, block=4)
+    assert p_crit.shape==(2000,)
+    modes=np.arange(2, 501)
+    p_all=epa.thin_critical_buckling_pressure(diameter[:,None], wall_thickness[:,None], length[:,None], 10000000, 0.3, modes[None,:])
+    assert np.allclose(p_crit, p_all.min(axis=1))
+    assert (mode==modes[np.argmin(p_all, axis=1)]).all()
+
+def test_evaluate_vessel_buckling():
+    vessel_2=make_vessels()[1]
+    results=epa.evaluate_vessel(vessel_2, 100)
+    p_crit, mode=epa.minimum_buckling_pressure(36.0, 0.4, 40.0, 10000000, 0.3)
+    assert results.critical_buckling_pressure==p_crit
+    assert results.buckling_mode==mode
+
+def test_thick_stress_field():
+    pressure=np.array([100.0, 1000.0])
+    field=epa.thick_stress_field(pressure, 5.0, 0.5, [0, 50, 100])
+    assert field["hoop"].shape==(2, 3)
+    for i, p in enumerate(pressure):
+        assert np.allclose(field["hoop"][i], epa.thick_hoop_stress(p, 5.0, 0.5, np.array([0, 50, 100])))
+        assert np.allclose(field["radial"][i], epa.thick_radial_stress(p, 5.0, 0.5, np.array([0, 50, 100])))
+        assert np.allclose(field["longitudinal"][i], epa.thick_longitudinal_stress(p, 5.0, 0.5))
+    #shear is half the difference of the (compressive) hoop and radial stress, largest at the ID
+    assert np.allclose(field["shear"], (-field["hoop"]-field["radial"])/2)
+    assert np.isclose(field["shear"][0, 0], epa.thick_shear_stress(100.0, 5.0, 0.5))
+    assert np.isclose(field["radial"][0, 2], epa.thick_radial_stress_max(100.0))
+    assert len(epa.thick_stress_field(100.0, 5.0, 0.5)["percent"])==101
@@ -10,7 +10,9 @@ pressure vessel test functions related to "vessel" class
 
 from pressure_vessel.vessel import vessel
 from materials.materials import material
+import numpy as np
 import pressure_vessel.ext_presure_vessel_functions as epv
+import pressure_vessel.ext_pressure_vessel_arrays as epa
 
 def test_depth_to_pressure():
     depth=100
@@ -148,8 +150,17 @@ def test_thick_shear_stress():
     latex_1, value_1=epv.thick_shear_stress(vessel_1, pressure, percent)
     latex_2, value_2=epv.thick_shear_stress(vessel_2, pressure, percent)
 
-    assert round(value_1,8)==round(-1275.510204081630,8)
-    assert round(value_2,8)==round(-2275.280898876410,8)
+    assert round(value_1,8)==round(-1223.979804333228,8)
+    assert round(value_2,8)==round(-2224.438237709751,8)
+
+def test_thick_shear_stress_matches_arrays():
+    matl_1=material(E=10000000, v=0.3)
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.5)
+    for percent in (0, 25, 50, 75, 100):
+        value=epv.numeric(epv.thick_shear_stress)(vessel_1, 100, percent)
+        assert np.isclose(value, epa.thick_shear_stress(100, 5.0, 0.5, percent))
+    #0%=ID is the maximum, -p*a^2/(a^2-b^2)
+    assert np.isclose(epv.numeric(epv.thick_shear_stress)(vessel_1, 100, 0), (-100*6.25)/(6.25-4.0))
 
 def test_thick_outer_diameter_reduction():
     matl_1=material(E=10000000, v=0.3)
@@ -185,4 +196,24 @@ def test_thick_length_reduction():
     latex_2, value_2=epv.thick_length_reduction(vessel_2, pressure)
 
     assert round(value_1,8)==round(-0.000510204082,8)
-    assert round(value_2,8)==round(-0.003640449438,8)
\ No newline at end of file
+    assert round(value_2,8)==round(-0.003640449438,8)
+
+def test_numeric():
+    matl_1=material()
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.1)
+    pressure=100
+
+    assert epv.numeric(epv.thin_hoop_stress)(vessel_1, pressure)==2500.0
+    assert epv.numeric(epv.thick_radial_stress_max)(vessel_1, pressure)==-pressure
+
+def test_lazy_latex():
+    matl_1=material()
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.1)
+    pressure=100
+
+    hoop=epv.lazy_latex(epv.thin_hoop_stress, vessel_1, pressure)
+    assert hoop.value==2500.0
+    assert hoop._latex is None
+    latex_1, value_1=epv.thin_hoop_stress(vessel_1, pressure)
+    assert hoop.latex==latex_1
+    assert hoop.value==value_1
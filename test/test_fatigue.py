@@ -0,0 +1,67 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the dive log fatigue functions
+"""
+
+import io
+import numpy as np
+import pytest
+from pressure_vessel.vessel import vessel
+from materials.materials import material, sn_curve
+import pressure_vessel.fatigue as ftg
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+def make_vessel():
+    curve=sn_curve(coefficient=100000, exponent=-0.1, endurance_limit=100)
+    matl_1=material(matl_label="test_6061", fy=35000, E=10000000, v=0.33, sn_curve=curve)
+    return vessel(label="vessel_1", matl=matl_1, length=40.0, diameter=12.0, wall_thickness=0.25)
+
+def test_sn_curve():
+    curve=sn_curve(coefficient=100000, exponent=-0.1, endurance_limit=100)
+    cycles=curve.cycles_to_failure(np.array([50000, 50]))
+    assert np.isclose(curve.coefficient*((2*cycles[0])**curve.exponent), 50000)
+    assert np.isinf(cycles[1])
+    assert np.isclose(curve.damage([50000, 50000], [1, 0.5]), 1.5/cycles[0])
+
+def test_rainflow():
+    ranges, means, counts=ftg.rainflow([0, 10, 0, 10, 0])
+    assert list(ranges)==[10, 10, 10]
+    assert list(counts)==[1, 0.5, 0.5]
+    #flats and non reversals are dropped
+    ranges, means, counts=ftg.rainflow([0, 5, 5, 10, 4, 4, 6, 0])
+    assert sorted(zip(ranges, counts))==[(2, 1), (10, 0.5), (10, 0.5)]
+
+def test_rainflow_streaming():
+    values=np.cumsum(np.random.default_rng(1).normal(size=5000))
+    whole=ftg.rainflow(values)
+    counter=ftg.rainflow_counter()
+    parts=[counter.update(values[start:start+37]) for start in range(0, len(values), 37)]+[counter.finish()]
+    streamed=tuple(np.concatenate(part) for part in zip(*parts))
+    for whole_part, streamed_part in zip(whole, streamed):
+        assert np.array_equal(whole_part, streamed_part)
+    #n reversals (including the last point) make (n-1)/2 cycles
+    n_reversals=len(ftg.rainflow_counter().reversals(values))+1
+    assert 2*sum(streamed[2])==n_reversals-1
+
+def test_dive_log_damage():
+    vessel_1=make_vessel()
+    depth=np.tile([0.0, 1000.0], 50)
+    log=io.StringIO("time,depth\n"+"\n".join(f"{i},{d}" for i, d in enumerate(depth)))
+    results=ftg.dive_log_damage(log, vessel_1, chunk_size=7)
+
+    hoop_range=epa.thin_hoop_stress(epa.depth_to_pressure(1000.0), 12.0, 0.25)
+    hoop=results["hoop_stress"]
+    assert hoop["cycles"]==99/2
+    assert np.isclose(hoop["max_range"], hoop_range)
+    assert np.isclose(hoop["damage"], vessel_1.matl.sn_curve.damage(hoop_range/2, 99/2))
+    assert results["longitudinal_stress"]["damage"]<hoop["damage"]
+
+def test_fatigue_damage_no_curve():
+    vessel_1=vessel(matl=material(fy=35000, E=10000000, v=0.33), length=40.0, diameter=12.0, wall_thickness=0.25)
+    with pytest.raises(ValueError):
+        ftg.fatigue_damage([np.array([0.0, 100.0])], vessel_1)
@@ -0,0 +1,61 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the stress plots
+"""
+
+from pressure_vessel.vessel import vessel
+from materials.materials import material
+import layout.figures as fgs
+
+def test_depth_sweep():
+    depth_choice=1000
+    depth_values=fgs.depth_sweep(depth_choice)
+    assert list(depth_values)==list(range(1, int(round(depth_choice+1,0)), int(round((depth_choice+1)/30,0))))
+    assert len(fgs.depth_sweep(10))==10
+
+def test_display_hoop_and_long_figures():
+    matl_1=material(fy=35000, E=10000000, v=0.3)
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.1)
+    vessel_2=vessel(label="vessel_2", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.5)
+
+    figures_1=fgs.display_hoop_and_long_figures(vessel_1, 1000, 50)
+    figures_2=fgs.display_hoop_and_long_figures(vessel_2, 1000, 50)
+    assert list(figures_1.keys())==["fig_hs_d", "fig_hs_p", "fig_ls_d", "fig_ls_p"]
+    assert figures_1["fig_hs_d"].data[0].line.color=="gray"
+    assert figures_2["fig_hs_d"].data[0].line.color=="white"
+    #the depth and pressure figures share the same stress values
+    assert list(figures_1["fig_hs_d"].data[0].y)==list(figures_1["fig_hs_p"].data[0].y)
+    #no over yield band below yield
+    assert len(figures_1["fig_hs_d"].data)==2
+
+def test_thick_display_hoop_and_long_figures():
+    matl_1=material(fy=100, E=10000000, v=0.3)
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.5)
+    figures=fgs.thick_display_hoop_and_long_figures(vessel_1, 1000, 50)
+    assert list(figures.keys())==["fig_tk_hs_d", "fig_tk_hs_p", "fig_tk_ls_d", "fig_tk_ls_p"]
+    assert len(figures["fig_tk_hs_d"].data)==3
+
+def test_figure_template():
+    matl_1=material(fy=35000, E=10000000, v=0.3)
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.1)
+    template=fgs.figure_template("hs_d", "Thin Walled")
+    assert fgs.figure_template("hs_d", "Thin Walled") is template
+
+    figures=fgs.display_hoop_and_long_figures(vessel_1, 1000, 50)
+    figures["fig_hs_d"].update_layout(title_text="changed")
+    assert template["layout"]["title"]["text"]=="<b>Hoop Stress at Depth<b>"
+    assert len(template["data"][0]["x"])==0
+    assert figures["fig_hs_d"].layout.xaxis.range==(0, 991*1.02)
+
+def test_display_stress_field_figures():
+    matl_1=material(fy=35000, E=10000000, v=0.3)
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.5)
+    figures=fgs.display_stress_field_figures(vessel_1, 1000, points=11)
+    assert list(figures.keys())==["fig_hf_d", "fig_hf_p", "fig_rf_d", "fig_rf_p", "fig_sf_d", "fig_sf_p"]
+    assert len(figures["fig_hf_d"].data[0].x)==11
+    assert len(figures["fig_hf_d"].data[0].y)==len(fgs.depth_sweep(1000))
@@ -0,0 +1,58 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the binary material table cache
+"""
+
+import os
+import numpy as np
+import materials.material_cache as mtc
+
+csv_text="""label,matl_type,matl_cat,spec,spec_num,DIN_number,density,Fy,Fu,E,G ,v,elongation,area_reduc
+6061-t6,Aluminum,Metal,UNS,A96061,,0.098,35000,42000,10000000,3800000,0.33,,
+4140 HT,Steel,Metal,UNS,G41400,1.7225,0.289,120000,130000,28900000,11600000,0.3,,
+"""
+
+def write_csv(tmp_path, text):
+    matl_file=str(tmp_path/"materials.csv")
+    with open(matl_file, "w") as csv_file:
+        csv_file.write(text)
+    return matl_file
+
+def test_parse_matl_table():
+    table=mtc.parse_matl_table(csv_text.encode())
+    assert table["header"][0]=="label"
+    assert table["rows"][0][:2]==["6061-t6", "Aluminum"]
+    assert table["columns"][0].dtype.kind=="U"
+    assert table["columns"][7].dtype==np.int64
+    assert np.isnan(table["columns"][5][0])
+    assert table["columns"][5][1]==1.7225
+
+def test_load_matl_table(tmp_path):
+    matl_file=write_csv(tmp_path, csv_text)
+    table=mtc.load_matl_table(matl_file)
+    assert os.path.exists(mtc.cache_path(matl_file))
+
+    #a new process would read the cache
+    mtc.loaded_tables.clear()
+    cached=mtc.read_matl_cache(mtc.cache_path(matl_file))
+    assert cached["rows"]==table["rows"]
+    assert mtc.load_matl_table(matl_file)["sha256"]==table["sha256"]
+
+    #a changed file invalidates the cache
+    write_csv(tmp_path, csv_text.replace("35000", "36000"))
+    os.utime(matl_file, ns=(table["mtime_ns"]+10**9, table["mtime_ns"]+10**9))
+    changed=mtc.load_matl_table(matl_file)
+    assert changed["rows"][0][7]=="36000"
+    assert mtc.read_matl_cache(mtc.cache_path(matl_file))["sha256"]==changed["sha256"]
+
+def test_matl_table_dataframe(tmp_path):
+    matl_file=write_csv(tmp_path, csv_text)
+    df=mtc.matl_table_dataframe(mtc.load_matl_table(matl_file))
+    assert list(df.columns)[0]=="label"
+    assert df["Fy"].tolist()==[35000, 120000]
+    assert df["spec_num"].tolist()==["A96061", "G41400"]
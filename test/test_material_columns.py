@@ -0,0 +1,50 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the columnar material table
+"""
+
+import numpy as np
+import pytest
+import materials.materials as mt
+import materials.material_columns as mc
+from pressure_vessel.vessel import vessel
+import pressure_vessel.ext_presure_vessel_functions as epv
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+@pytest.fixture
+def matl_list(make_materials):
+    matl_list=make_materials("test_6061", "test_4140")
+    #text properties as read from the material table
+    matl_list.insert(1, mt.material(matl_label="test_7075", matl_type="test_Aluminum", matl_cat="test_metal", fy="73000", E="10000000", v=""))
+    return matl_list
+
+def test_to_float():
+    assert mc.to_float("1,000")==1000.0
+    assert mc.to_float(0.3)==0.3
+    assert np.isnan(mc.to_float(""))
+    assert np.isnan(mc.to_float(None))
+
+def test_generate_matl_columns(matl_list):
+    columns=mc.generate_matl_columns(matl_list)
+    assert len(columns)==3
+    assert columns.fy.dtype==float
+    assert list(columns.fy)==[35000.0, 73000.0, 120000.0]
+    assert np.isnan(columns.v[1])
+    assert columns.types==["test_Aluminum", "test_Steel"]
+    assert list(columns.type_codes)==[0, 0, 1]
+    assert list(columns.matl_type())==["test_Aluminum", "test_Aluminum", "test_Steel"]
+    assert list(columns.matl_cat())==["test_metal"]*3
+    assert columns.index("test_4140")==2
+
+def test_broadcast_over_materials(matl_list):
+    columns=mc.generate_matl_columns(matl_list)
+    dia=epa.thin_diameter_reduction(100, 5.0, 0.1, columns.E, columns.v)
+    assert dia.shape==(3,)
+    vessel_1=vessel(label="vessel_1", matl=matl_list[2], length=10.0, diameter=5.0, wall_thickness=0.1)
+    assert np.isclose(dia[2], epv.thin_diameter_reduction(vessel_1, 100)[1])
+    assert np.isnan(dia[1])
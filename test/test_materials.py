@@ -62,4 +62,40 @@ def test_generate_matl_type_index():
     matl_list.append(mt.material(matl_label="test_316", matl_type="test_Stainless Steel", matl_cat="test_metal_3"))
     matl_list.append(mt.material(matl_label="test_316", matl_type="test_Stainless Steel", matl_cat="test_metal_4"))
     
-    assert mt.generate_matl_type_index(matl_list)==["All","test_Aluminum","test_Steel","test_Stainless Steel"]
\ No newline at end of file
+    assert mt.generate_matl_type_index(matl_list)==["All","test_Aluminum","test_Steel","test_Stainless Steel"]
+
+def test_generate_matl_category_index():
+    matl_list=[]
+    matl_list.append(mt.material(matl_label="test_6061", matl_type="test_Aluminum", matl_cat="test_metal_1"))
+    matl_list.append(mt.material(matl_label="test_7075", matl_type="test_Aluminum", matl_cat="test_metal_1"))   
+    matl_list.append(mt.material(matl_label="test_4140", matl_type="test_Steel", matl_cat="test_metal_2"))
+    
+    assert mt.generate_matl_category_index(matl_list)==["All","test_metal_1","test_metal_2"]
+
+def test_material_catalog():
+    matl_list=[]
+    matl_list.append(mt.material(matl_label="test_7075", matl_type="test_Aluminum", matl_cat="test_metal_1", spec="UNS"))
+    matl_list.append(mt.material(matl_label="test_6061", matl_type="test_Aluminum", matl_cat="test_metal_1", spec="UNS"))   
+    matl_list.append(mt.material(matl_label="test_4140", matl_type="test_Steel", matl_cat="test_metal_2", spec="UNS"))
+    matl_list.append(mt.material(matl_label="test_316", matl_type="test_Stainless Steel", matl_cat="test_metal_3"))
+    catalog=mt.material_catalog(matl_list)
+
+    assert len(catalog)==4
+    assert catalog.get("test_4140") is matl_list[2]
+    assert catalog.get("missing") is None
+    assert catalog.type_options==["All","test_Aluminum","test_Stainless Steel","test_Steel"]
+    assert catalog.category_options==["All","test_metal_1","test_metal_2","test_metal_3"]
+    assert catalog.labels("All")==["test_316","test_4140","test_6061","test_7075"]
+    assert catalog.labels("all")==catalog.labels("All")
+    assert catalog.labels("test_Aluminum")==["test_6061","test_7075"]
+    assert catalog.labels("missing")==[]
+    assert len(catalog.by_spec["UNS"])==3
+    assert len(catalog.by_category["test_metal_1"])==2
+
+def test_convert_to_material_strings():
+    matl=["6061-t6","Aluminum","Metal","UNS","A96061","","0.098","35,000","42000","10000000","3800000","0.33","",""]
+    matl_conv=mt.convert_to_material(matl)
+    assert matl_conv.density==0.098
+    assert matl_conv.fy==35000.0
+    assert matl_conv.v==0.33
+    assert matl_conv.elongation==""
@@ -0,0 +1,63 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the Monte Carlo reliability functions
+"""
+
+import numpy as np
+import pytest
+import pressure_vessel.reliability as rl
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+def design_args():
+    return (40.0, rl.tolerance(12.0, 0.01), rl.normal(0.4, 0.01, 0.38, 0.42), rl.normal(10000000, 200000), 0.33,
+            rl.lognormal(35000, 1500), rl.uniform(3500, 3900))
+
+def test_distribution():
+    rng=np.random.default_rng(1)
+    values=rl.normal(1.0, 0.5, 0.5, 1.2).sample(rng, 100000)
+    assert values.min()>=0.5 and values.max()<=1.2
+    values=rl.lognormal(35000, 1500).sample(rng, 100000)
+    assert np.isclose(values.mean(), 35000, rtol=0.01)
+    assert np.isclose(values.std(), 1500, rtol=0.05)
+    values=rl.tolerance(12.0, 0.01, 0.02).sample(rng, 1000)
+    assert values.min()>=11.99 and values.max()<=12.02
+    assert np.all(rl.as_distribution(3.0).sample(rng, 5)==3.0)
+    with pytest.raises(ValueError):
+        rl.distribution("weibull", 1.0)
+    with pytest.raises(ValueError):
+        rl.distribution("uniform", 1.0)
+    #bounds 50 standard deviations out can not be reached by redrawing
+    with pytest.raises(ValueError):
+        rl.normal(0.0, 1.0, 50.0, 51.0).sample(rng, 10)
+
+def test_histogram_percentiles():
+    values=np.random.default_rng(2).lognormal(np.log(30000), 0.1, 100000)
+    counts=rl.histogram_counts(np.append(values, [np.nan, -1.0]))
+    assert counts.sum()==100000
+    assert np.allclose(rl.histogram_percentiles(counts, [5, 50, 95]), np.percentile(values, [5, 50, 95]), rtol=0.005)
+
+def test_monte_carlo():
+    results=rl.monte_carlo(*design_args(), samples=50000, chunk_size=8192, seed=3, workers=1)
+    assert results["samples"]==50000
+    assert 0<results["probability_of_buckling"]<1
+    assert results["probability_of_failure"]>=max(results["probability_of_yield"], results["probability_of_buckling"])
+    #median hoop stress close to the nominal design at the median depth
+    assert np.isclose(results["hoop_stress"][2], epa.thin_hoop_stress(epa.depth_to_pressure(3700), 12.0, 0.4), rtol=0.01)
+
+def test_monte_carlo_fixed():
+    #no scatter, every sample is the nominal design
+    results=rl.monte_carlo(40.0, 12.0, 0.4, 10000000, 0.33, 35000, 1000.0, samples=1000, seed=4, workers=1)
+    p_crit, mode=epa.minimum_buckling_pressure(12.0, 0.4, 40.0, 10000000, 0.33)
+    assert results["failures"]==0
+    assert np.allclose(results["critical_buckling_pressure"], p_crit, rtol=0.005)
+
+def test_monte_carlo_reproducible():
+    results_1=rl.monte_carlo(*design_args(), samples=20000, chunk_size=4096, seed=5, workers=1)
+    results_2=rl.monte_carlo(*design_args(), samples=20000, chunk_size=4096, seed=5, workers=2)
+    assert results_1["failures"]==results_2["failures"]
+    assert np.array_equal(results_1["hoop_stress"], results_2["hoop_stress"])
@@ -0,0 +1,75 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the calculation package export
+"""
+
+import csv
+import io
+import pytest
+import pressure_vessel.batch as bt
+import layout.report as rp
+
+designs_csv="""label,material,L,D,t,depth
+housing_1,6061-t6,10,5,0.1,1000
+housing 2 & co,4140 HT,10,5,0.5,20000
+housing_3,unobtainium,10,5,0.1,1000
+"""
+
+def read_designs():
+    return list(bt.read_designs(io.StringIO(designs_csv), "csv"))
+
+def test_latex_escape():
+    assert rp.latex_escape("a_b & 50% #1")==r"a\_b \& 50\% \#1"
+    assert rp.latex_escape("x\\y")==r"x\textbackslash{}y"
+
+def test_package_name():
+    assert rp.package_name(2, "housing 2 & co")=="0002_housing_2_co"
+    assert rp.package_name(12, "///")=="0012_design"
+
+def test_export_packages(tmp_path):
+    rows=rp.export_packages(read_designs(), str(tmp_path), workers=1)
+    assert [row["number"] for row in rows]==[1, 2, 3]
+    assert [row["passed"] for row in rows]==[True, True, False]
+    assert [row["wall_type"] for row in rows[:2]]==["Thin Walled", "Thick Walled"]
+
+    thin_html=(tmp_path/rows[0]["html"]).read_text()
+    assert "PASS" in thin_html and "\\begin{aligned}" in thin_html and "Diameter Reduction" in thin_html
+    thick_tex=(tmp_path/rows[1]["tex"]).read_text()
+    assert r"\title{Calculation Package: housing 2 \& co}" in thick_tex
+    assert "Maximum Hoop Stress" in thick_tex and thick_tex.rstrip().endswith(r"\end{document}")
+
+    #a design that can not be evaluated is only listed in the index
+    assert rows[2]["html"]=="" and "unknown material" in rows[2]["error"]
+    assert "2 of 3 designs pass" in (tmp_path/"index.html").read_text()
+    with open(tmp_path/"summary.csv", newline="") as summary_file:
+        summary=list(csv.DictReader(summary_file))
+    assert [row["passed"] for row in summary]==["True", "True", "False"]
+
+def test_export_packages_pool(tmp_path):
+    serial=rp.export_packages(read_designs(), str(tmp_path/"serial"), workers=1)
+    pooled=rp.export_packages(read_designs(), str(tmp_path/"pooled"), workers=2, chunk_size=1)
+    assert [row["label"] for row in pooled]==[row["label"] for row in serial]
+    assert [row["passed"] for row in pooled]==[row["passed"] for row in serial]
+    assert ((tmp_path/"pooled"/pooled[1]["tex"]).read_text()==(tmp_path/"serial"/serial[1]["tex"]).read_text())
+
+def test_unknown_format(tmp_path):
+    with pytest.raises(ValueError):
+        list(rp.render_packages(read_designs(), str(tmp_path), formats=("docx",), workers=1))
+
+def test_export_packages_missing_property(tmp_path):
+    #7075-t6 has no Poisson's ratio, the yield calculations are rendered and buckling is not checked
+    designs=list(bt.read_designs(io.StringIO("label,material,L,D,t,depth\nhousing_4,7075-t6,10,5,0.1,1000\n"), "csv"))
+    rows=rp.export_packages(designs, str(tmp_path), workers=1, mathjax="mathjax/tex-chtml.js")
+    assert rows[0]["passed"] is False and rows[0]["wall_type"]=="Thin Walled"
+    assert rp.status_text(rows[0])=="INCOMPLETE"
+
+    package=(tmp_path/rows[0]["html"]).read_text()
+    assert "\\begin{aligned}" in package and "Not calculated, missing Poisson&#x27;s ratio." in package
+    assert "NOT CHECKED" in package and 'src="mathjax/tex-chtml.js"' in package
+    assert "Not calculated, missing Poisson's ratio." in (tmp_path/rows[0]["tex"]).read_text()
+    assert "INCOMPLETE" in (tmp_path/"index.html").read_text()
@@ -0,0 +1,109 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the calculation service
+"""
+
+import asyncio
+import json
+import numpy as np
+import materials.materials as mt
+import pressure_vessel.service as svc
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+async def request(port, method, path, payload=None, content_length=None):
+    reader, writer=await asyncio.open_connection("127.0.0.1", port)
+    body=json.dumps(payload).encode() if payload is not None else b""
+    content_length=len(body) if content_length is None else content_length
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nContent-Length: {content_length}\r\nConnection: close\r\n\r\n".encode()+body)
+    await writer.drain()
+    response=await reader.read()
+    writer.close()
+    head, _, content=response.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(content)
+
+def run_with_service(test, **options):
+    async def run():
+        service=svc.calculation_service("material_table.csv", **{"max_delay":0.05, **options})
+        server=await service.start("127.0.0.1", 0)
+        port=server.sockets[0].getsockname()[1]
+        try:
+            return await test(service, port)
+        finally:
+            await service.close()
+            server.close()
+            await server.wait_closed()
+    return asyncio.run(run())
+
+def design(depth):
+    return {"matl_label":"6061-t6", "L":40.0, "D":12.0, "t":0.25, "depth":depth}
+
+def test_materials():
+    async def test(service, port):
+        status, payload=await request(port, "GET", "/materials")
+        assert status==200
+        assert len(payload["materials"])==len(service.catalog)
+        status, payload=await request(port, "GET", "/materials/grade%2050%20")
+        assert status==200 and payload["matl_label"]=="grade 50 "
+        status, payload=await request(port, "GET", "/materials/unobtainium")
+        assert status==404
+    run_with_service(test)
+
+def test_evaluate_coalesced():
+    async def test(service, port):
+        responses=await asyncio.gather(*[request(port, "POST", "/evaluate", design(100.0*i)) for i in range(1, 21)])
+        assert all(status==200 for status, payload in responses)
+        assert [payload["depth"] for status, payload in responses]==[100.0*i for i in range(1, 21)]
+        assert np.isclose(responses[9][1]["hoop_stress"], epa.thin_hoop_stress(epa.depth_to_pressure(1000.0), 12.0, 0.25))
+        #concurrent requests share micro-batches
+        assert service.batches<20
+    run_with_service(test)
+
+def test_batch():
+    async def test(service, port):
+        designs=[design(10.0*i) for i in range(2500)]+[{"matl_label":"unobtainium"}]
+        status, payload=await request(port, "POST", "/batch", {"designs":designs})
+        assert status==200
+        results=payload["results"]
+        assert len(results)==2501
+        assert results[-1]["error"] and results[-1]["hoop_stress"] is None
+        assert results[100]["passed"]==True
+        status, payload=await request(port, "POST", "/batch", "not json{")
+        assert status==400
+    run_with_service(test)
+
+def test_calculations():
+    async def test(service, port):
+        status, payload=await request(port, "GET", "/calculations")
+        assert "thick_hoop_stress" in payload["calculations"]
+        status, payload=await request(port, "POST", "/calculations/thin_hoop_stress", dict(design(1000.0)))
+        assert np.isclose(payload["value"], epa.thin_hoop_stress(epa.depth_to_pressure(1000.0), 12.0, 0.25))
+        status, payload=await request(port, "POST", "/calculations/thick_hoop_stress", dict(design(0), pressure=100, percent=0))
+        assert np.isclose(payload["value"], epa.thick_hoop_stress(100, 12.0, 0.25, 0))
+        status, payload=await request(port, "POST", "/calculations/rm_rf", design(0))
+        assert status==404
+    run_with_service(test)
+
+def test_service_catalog():
+    async def test(service, port):
+        #designs are evaluated with the catalog of the service
+        service.catalog=mt.material_catalog([mt.material(matl_label="test_6061", fy=35000, E=10000000, v=0.33)])
+        status, payload=await request(port, "POST", "/evaluate", dict(design(1000.0), matl_label="test_6061"))
+        assert status==200 and payload["passed"]
+        status, payload=await request(port, "POST", "/batch", [design(1000.0)])
+        assert "unknown material" in payload["results"][0]["error"]
+    run_with_service(test)
+
+def test_request_body_limit():
+    async def test(service, port):
+        status, payload=await request(port, "POST", "/batch", [design(10.0*i) for i in range(100)])
+        assert status==413 and "limit" in payload["error"]
+        status, payload=await request(port, "POST", "/evaluate", design(1000.0), content_length=-1)
+        assert status==400
+        status, payload=await request(port, "POST", "/calculations/thin_hoop_stress", dict(design(1000.0), latex=True))
+        assert status==200 and "latex" in payload
+    run_with_service(test, max_body=1024)
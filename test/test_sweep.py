@@ -0,0 +1,65 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the parametric design space sweep
+"""
+
+import numpy as np
+import pyarrow.parquet as pq
+import pytest
+import pressure_vessel.sweep as sw
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+@pytest.fixture
+def sweep_args(make_materials):
+    return ([10.0, 40.0], [5.0, 36.0], [0.1, 0.4, 1.0], make_materials("test_6061", "test_4140"), [100.0, 1000.0, 5000.0])
+
+def test_run_sweep(sweep_args):
+    chunks=list(sw.run_sweep(*sweep_args, chunk_size=7))
+    assert [start for start, results in chunks]==list(range(0, 72, 7))
+    results={name:np.concatenate([chunk[name] for start, chunk in chunks]) for name in sw.sweep_columns}
+    assert len(results["passed"])==2*2*3*2*3
+
+    #point (length 40, diameter 36, thickness 0.4, 4140, 1000 ft)
+    index=np.ravel_multi_index((1, 1, 1, 1, 1), (2, 2, 3, 2, 3))
+    pressure=epa.depth_to_pressure(1000.0)
+    assert results["material_index"][index]==1
+    assert np.isclose(results["thin_hoop_stress"][index], epa.thin_hoop_stress(pressure, 36.0, 0.4))
+    assert np.isclose(results["thick_hoop_stress_max"][index], abs(epa.thick_hoop_stress_max(pressure, 36.0, 0.4)))
+    p_crit, mode=epa.minimum_buckling_pressure(36.0, 0.4, 40.0, 28900000, 0.3)
+    assert np.isclose(results["critical_buckling_pressure"][index], p_crit)
+    assert results["buckling_mode"][index]==mode
+    checks=epa.check_designs(pressure, 36.0, 0.4, 40.0, 28900000, 0.3, 120000)
+    assert results["passed"][index]==checks["passed"]
+
+def test_run_sweep_float32(sweep_args):
+    start, results=next(sw.run_sweep(*sweep_args, float32=True))
+    assert results["thin_hoop_stress"].dtype==np.float32
+    assert results["buckling_mode"].dtype==np.int16
+
+def test_write_sweep_npz(tmp_path, sweep_args):
+    path=str(tmp_path/"sweep.npz")
+    sw.write_sweep(path, *sweep_args, chunk_size=10, float32=True)
+    chunks=list(sw.run_sweep(*sweep_args, float32=True))
+    with np.load(path) as sweep:
+        assert np.array_equal(sweep["thin_hoop_stress"], chunks[0][1]["thin_hoop_stress"])
+        assert np.array_equal(sweep["passed"], chunks[0][1]["passed"])
+        assert list(sweep["material_labels"])==["test_6061", "test_4140"]
+        assert list(sweep["depth_axis"])==[100.0, 1000.0, 5000.0]
+
+def test_write_sweep_parquet(tmp_path, sweep_args):
+    path=str(tmp_path/"sweep.parquet")
+    sw.write_sweep(path, *sweep_args, chunk_size=10)
+    table=pq.read_table(path)
+    assert table.num_rows==72
+    assert table.column("matl_label").to_pylist()[:4]==["test_6061"]*3+["test_4140"]
+
+    empty_path=str(tmp_path/"empty.parquet")
+    sw.write_sweep(empty_path, [], *sweep_args[1:])
+    empty=pq.read_table(empty_path)
+    assert empty.num_rows==0
+    assert empty.schema.equals(table.schema)
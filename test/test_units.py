@@ -0,0 +1,96 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+test functions related to the unit conversion functions
+"""
+
+import numpy as np
+import pytest
+import materials.materials as mt
+import materials.material_columns as mc
+import materials.units as un
+import pressure_vessel.vessel as vsl
+import pressure_vessel.design as ds
+import pressure_vessel.ext_pressure_vessel_arrays as epa
+
+@pytest.fixture
+def matl_list(make_materials):
+    return make_materials("test_6061", "test_7075")
+
+def test_convert():
+    assert un.convert(145.04, "stress", "imperial", "si")==1.0
+    assert np.allclose(un.convert([1.0, 2.0], "length", "imperial", "si"), [25.4, 50.8])
+    assert np.isclose(un.convert(un.convert(1000.0, "depth", "imperial", "si"), "depth", "si", "imperial"), 1000.0)
+    assert un.unit("stress", "si")=="MPa"
+    with pytest.raises(ValueError):
+        un.factor("stress", "imperial", "cgs")
+
+def test_convert_materials(matl_list):
+    converted=un.convert_materials(matl_list, "imperial", "si")
+    assert np.isclose(converted[0].fy, mt.psi_to_mpa(35000))
+    assert np.isclose(converted[0].density, 0.098*27679.9047)
+    assert converted[1].fu=="" and converted[1].v==""
+    assert converted[0].v==0.33
+    #the originals are not changed
+    assert matl_list[0].fy==35000
+    assert un.convert_material(matl_list[0], "imperial", "si")==converted[0]
+
+    columns=un.convert_columns(mc.generate_matl_columns(matl_list), "imperial", "si")
+    assert np.allclose(columns.E, [mt.psi_to_mpa(10000000), mt.psi_to_mpa(10400000)])
+    assert np.isnan(columns.fu[1])
+
+def test_convert_results(matl_list):
+    vessel_1=vsl.vessel(matl=matl_list[0], length=40.0, diameter=12.0, wall_thickness=0.25)
+    results=epa.evaluate_vessel(vessel_1, np.array([100.0, 200.0]))
+    converted=un.convert_results(results, "imperial", "si")
+    assert np.allclose(converted.hoop_stress, results.hoop_stress/145.04)
+    assert np.allclose(converted.diameter_reduction, results.diameter_reduction*25.4)
+    assert converted.thickness_ratio==results.thickness_ratio
+    assert converted.buckling_mode==results.buckling_mode
+    converted=un.convert_results({"depth":np.array([1000.0]), "passed":np.array([True])}, "imperial", "si")
+    assert np.allclose(converted["depth"], 304.8)
+    assert converted["passed"].dtype==bool
+    with pytest.raises(ValueError):
+        un.convert_results({"buckling":np.array([1.0])}, "imperial", "si")
+
+def test_convert_design_results(matl_list):
+    #every numeric result of the design functions is converted
+    vessels=[vsl.vessel(matl=matl, length=40.0, diameter=12.0, wall_thickness=0.25) for matl in matl_list]
+    depths=ds.maximum_depth(vessels)
+    converted=un.convert_results(depths, "imperial", "si", ds.result_quantities["maximum_depth"])
+    for name in ("yield_hoop", "yield_longitudinal", "thick_max_hoop", "buckling", "pressure"):
+        assert np.allclose(converted[name], depths[name]/145.04, equal_nan=True)
+    assert np.allclose(converted["depth"], depths["depth"]*0.3048)
+    assert list(converted["governing"])==list(depths["governing"])
+    assert np.array_equal(converted["buckling_mode"], depths["buckling_mode"])
+
+    thicknesses=ds.minimum_wall_thickness(40.0, 12.0, 3000.0, 1.5, matl_list)
+    converted=un.convert_results(thicknesses, "imperial", "si", ds.result_quantities["minimum_wall_thickness"])
+    for name in ("thin_hoop", "thick_hoop", "yield", "buckling", "wall_thickness"):
+        assert np.allclose(converted[name], thicknesses[name]*25.4, equal_nan=True)
+    with pytest.raises(ValueError):
+        un.convert_results(thicknesses, "imperial", "si")
+
+def test_convert_batch(matl_list):
+    batch=vsl.vessel_batch(matl_list, [0, 1], [40.0, 10.0], [12.0, 5.0], [0.25, 0.5])
+    converted=un.convert_batch(batch, "imperial", "si")
+    assert np.allclose(converted.diameter, [304.8, 127.0])
+    assert np.allclose(converted.material_property("fy"), np.array([35000, 73000])/145.04)
+    assert np.allclose(converted.r_t, batch.r_t)
+
+def test_catalog_in_units(matl_list):
+    catalog=mt.material_catalog(matl_list)
+    si=catalog.in_units("si")
+    assert np.isclose(si.get("test_6061").fy, mt.psi_to_mpa(35000))
+    assert catalog.in_units("si") is si
+    assert catalog.in_units("imperial") is catalog
+
+def test_load_matl_dataframe_si():
+    df=mt.load_matl_dataframe("material_table.csv")
+    df_si=mt.load_matl_dataframe("material_table.csv", "si")
+    assert np.allclose(df_si["Fy"], df["Fy"]/145.04)
+    assert list(df_si["label"])==list(df["label"])
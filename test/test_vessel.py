@@ -8,7 +8,9 @@ https://opensource.org/licenses/MIT.
 test functions related to "vessel" class support functions
 """
 
-from pressure_vessel.vessel import vessel
+from dataclasses import FrozenInstanceError
+import pytest
+from pressure_vessel.vessel import vessel, compact_vessel, vessel_batch
 from materials.materials import material
 
 def test_thickness_ratio():
@@ -23,4 +25,36 @@ def test_length_ratio():
     vessel_1=vessel(label="vessel_1", matl=matl_1, length=10.0, diameter=5.0, wall_thickness=0.1)
     vessel_2=vessel(label="vessel_2", matl=matl_1, length=40.0, diameter=16.0, wall_thickness=0.1)
     assert vessel_1.length_ratio()==4.0
-    assert vessel_2.length_ratio()==5.0
\ No newline at end of file
+    assert vessel_2.length_ratio()==5.0
+
+def test_compact_vessel():
+    matl_1=material(matl_label="test_6061", E=10000000, v=0.33)
+    vessel_1=vessel(label="vessel_1", matl=matl_1, length=40.0, diameter=5.0, wall_thickness=0.1)
+    compact_1=vessel_1.compact()
+    assert compact_1.matl_label=="test_6061"
+    assert compact_1.b==2.4
+    assert compact_1.a_2_b_2==(2.5**2)-(2.4**2)
+    assert compact_1.thickness_ratio()==vessel_1.thickness_ratio()
+    assert compact_1.length_ratio()==vessel_1.length_ratio()
+    #equal geometry and material label hash alike, usable as a cache key
+    compact_2=compact_vessel(material(matl_label="test_6061"), 40.0, 5.0, 0.1, label="vessel_1")
+    assert compact_1==compact_2 and hash(compact_1)==hash(compact_2)
+    assert len({compact_1, compact_2})==1
+    assert not hasattr(compact_1, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        compact_1.length=10.0
+
+def test_vessel_batch():
+    matl_1=material(matl_label="test_6061", fy=35000, E=10000000, v=0.33)
+    matl_2=material(matl_label="test_4140", fy=120000, E=28900000, v=0.3)
+    vessels=[vessel(matl=matl_1, length=40.0, diameter=5.0, wall_thickness=0.1),
+             vessel(matl=matl_2, length=10.0, diameter=5.0, wall_thickness=1.0),
+             vessel(matl=material(matl_label="test_6061", fy=35000, E=10000000, v=0.33), length=20.0, diameter=8.0, wall_thickness=0.2)]
+    batch=vessel_batch.from_vessels(vessels)
+    assert len(batch)==3
+    assert len(batch.matls)==2
+    assert list(batch.material_index)==[0, 1, 0]
+    assert list(batch.material_property("fy"))==[35000, 120000, 35000]
+    assert list(batch.thick_walled())==[False, True, False]
+    assert batch[1]==vessels[1].compact()
+    assert list(batch.l_r)==[vessel_1.length_ratio() for vessel_1 in vessels]
@@ -0,0 +1,157 @@
+"""
+Copyright 2023 Acmeanvil
+
+Use of this source code is governed by an MIT-style
+license that can be found in the LICENSE file or at
+https://opensource.org/licenses/MIT.
+
+Swappable caching decorators so the core library does not need streamlit
+backends:
+    -streamlit: st.cache_data / st.cache_resource (streamlit is imported on first use)
+    -lru: in process least recently used cache with optional time to live
+    -none: no caching
+the backend is picked on first call from the PV_CACHE_BACKEND environment variable,
+otherwise streamlit if it has already been imported (running in the app) or lru
+like streamlit, arguments whose names start with "_" are not part of the cache key
+"""
+
+from __future__ import annotations
+
+import copy
+import functools
+import inspect
+import os
+import pickle
+import sys
+import threading
+import time
+from collections import OrderedDict
+
+backend_names=("streamlit", "lru", "none")
+
+#backend set with set_cache_backend, None to pick it automatically
+selected_backend=None
+
+def set_cache_backend(name: str):
+    """
+    sets the caching backend used by every cache_data/cache_resource function,
+    None goes back to picking the backend automatically
+    """
+    global selected_backend
+    if name is not None and name not in backend_names:
+        raise ValueError(f"unknown cache backend {name!r}, expected one of {backend_names}")
+    selected_backend=name
+
+def get_cache_backend()->str:
+    """
+    name of the caching backend in use
+    """
+    if selected_backend is not None:
+        return selected_backend
+    name=os.environ.get("PV_CACHE_BACKEND")
+    if name in backend_names:
+        return name
+    if "streamlit" in sys.modules:
+        return "streamlit"
+    return "lru"
+
+class lru_ttl_cache:
+    """
+    thread safe least recently used cache of a function's results
+    max_entries=None is unbounded, ttl (seconds) None never expires
+    """
+    def __init__(self, func, max_entries: int=None, ttl: float=None, copy_results: bool=False):
+        self.func=func
+        self.max_entries=max_entries
+        self.ttl=ttl
+        self.copy_results=copy_results
+        self.signature=inspect.signature(func)
+        self.entries=OrderedDict()
+        self.lock=threading.Lock()
+
+    def key(self, args, kwargs):
+        """
+        cache key from the arguments, skips arguments whose names start with "_"
+        """
+        bound=self.signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        key=tuple((name, value) for name, value in bound.arguments.items() if not name.startswith("_"))
+        try:
+            hash(key)
+        except TypeError:
+            key=pickle.dumps(key)
+        return key
+
+    def __call__(self, *args, **kwargs):
+        key=self.key(args, kwargs)
+        now=time.monotonic()
+        with self.lock:
+            entry=self.entries.get(key)
+            if entry is not None and (self.ttl is None or now-entry[0]<self.ttl):
+                self.entries.move_to_end(key)
+                value=entry[1]
+                return copy.deepcopy(value) if self.copy_results else value
+
+        value=self.func(*args, **kwargs)
+        with self.lock:
+            self.entries[key]=(now, value)
+            self.entries.move_to_end(key)
+            if self.max_entries is not None:
+                while len(self.entries)>self.max_entries:
+                    self.entries.popitem(last=False)
+        return copy.deepcopy(value) if self.copy_results else value
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
+
+def make_cache(kind: str, func, max_entries: int=None, ttl: float=None):
+    """
+    wraps func so it is cached by whichever backend is in use when it is called
+    kind is "data" (callers get their own copy of the result) or "resource" (shared result)
+    """
+    cached={}
+
+    def cached_func():
+        name=get_cache_backend()
+        if name not in cached:
+            if name=="streamlit":
+                import streamlit as st
+
+                st_cache=st.cache_data if kind=="data" else st.cache_resource
+                cached[name]=st_cache(func, max_entries=max_entries, ttl=ttl, show_spinner=False)
+            elif name=="lru":
+                cached[name]=lru_ttl_cache(func, max_entries, ttl, copy_results=(kind=="data"))
+            else:
+                cached[name]=func
+        return cached[name]
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        return cached_func()(*args, **kwargs)
+
+    def clear():
+        for name, cache in cached.items():
+            if name!="none":
+                cache.clear()
+
+    wrapper.clear=clear
+    return wrapper
+
+def cache_data(func=None, *, max_entries: int=None, ttl: float=None):
+    """
+    caches a function returning data, each caller gets its own copy of the result
+    used as @cache_data or @cache_data(max_entries=..., ttl=...)
+    """
+    if func is None:
+        return lambda func: make_cache("data", func, max_entries, ttl)
+    return make_cache("data", func, max_entries, ttl)
+
+def cache_resource(func=None, *, max_entries: int=None, ttl: float=None):
+    """
+    caches a function returning a shared object (catalogs, figures), callers must not modify it
+    used as @cache_resource or @cache_resource(max_entries=..., ttl=...)
+    """
+    if func is None:
+        return lambda func: make_cache("resource", func, max_entries, ttl)
+    return make_cache("resource", func, max_entries, ttl)